@@ -1,6 +1,8 @@
 from typing import List, Dict, Optional
 from docplex.mp.model import Model
+from docplex.mp.solution import SolveSolution
 from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.mip_start import mip_start_values, drain_best
 
 def _node_count(D: List[List[float]]) -> int:
     return len(D)
@@ -113,9 +115,49 @@ def build_docplex_model(
                 continue
             mdl.add_constraint(u_ord[i] - u_ord[j] + (N + 1) * mdl.sum(x[(k, i, j)] for k in K) <= N, ctname=f"mtz_i{i}_j{j}")
 
+    mdl._x, mdl._z, mdl._y = x, z, y
+    mdl._t, mdl._e, mdl._ell, mdl._u = t, e, ell, u_ord
+
     return mdl
 
 
+def _var_families(mdl: Model):
+    return {"x": mdl._x, "z": mdl._z, "y": mdl._y, "t": mdl._t, "e": mdl._e, "l": mdl._ell, "u": mdl._u}
+
+
+def _start_pairs(mdl: Model, solution: Solution, vehicles: List[Vehicle], start_time: float):
+    vals = mip_start_values(solution, vehicles, _node_count(solution.distances), start_time=start_time)
+    for fam, dvars in _var_families(mdl).items():
+        for key, val in vals[fam].items():
+            var = dvars.get(key)
+            if var is not None:
+                yield var, val
+
+
+def add_mip_start(mdl: Model, solution: Solution, vehicles: List[Vehicle], *, start_time: float = 8.0):
+    start = SolveSolution(mdl, dict(_start_pairs(mdl, solution, vehicles, start_time)))
+    return mdl.add_mip_start(start)
+
+
+def attach_incumbent_feed(mdl: Model, feed, vehicles: List[Vehicle], *, start_time: float = 8.0):
+    import cplex
+    cpx = mdl.cplex if hasattr(mdl, "cplex") else mdl.get_engine().get_cplex()
+
+    class IncumbentFeedCB(cplex.callbacks.HeuristicCallback):
+        def __call__(self):
+            item = drain_best(feed)
+            if item is None:
+                return
+            cost, sol = item
+            if self.has_incumbent() and cost >= self.get_incumbent_objective_value() - 1e-9:
+                return
+            pairs = list(_start_pairs(mdl, sol, vehicles, start_time))
+            self.set_solution([[v.index for v, _ in pairs], [float(x) for _, x in pairs]],
+                              objective_value=cost)
+
+    return cpx.register_callback(IncumbentFeedCB)
+
+
 def solve_cplex(
     D: List[List[float]],
     hospitals: List[Hospital],
@@ -125,6 +167,8 @@ def solve_cplex(
     time_limit: Optional[float] = None,
     time_scale: float = 6.0,
     start_time: float = 8.0,
+    mip_start: Optional[Solution] = None,
+    incumbent_feed=None,
 ):
     mdl = build_docplex_model(
         D,
@@ -141,6 +185,11 @@ def solve_cplex(
         except Exception:
             mdl.parameters.timelimit = float(time_limit)
 
+    if mip_start is not None:
+        add_mip_start(mdl, mip_start, vehicles, start_time=start_time)
+    if incumbent_feed is not None:
+        attach_incumbent_feed(mdl, incumbent_feed, vehicles, start_time=start_time)
+
     sol = mdl.solve(log_output=True)
     return mdl, sol
 
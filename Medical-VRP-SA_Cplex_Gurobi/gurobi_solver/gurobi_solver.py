@@ -2,6 +2,7 @@ from typing import List, Dict, Optional, Tuple
 import gurobipy as gp
 from gurobipy import GRB
 from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.mip_start import mip_start_values, drain_best
 
 
 def _node_count(D: List[List[float]]) -> int:
@@ -118,6 +119,43 @@ def build_gurobi_model(
     return m
 
 
+def _var_families(m: gp.Model):
+    return {"x": m._x, "z": m._z, "y": m._y, "t": m._t, "e": m._e, "l": m._ell, "u": m._u}
+
+
+def set_mip_start(m: gp.Model, solution: Solution, vehicles: List[Vehicle], *,
+                  start_time: float = 8.0) -> None:
+    vals = mip_start_values(solution, vehicles, len(solution.distances), start_time=start_time)
+    for fam, tvars in _var_families(m).items():
+        for key, val in vals[fam].items():
+            var = tvars.get(key)
+            if var is not None:
+                var.Start = val
+    m.update()
+
+
+def _incumbent_feed_callback(feed, vehicles: List[Vehicle], n: int, start_time: float):
+    def cb(model, where):
+        if where != GRB.Callback.MIPNODE:
+            return
+        item = drain_best(feed)
+        if item is None:
+            return
+        cost, sol = item
+        if cost >= model.cbGet(GRB.Callback.MIPNODE_OBJBST) - 1e-9:
+            return
+        vals = mip_start_values(sol, vehicles, n, start_time=start_time)
+        vs, xs = [], []
+        for fam, tvars in model._families.items():
+            for key, val in vals[fam].items():
+                var = tvars.get(key)
+                if var is not None:
+                    vs.append(var); xs.append(val)
+        model.cbSetSolution(vs, xs)
+        model.cbUseSolution()
+    return cb
+
+
 def solve_gurobi(
     D: List[List[float]],
     hospitals: List[Hospital],
@@ -127,6 +165,8 @@ def solve_gurobi(
     time_limit: Optional[float] = None,
     time_scale: float = 6.0,
     start_time: float = 8.0,
+    mip_start: Optional[Solution] = None,
+    incumbent_feed=None,
 ) -> gp.Model:
     m = build_gurobi_model(
         D,
@@ -139,7 +179,13 @@ def solve_gurobi(
 
     if time_limit is not None:
         m.Params.TimeLimit = float(time_limit)
-    m.optimize()
+    if mip_start is not None:
+        set_mip_start(m, mip_start, vehicles, start_time=start_time)
+    if incumbent_feed is not None:
+        m._families = _var_families(m)
+        m.optimize(_incumbent_feed_callback(incumbent_feed, vehicles, len(D), start_time))
+    else:
+        m.optimize()
     return m
 
 
@@ -0,0 +1,3 @@
+from .alns import ALNS
+
+__all__ = ["ALNS"]
@@ -0,0 +1,222 @@
+# heuristics/alns/alns.py
+"""
+Adaptive Large Neighborhood Search (ALNS) for Medical VRP.
+- Destroy: random, worst-cost, related (Shaw: distance + time window), route removal.
+- Repair: greedy and regret-k insertion on heuristics.insertion.InsertionCache.
+- Operator weights adapted per segment from scores (new best / better / accepted);
+  SA-style acceptance with geometric cooling.
+- Objective: Solution.total_cost(...), hard caps (weight, volume, max distance) always kept.
+"""
+from typing import List, Dict, Tuple, Optional, Callable
+import math
+import random
+import time
+
+from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.insertion import InsertionCache, greedy_insert, regret_insert, route_eval
+
+
+class ALNS:
+    def __init__(
+        self,
+        distances: List[List[float]],
+        penalties: Dict[str, float],
+        *,
+        max_iters: int = 2000,
+        min_remove: float = 0.1,
+        max_remove: float = 0.3,
+        regret_k: int = 3,
+        initial_temp: Optional[float] = None,
+        cooling_rate: float = 0.9995,
+        segment_length: int = 100,
+        reaction: float = 0.2,
+        scores: Tuple[float, float, float] = (33.0, 9.0, 13.0),
+        worst_randomness: float = 3.0,
+        use_load_distance_cost: bool = False,
+        time_scale: float = 6.0,
+        init: str = "regret",
+        seed: Optional[int] = None,
+        time_limit: float = 0.0,
+    ):
+        self.D = distances
+        self.time_limit = float(time_limit)
+        self.stop_reason = ""
+        self.penalties = penalties
+        self.max_iters = int(max_iters)
+        self.min_remove = float(min_remove)
+        self.max_remove = float(max_remove)
+        self.regret_k = int(regret_k)
+        self.T0 = initial_temp
+        self.cool = float(cooling_rate)
+        self.segment_length = int(segment_length)
+        self.reaction = float(reaction)
+        self.sigma = scores
+        self.p_worst = float(worst_randomness)
+        self.use_ld = bool(use_load_distance_cost)
+        self.time_scale = float(time_scale)
+        self.init = init
+        if seed is not None: random.seed(seed)
+
+        self.destroy_ops: Dict[str, Callable] = {
+            "random": self._random_removal,
+            "worst": self._worst_removal,
+            "related": self._related_removal,
+            "route": self._route_removal,
+        }
+        self.repair_ops: Dict[str, Callable] = {"greedy": self._greedy_repair}
+        for k in range(2, max(2, self.regret_k) + 1):
+            self.repair_ops[f"regret{k}"] = (lambda c, p, k=k: regret_insert(c, p, k))
+        self.weights = {n: 1.0 for n in list(self.destroy_ops) + list(self.repair_ops)}
+        self.T = 0.0
+        self._d_max = 1.0
+        self.best_sol: Optional[Solution] = None
+        self.best_cost: float = float("inf")
+        self.history: List[float] = []
+
+    def cost(self, s: Solution) -> float:
+        return s.total_cost(self.penalties, use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
+
+    def init_solution(self, vehicles: List[Vehicle], hospitals: List[Hospital]) -> Solution:
+        for h in hospitals:
+            if hasattr(h, "assigned"): h.assigned = False
+        s = Solution(vehicles, hospitals, self.D)
+        if self.init == "random":
+            s.assign_initial()
+        else:
+            s.assign_insertion(self.penalties, regret_k=1 if self.init == "cheapest" else 2,
+                               use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
+        return s
+
+    # ---- destroy -------------------------------------------------------------------------
+    def _removal_count(self, s: Solution) -> int:
+        n = sum(len(v.route) for v in s.vehicles)
+        lo = max(1, int(round(self.min_remove * n)))
+        hi = max(lo, int(round(self.max_remove * n)))
+        return min(n, random.randint(lo, hi))
+
+    @staticmethod
+    def _take(s: Solution, victims: List[Hospital]) -> List[Hospital]:
+        gone = set(id(h) for h in victims)
+        for v in s.vehicles:
+            v.route = [h for h in v.route if id(h) not in gone]
+        return victims
+
+    def _random_removal(self, s: Solution, q: int) -> List[Hospital]:
+        visits = [h for v in s.vehicles for h in v.route]
+        return self._take(s, random.sample(visits, q))
+
+    def _worst_removal(self, s: Solution, q: int) -> List[Hospital]:
+        removed: List[Hospital] = []
+        for _ in range(q):
+            gains = []
+            for v in s.vehicles:
+                if not v.route: continue
+                base, _ = route_eval(v, v.route, self.D, self.penalties, self.use_ld, self.time_scale)
+                for i, h in enumerate(v.route):
+                    c, _ = route_eval(v, v.route[:i] + v.route[i + 1:], self.D, self.penalties,
+                                      self.use_ld, self.time_scale)
+                    gains.append((base - c, h))
+            if not gains: break
+            gains.sort(key=lambda t: -t[0])
+            h = gains[int(len(gains) * random.random() ** self.p_worst)][1]
+            removed.extend(self._take(s, [h]))
+        return removed
+
+    def _relatedness(self, a: Hospital, b: Hospital, d_max: float, t_span: float) -> float:
+        return (self.D[a.hospital_id][b.hospital_id] / d_max
+                + abs(a.earliest_time - b.earliest_time) / t_span
+                + abs(a.latest_time - b.latest_time) / t_span)
+
+    def _related_removal(self, s: Solution, q: int) -> List[Hospital]:
+        visits = [h for v in s.vehicles for h in v.route]
+        if not visits: return []
+        d_max = self._d_max
+        t_span = (max(h.latest_time for h in visits) - min(h.earliest_time for h in visits)) or 1.0
+        removed = [random.choice(visits)]
+        rest = [h for h in visits if h is not removed[0]]
+        while len(removed) < q and rest:
+            seed_h = random.choice(removed)
+            rest.sort(key=lambda h: self._relatedness(seed_h, h, d_max, t_span))
+            removed.append(rest.pop(int(len(rest) * random.random() ** self.p_worst)))
+        return self._take(s, removed)
+
+    def _route_removal(self, s: Solution, q: int) -> List[Hospital]:
+        used = [v for v in s.vehicles if v.route]
+        if not used: return []
+        v = random.choice(used)
+        return self._take(s, list(v.route))
+
+    # ---- repair --------------------------------------------------------------------------
+    @staticmethod
+    def _greedy_repair(cache: InsertionCache, pending: List[Hospital]) -> List[Hospital]:
+        return greedy_insert(cache, pending)
+
+    def _pick(self, names) -> str:
+        names = list(names)
+        r = random.random() * sum(self.weights[n] for n in names)
+        acc = 0.0
+        for n in names:
+            acc += self.weights[n]
+            if acc >= r: return n
+        return names[-1]
+
+    def _update_weights(self, scores: Dict[str, float], uses: Dict[str, int]) -> None:
+        for n, used in uses.items():
+            if used:
+                self.weights[n] = (1 - self.reaction) * self.weights[n] + self.reaction * scores[n] / used
+            scores[n], uses[n] = 0.0, 0
+
+    def accept(self, cur: float, new: float) -> bool:
+        if new < cur: return True
+        return random.random() < math.exp(-(new - cur) / max(self.T, 1e-12))
+
+    def run(self, vehicles: List[Vehicle], hospitals: List[Hospital], *,
+            verbose_every: int = 100,
+            callback: Optional[Callable[[int, float, Solution], bool]] = None) -> Tuple[Solution, float]:
+        cur = self.init_solution(vehicles, hospitals)
+        cur_cost = self.cost(cur)
+        self.best_sol, self.best_cost = cur.deepcopy(), cur_cost
+        self.history = [self.best_cost]
+        self.T = self.T0 if self.T0 is not None else 0.05 * cur_cost / math.log(2.0)
+        self._d_max = float(max(max(row) for row in self.D)) or 1.0
+
+        scores = {n: 0.0 for n in self.weights}
+        uses = {n: 0 for n in self.weights}
+        self.stop_reason = ""
+        t_start = time.perf_counter()
+        for it in range(1, self.max_iters + 1):
+            d_name, r_name = self._pick(self.destroy_ops), self._pick(self.repair_ops)
+            cand = cur.deepcopy()
+            removed = self.destroy_ops[d_name](cand, self._removal_count(cand))
+            cache = InsertionCache(cand.vehicles, self.D, self.penalties,
+                                   use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
+            left = self.repair_ops[r_name](cache, removed)
+            uses[d_name] += 1; uses[r_name] += 1
+
+            score = 0.0
+            if not left:
+                cand_cost = self.cost(cand)
+                if cand_cost < self.best_cost - 1e-9:
+                    self.best_sol, self.best_cost = cand.deepcopy(), cand_cost
+                    score = self.sigma[0]
+                elif cand_cost < cur_cost - 1e-9:
+                    score = self.sigma[1]
+                if self.accept(cur_cost, cand_cost):
+                    cur, cur_cost = cand, cand_cost
+                    score = score or self.sigma[2]
+            scores[d_name] += score; scores[r_name] += score
+
+            if it % self.segment_length == 0:
+                self._update_weights(scores, uses)
+            self.T *= self.cool
+            self.history.append(self.best_cost)
+            if verbose_every and it % verbose_every == 0:
+                print(f"[ALNS] iter={it}, T={self.T:.4f}, best={self.best_cost:.4f}")
+            if self.time_limit and time.perf_counter() - t_start >= self.time_limit:
+                self.stop_reason = "time_limit"
+                break
+            if callback is not None and callback(it, self.best_cost, self.best_sol):
+                self.stop_reason = "callback"
+                break
+        self.stop_reason = self.stop_reason or "max_iters"
+        return self.best_sol, self.best_cost
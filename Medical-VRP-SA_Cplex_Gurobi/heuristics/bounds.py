@@ -0,0 +1,203 @@
+# heuristics/bounds.py
+"""
+Lower bounds on Solution.total_cost, for gap reporting and gap-based early stopping.
+- lp: LP relaxation of a two-index vehicle-flow model (scipy.optimize.linprog, HiGHS): every
+  hospital entered and left once, m routes out of and back into the depot, m >= fleet lower bound,
+  plus rounds of rounded capacity cuts x(S) <= |S| - k(S) on subtours of the LP support.
+  Arc costs are per-distance rates minimised over the fleet (time + distance, or time + the
+  load-distance floor demand_volume(j) * coeff on arcs into j), fixed cost minimised likewise.
+- degree: sum over nodes of the cheapest in/out arc (O(N^2) NumPy; used when N is too large for lp).
+- Both add the late penalty no route can avoid: arrival at i is never earlier than the shortest
+  path from the depot at the fastest speed (arrivals are not delayed by waiting in this model).
+start_lower_bound computes it in a daemon thread; the heuristics accept the Future as
+`lower_bound` and stop once (best - bound) / best <= target_gap.
+"""
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+import math
+import threading
+import time
+
+METHODS = ("auto", "lp", "degree")
+LP_MAX_NODES = 300
+
+
+def _arc_costs(D, hospitals, vehicles, use_load_distance_cost: bool):
+    import numpy as np
+    A = np.asarray(D, dtype=np.float64)
+    n = A.shape[0]
+    rate_t = min(v.time_cost_coeff / v.speed for v in vehicles)
+    if use_load_distance_cost:
+        vol = np.zeros(n)
+        for h in hospitals:
+            vol[h.hospital_id] = h.demand_volume
+        dc = min(v.distance_cost_coeff for v in vehicles)
+        C = A * rate_t + A * (dc * vol)[None, :]
+    else:
+        C = A * min(v.time_cost_coeff / v.speed + v.distance_cost_coeff for v in vehicles)
+    return A, C
+
+
+def _min_routes(hospitals, vehicles) -> int:
+    """Fewest vehicles whose weight and volume capacities can cover the total demand."""
+    m = 0
+    for total, caps in ((sum(h.demand_weight for h in hospitals), [v.weight_capacity for v in vehicles]),
+                        (sum(h.demand_volume for h in hospitals), [v.volume_capacity for v in vehicles])):
+        k, acc = 0, 0.0
+        for c in sorted(caps, reverse=True):
+            if acc >= total - 1e-9:
+                break
+            acc += c; k += 1
+        m = max(m, k)
+    return max(m, 1 if hospitals else 0)
+
+
+def _late_floor(A, hospitals, vehicles, penalties: Dict[str, float], time_scale: float, start: float) -> float:
+    from scipy.sparse.csgraph import dijkstra
+    sp = dijkstra(A, directed=True, indices=0)
+    v_max = max(v.speed for v in vehicles)
+    out = 0.0
+    for h in hospitals:
+        t = start + sp[h.hospital_id] / v_max
+        if t > h.latest_time:
+            out += h.alpha * penalties["late"] * (t - h.latest_time) * time_scale
+    return out
+
+
+def degree_bound(C, nodes: List[int]) -> float:
+    import numpy as np
+    idx = np.asarray([0] + list(nodes))
+    S = C[np.ix_(idx, idx)].copy()
+    np.fill_diagonal(S, np.inf)
+    S[0, 0] = np.inf
+    h = slice(1, None)
+    return float(0.5 * (S[:, h].min(axis=0).sum() + S[h, :].min(axis=1).sum()))
+
+
+def lp_bound(C, hospitals, vehicles, *, m_min: int, rounds: int = 10, time_limit: float = 0.0) -> dict:
+    import numpy as np
+    from scipy.optimize import linprog
+    from scipy.sparse import coo_matrix, csr_matrix, vstack
+    from scipy.sparse.csgraph import connected_components
+
+    ids = [h.hospital_id for h in hospitals]
+    nodes = [0] + ids
+    n = len(nodes)
+    ii, jj = np.nonzero(~np.eye(n, dtype=bool))
+    nv = len(ii)                                          # arc variables, then m
+    c = np.append(C[np.asarray(nodes)[ii], np.asarray(nodes)[jj]], min(v.fixed_cost for v in vehicles))
+    col = np.arange(nv)
+    out_rows, in_rows = ii, n + jj
+    rows = np.concatenate([out_rows, in_rows, [0, n]])
+    cols = np.concatenate([col, col, [nv, nv]])
+    vals = np.concatenate([np.ones(2 * nv), [-1.0, -1.0]])
+    A_eq = csr_matrix(coo_matrix((vals, (rows, cols)), shape=(2 * n, nv + 1)))
+    b_eq = np.ones(2 * n)
+    b_eq[0] = b_eq[n] = 0.0
+    bounds = [(0.0, 1.0)] * nv + [(m_min, len(vehicles))]
+    w = np.array([0.0] + [h.demand_weight for h in hospitals])
+    u = np.array([0.0] + [h.demand_volume for h in hospitals])
+    Wmax = max(v.weight_capacity for v in vehicles)
+    Umax = max(v.volume_capacity for v in vehicles)
+    cuts, b_ub = [], []
+    t0 = time.perf_counter()
+    bound, n_cuts, status = None, 0, "optimal"
+    for _ in range(rounds + 1):
+        kw = {}
+        if cuts:
+            kw = {"A_ub": vstack(cuts).tocsr(), "b_ub": np.asarray(b_ub)}
+        if time_limit:
+            kw["options"] = {"time_limit": max(time_limit - (time.perf_counter() - t0), 1e-3)}
+        res = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs", **kw)
+        if res.status != 0:
+            status = res.message                        # time limit or failure: keep the last round's bound
+            break
+        bound = float(res.fun)
+        x = res.x[:nv]
+        sel = (x > 1e-6) & (ii > 0) & (jj > 0)
+        G = coo_matrix((x[sel], (ii[sel] - 1, jj[sel] - 1)), shape=(n - 1, n - 1))
+        k, lab = connected_components(G, directed=True, connection="weak")
+        added = 0
+        for comp in range(k):
+            S = np.flatnonzero(lab == comp) + 1
+            if len(S) < 2:
+                continue
+            need = max(math.ceil(w[S].sum() / Wmax - 1e-9), math.ceil(u[S].sum() / Umax - 1e-9), 1)
+            inside = np.isin(ii, S) & np.isin(jj, S)
+            if x[inside].sum() > len(S) - need + 1e-6:
+                cuts.append(csr_matrix((np.ones(inside.sum()), (np.zeros(inside.sum(), dtype=int),
+                                                                 np.flatnonzero(inside))), shape=(1, nv + 1)))
+                b_ub.append(len(S) - need)
+                added += 1
+        n_cuts += added
+        if not added or (time_limit and time.perf_counter() - t0 >= time_limit):
+            break
+    return {"bound": bound, "cuts": n_cuts, "status": status}
+
+
+def lower_bound(D, hospitals, vehicles, penalties: Dict[str, float], *, method: str = "auto",
+                use_load_distance_cost: bool = False, time_scale: float = 6.0, start: float = 8.0,
+                rounds: int = 10, time_limit: float = 0.0) -> dict:
+    """{"bound", "method", "cuts", "status", "runtime_s"}; hospitals/vehicles are objects or records."""
+    from .common import Hospital, Vehicle
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    t0 = time.perf_counter()
+    hospitals = [h if isinstance(h, Hospital) else Hospital(**h) for h in hospitals]
+    vehicles = [v if isinstance(v, Vehicle) else Vehicle(**v) for v in vehicles]
+    if not hospitals:
+        return {"bound": 0.0, "method": method, "cuts": 0, "status": "optimal", "runtime_s": 0.0}
+    A, C = _arc_costs(D, hospitals, vehicles, use_load_distance_cost)
+    m_min = _min_routes(hospitals, vehicles)
+    if method == "auto":
+        method = "lp" if len(hospitals) + 1 <= LP_MAX_NODES else "degree"
+    out = {"bound": None, "cuts": 0, "status": "optimal"}
+    if method == "lp":
+        out = lp_bound(C, hospitals, vehicles, m_min=m_min, rounds=rounds, time_limit=time_limit)
+        if out["bound"] is None:
+            method = "degree"
+    if method == "degree":
+        out["bound"] = degree_bound(C, [h.hospital_id for h in hospitals]) + m_min * min(v.fixed_cost for v in vehicles)
+    out["bound"] += _late_floor(A, hospitals, vehicles, penalties, time_scale, start)
+    out.update(method=method, runtime_s=round(time.perf_counter() - t0, 4))
+    return out
+
+
+def start_lower_bound(*args, **kwargs) -> Future:
+    """lower_bound(...) in a daemon thread; pass the Future as a heuristic's `lower_bound`.
+
+    The thread never keeps the process alive: callers that exit early (or print the gap only
+    when fut.done()) do not wait for the LP. Pass time_limit to cap the LP itself.
+    """
+    fut = Future()
+
+    def work():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            fut.set_result(lower_bound(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    threading.Thread(target=work, name="lower-bound", daemon=True).start()
+    return fut
+
+
+def resolve_bound(lb) -> Optional[float]:
+    """Bound value from a float, a lower_bound() dict or a finished Future; None if not available yet."""
+    if lb is None:
+        return None
+    if isinstance(lb, Future):
+        if not lb.done() or lb.exception() is not None:
+            return None
+        lb = lb.result()
+    if isinstance(lb, dict):
+        lb = lb.get("bound")
+    return float(lb) if lb is not None else None
+
+
+def gap(cost: float, lb: Optional[float]) -> Optional[float]:
+    """Relative gap (cost - lb) / cost; None without a bound."""
+    if lb is None or not math.isfinite(cost):
+        return None
+    return max(0.0, (cost - lb) / abs(cost)) if cost else 0.0
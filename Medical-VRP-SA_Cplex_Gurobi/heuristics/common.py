@@ -140,7 +140,25 @@ class Solution:
             if not placed:
                 raise ValueError(f"Cannot assign hospital {h.hospital_id}")
 
+    def assign_insertion(self, penalties, regret_k=2, use_load_distance_cost=True, time_scale=6.0):
+        # deterministic: regret_k=1 is cheapest insertion, >=2 is regret-k
+        from .insertion import InsertionCache, greedy_insert, regret_insert
+        pending = [h for h in sorted(self.hospitals, key=lambda h: h.hospital_id) if not h.assigned]
+        cache = InsertionCache(self.vehicles, self.distances, penalties,
+                               use_load_distance_cost=use_load_distance_cost, time_scale=time_scale)
+        left = (greedy_insert(cache, pending) if regret_k <= 1 else
+                regret_insert(cache, pending, regret_k))
+        for h in pending:
+            h.assigned = h not in left
+        if left:
+            raise ValueError(f"Cannot assign hospital {left[0].hospital_id}")
+
     def total_cost(self, penalties, use_load_distance_cost=True, time_scale=6.0):
+        from . import jit
+        if jit.backend() == "numba":
+            c = jit.solution_cost(self, penalties, use_load_distance_cost, time_scale)
+            if c is not None:
+                return c
         return sum(v.vehicle_cost(self.distances, penalties, use_load_distance_cost, time_scale)
                    for v in self.vehicles)
 
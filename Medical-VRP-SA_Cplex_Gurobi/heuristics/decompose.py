@@ -0,0 +1,254 @@
+# heuristics/decompose.py
+"""
+Cluster-first decomposition for large instances.
+- cluster_hospitals: "kmedoids" on D blended with time-window distance, or "sweep" by angle around
+  the depot in a classical-MDS embedding of D; both keep cluster loads (weight/volume share) balanced.
+- assign_vehicles: hand out vehicles (largest first) to the cluster with the worst capacity coverage.
+- solve_decomposed: solve every cluster as its own instance with SA/ALNS/PSO on a process pool,
+  merge the routes into one Solution on the full D (hospitals of failed clusters are repaired by
+  regret insertion), then run a cross-cluster relocate pass (heuristics.local_search restricted to
+  each hospital's nearest neighbours).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
+import time
+
+import numpy as np
+
+from .common import Hospital, Vehicle, Solution
+from .insertion import InsertionCache, regret_insert
+from .local_search import local_search
+
+METHODS = ("kmedoids", "sweep")
+SOLVERS = ("sa", "alns", "pso")
+SOLVER_DEFAULTS = {
+    "sa": dict(initial_temp=1000.0, cooling_rate=0.999, min_temp=0.5, max_iters=5000, init="regret"),
+    "alns": dict(max_iters=500),
+    "pso": dict(max_iters=300),
+}
+
+
+def _hospital_record(h: Hospital, hid: int) -> dict:
+    return dict(hospital_id=hid, demand_weight=h.demand_weight, demand_volume=h.demand_volume,
+                earliest_time=h.earliest_time, latest_time=h.latest_time, beta=h.beta, mu=h.mu)
+
+
+def _vehicle_record(v: Vehicle) -> dict:
+    return dict(vehicle_id=v.vehicle_id, weight_capacity=v.weight_capacity, volume_capacity=v.volume_capacity,
+                distance_capacity=v.distance_capacity, speed=v.speed, fixed_cost=v.fixed_cost,
+                time_cost_coeff=v.time_cost_coeff, distance_cost_coeff=v.distance_cost_coeff)
+
+
+def _load_shares(hospitals: Sequence[Hospital]) -> np.ndarray:
+    w = np.array([h.demand_weight for h in hospitals], dtype=float)
+    u = np.array([h.demand_volume for h in hospitals], dtype=float)
+    return np.maximum(w / max(w.sum(), 1e-12), u / max(u.sum(), 1e-12))
+
+
+# ---- clustering ------------------------------------------------------------------------------
+def _mds_xy(A: np.ndarray) -> np.ndarray:
+    """2-D classical MDS embedding of a (symmetrised) distance matrix."""
+    S = 0.5 * (A + A.T)
+    n = S.shape[0]
+    B = S ** 2
+    B -= B.mean(axis=0, keepdims=True)
+    B -= B.mean(axis=1, keepdims=True)
+    w, V = np.linalg.eigh(-0.5 * B)
+    return V[:, -2:] * np.sqrt(np.maximum(w[-2:], 0.0))
+
+
+def _sweep(A: np.ndarray, ids: List[int], share: np.ndarray, k: int) -> List[List[int]]:
+    xy = _mds_xy(A)
+    rel = xy[ids] - xy[0]
+    ang = np.arctan2(rel[:, 1], rel[:, 0])
+    order = np.argsort(ang)
+    gaps = np.diff(np.concatenate([ang[order], ang[order][:1] + 2 * math.pi]))
+    order = np.roll(order, -(int(np.argmax(gaps)) + 1))   # start after the widest empty sector
+    clusters, cur, acc, target = [], [], 0.0, share.sum() / k
+    for i in order:
+        if cur and acc + share[i] / 2 > target * (len(clusters) + 1) and len(clusters) < k - 1:
+            clusters.append(cur); cur = []
+        cur.append(ids[i]); acc += share[i]
+    clusters.append(cur)
+    return clusters
+
+
+def _kmedoids(M: np.ndarray, ids: List[int], share: np.ndarray, k: int, balance: float,
+              rng: np.random.Generator, max_rounds: int = 20) -> List[List[int]]:
+    n = len(ids)
+    med = [int(rng.integers(n))]
+    for _ in range(1, k):                                   # k-medoids++ seeding
+        d = M[:, med].min(axis=1)
+        p = d ** 2
+        med.append(int(rng.choice(n, p=p / p.sum())) if p.sum() > 0 else int(rng.integers(n)))
+    cap = balance * share.sum() / k
+    labels = np.full(n, -1)
+    for _ in range(max_rounds):
+        Dm = M[:, med]
+        srt = np.sort(Dm, axis=1)
+        regret = srt[:, 1] - srt[:, 0] if k > 1 else np.zeros(n)
+        load = np.zeros(k)
+        new = np.full(n, -1)
+        for i in np.argsort(-regret):                      # capacity-aware Voronoi assignment
+            for c in np.argsort(Dm[i]):
+                if load[c] + share[i] <= cap or c == np.argmin(load):
+                    new[i] = c; load[c] += share[i]; break
+        for c in range(k):
+            members = np.flatnonzero(new == c)
+            if len(members):
+                med[c] = int(members[np.argmin(M[np.ix_(members, members)].sum(axis=1))])
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    return [[ids[i] for i in np.flatnonzero(labels == c)] for c in range(k)]
+
+
+def cluster_hospitals(D, hospitals: Sequence[Hospital], n_clusters: int, *, method: str = "kmedoids",
+                      tw_weight: float = 0.5, speed: Optional[float] = None, balance: float = 1.15,
+                      seed: Optional[int] = None) -> List[List[int]]:
+    """Partition hospital ids into n_clusters groups. kmedoids uses
+    dissimilarity = sym(D) + tw_weight * speed * |time-window midpoint gap| (speed converts hours to
+    distance); sweep cuts the angular order into equal-load sectors."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    A = np.asarray(D, dtype=float)
+    ids = [h.hospital_id for h in hospitals]
+    k = max(1, min(int(n_clusters), len(ids)))
+    share = _load_shares(hospitals)
+    if k == 1:
+        return [ids]
+    if method == "sweep":
+        return [c for c in _sweep(A, ids, share, k) if c]
+    S = 0.5 * (A + A.T)[np.ix_(ids, ids)]
+    mid = np.array([0.5 * (h.earliest_time + h.latest_time) for h in hospitals], dtype=float)
+    M = S + tw_weight * (speed or 1.0) * np.abs(mid[:, None] - mid[None, :])
+    rng = np.random.default_rng(seed)
+    return [c for c in _kmedoids(M, ids, share, k, balance, rng) if c]
+
+
+def assign_vehicles(clusters: List[List[int]], hospitals: Sequence[Hospital],
+                    vehicles: Sequence[Vehicle]) -> List[List[int]]:
+    """Vehicle indices per cluster; raises ValueError if some cluster's demand is not covered."""
+    by_id = {h.hospital_id: h for h in hospitals}
+    dem = [(sum(by_id[i].demand_weight for i in c), sum(by_id[i].demand_volume for i in c)) for c in clusters]
+    cap = [[0.0, 0.0] for _ in clusters]
+    out: List[List[int]] = [[] for _ in clusters]
+    order = sorted(range(len(vehicles)), key=lambda k: (-vehicles[k].weight_capacity, -vehicles[k].volume_capacity))
+    for k in order:
+        ratio = [max(w / (cw or 1e-12), u / (cu or 1e-12)) for (w, u), (cw, cu) in zip(dem, cap)]
+        c = max(range(len(clusters)), key=lambda j: ratio[j])
+        out[c].append(k)
+        cap[c][0] += vehicles[k].weight_capacity; cap[c][1] += vehicles[k].volume_capacity
+    short = [j for j, ((w, u), (cw, cu)) in enumerate(zip(dem, cap)) if w > cw or u > cu]
+    if short:
+        raise ValueError(f"Not enough vehicle capacity for clusters {short}; use fewer clusters")
+    return out
+
+
+# ---- subproblems -----------------------------------------------------------------------------
+def _solve_cluster(task: dict) -> dict:
+    """Runs in a worker: solve one cluster as a standalone instance (local ids 1..m)."""
+    t0 = time.perf_counter()
+    D, P = task["D"], task["penalties"]
+    hospitals = [Hospital(**r) for r in task["hospitals"]]
+    vehicles = [Vehicle(**r) for r in task["vehicles"]]
+    params = dict(SOLVER_DEFAULTS.get(task["solver"], {}), use_load_distance_cost=task["use_ld"],
+                  time_scale=task["time_scale"], **task["params"])
+    out = {"index": task["index"], "routes": None, "cost": None, "error": ""}
+    try:
+        random.seed(task["seed"])
+        if task["solver"] == "sa":
+            from .sa import SimulatedAnnealing
+            best, cost = SimulatedAnnealing(D, penalties=P, **params).run(vehicles, hospitals, verbose_every=0)
+        elif task["solver"] == "alns":
+            from .alns import ALNS
+            best, cost = ALNS(D, P, seed=task["seed"], **params).run(vehicles, hospitals, verbose_every=0)
+        elif task["solver"] == "pso":
+            from .pso.pso import PSO
+            best, cost = PSO(D, P, seed=task["seed"], **params).run(vehicles, hospitals, verbose_every=0)
+        else:
+            raise ValueError(f"Unknown solver: {task['solver']}")
+        out["routes"] = [[v.vehicle_id, [h.hospital_id for h in v.route]] for v in best.vehicles]
+        out["cost"] = float(cost)
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["runtime_s"] = round(time.perf_counter() - t0, 4)
+    return out
+
+
+# ---- driver ----------------------------------------------------------------------------------
+def solve_decomposed(D, hospitals: List[Hospital], vehicles: List[Vehicle], penalties: Dict[str, float], *,
+                     n_clusters: Optional[int] = None, cluster_size: int = 150, method: str = "kmedoids",
+                     solver: str = "alns", solver_params: Optional[dict] = None, workers: Optional[int] = None,
+                     tw_weight: float = 0.5, improve_passes: int = 3, neighbors: int = 10,
+                     use_load_distance_cost: bool = False, time_scale: float = 6.0, seed: int = 42,
+                     verbose: bool = True) -> Tuple[Solution, float, dict]:
+    """Cluster, solve clusters in parallel, merge and improve. Returns (Solution, cost, report)."""
+    if solver not in SOLVERS:
+        raise ValueError(f"solver must be one of {SOLVERS}")
+    t0 = time.perf_counter()
+    k = n_clusters or max(1, math.ceil(len(hospitals) / max(1, cluster_size)))
+    speed = sum(v.speed for v in vehicles) / max(1, len(vehicles))
+    clusters = cluster_hospitals(D, hospitals, k, method=method, tw_weight=tw_weight, speed=speed, seed=seed)
+    fleet = assign_vehicles(clusters, hospitals, vehicles)
+    t_cluster = time.perf_counter() - t0
+    if verbose:
+        print(f"[decompose] {len(clusters)} clusters ({method}), sizes "
+              f"{min(map(len, clusters))}-{max(map(len, clusters))}, {t_cluster:.2f}s")
+
+    A = np.asarray(D, dtype=float)
+    by_id = {h.hospital_id: h for h in hospitals}
+    tasks = []
+    for c, (ids, ks) in enumerate(zip(clusters, fleet)):
+        nodes = [0] + ids
+        tasks.append({
+            "index": c,
+            "D": A[np.ix_(nodes, nodes)].tolist(),
+            "hospitals": [_hospital_record(by_id[hid], loc) for loc, hid in enumerate(ids, start=1)],
+            "vehicles": [_vehicle_record(vehicles[kk]) for kk in ks],
+            "penalties": penalties, "solver": solver, "params": dict(solver_params or {}),
+            "seed": seed + c, "use_ld": use_load_distance_cost, "time_scale": time_scale,
+        })
+    if workers == 1 or len(tasks) == 1:
+        results = [_solve_cluster(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_cluster, tasks))
+
+    # merge: cluster routes back onto the original ids and vehicle objects
+    merged = [Vehicle(**_vehicle_record(v)) for v in vehicles]
+    vidx = {v.vehicle_id: k for k, v in enumerate(merged)}
+    pending = []
+    for res, ids in zip(results, clusters):
+        if res["error"]:
+            pending += [by_id[hid] for hid in ids]
+            if verbose:
+                print(f"[decompose] cluster {res['index']} failed ({res['error']}); repairing its hospitals")
+            continue
+        for vid, route in res["routes"]:
+            merged[vidx[vid]].route = [by_id[ids[loc - 1]] for loc in route]
+    sol = Solution(merged, hospitals, D)
+    if pending:
+        cache = InsertionCache(merged, D, penalties, use_load_distance_cost=use_load_distance_cost,
+                               time_scale=time_scale)
+        left = regret_insert(cache, pending, 2)
+        if left:
+            raise ValueError(f"Cannot assign hospital {left[0].hospital_id}")
+    merged_cost = sol.total_cost(penalties, use_load_distance_cost=use_load_distance_cost, time_scale=time_scale)
+    t_solve = time.perf_counter() - t0 - t_cluster
+
+    moves = local_search(sol, penalties, operators=("relocate",), neighbors=neighbors, max_passes=improve_passes,
+                         use_load_distance_cost=use_load_distance_cost, time_scale=time_scale) \
+        if improve_passes else 0
+    cost = sol.total_cost(penalties, use_load_distance_cost=use_load_distance_cost, time_scale=time_scale)
+    if verbose:
+        print(f"[decompose] merged cost {merged_cost:.2f}, after {moves} cross-cluster moves {cost:.2f}")
+    report = {"clusters": [{"size": len(ids), "vehicles": len(ks), "cost": r["cost"],
+                            "runtime_s": r["runtime_s"], "error": r["error"]}
+                           for ids, ks, r in zip(clusters, fleet, results)],
+              "merged_cost": merged_cost, "cost": cost, "moves": moves, "repaired": len(pending),
+              "cluster_s": round(t_cluster, 4), "solve_s": round(t_solve, 4),
+              "total_s": round(time.perf_counter() - t0, 4)}
+    return sol, cost, report
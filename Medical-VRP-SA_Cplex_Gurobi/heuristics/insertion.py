@@ -0,0 +1,155 @@
+# heuristics/insertion.py
+"""
+Insertion primitives shared by the route-building heuristics.
+- route_eval: single pass over a candidate route -> (vehicle cost, distance); same objective as
+  Vehicle.vehicle_cost (fixed + time + distance or load-distance + soft time-window penalty).
+- InsertionCache: best insertion (delta, position) per (hospital, vehicle); entries of a vehicle
+  are dropped only when that vehicle's route changes.
+- greedy_insert / regret_insert: repair pending hospitals into a solution.
+"""
+from typing import List, Dict, Tuple, Optional
+
+from .common import Hospital, Vehicle
+
+INF = float("inf")
+
+
+def route_eval(v: Vehicle, route: List[Hospital], D, penalties: Dict[str, float],
+               use_load_distance_cost: bool = False, time_scale: float = 6.0,
+               start: float = 8.0) -> Tuple[float, float]:
+    if not route:
+        return 0.0, 0.0
+    sp = v.speed
+    early, late = penalties["early"], penalties["late"]
+    remaining = sum(h.demand_volume for h in route) if use_load_distance_cost else 0.0
+    last, dist, t, pen, ld = 0, 0.0, start, 0.0, 0.0
+    for h in route:
+        hid = h.hospital_id
+        d = D[last][hid]
+        dist += d
+        t += d / sp
+        if use_load_distance_cost:
+            ld += v.distance_cost_coeff * d * remaining
+            remaining -= h.demand_volume
+        if t < h.earliest_time:
+            pen += h.alpha * early * (h.earliest_time - t) * time_scale
+        elif t > h.latest_time:
+            pen += h.alpha * late * (t - h.latest_time) * time_scale
+        last = hid
+    dist += D[last][0]
+    dist_c = ld if use_load_distance_cost else dist * v.distance_cost_coeff
+    time_c = (0.0 if dist == 0 else dist / sp) * v.time_cost_coeff
+    return v.fixed_cost + time_c + dist_c + pen, dist
+
+
+class InsertionCache:
+    def __init__(self, vehicles: List[Vehicle], D, penalties: Dict[str, float], *,
+                 use_load_distance_cost: bool = False, time_scale: float = 6.0,
+                 min_pos: Optional[List[int]] = None):
+        """min_pos[k]: first position of vehicle k open to insertion (stops before it are locked)."""
+        self.vehicles = vehicles
+        self.min_pos = min_pos
+        self.D = D
+        self.penalties = penalties
+        self.use_ld = use_load_distance_cost
+        self.time_scale = time_scale
+        self._base: List[Optional[Tuple[float, float]]] = [None] * len(vehicles)
+        self._best: List[Dict[int, Tuple[float, int]]] = [{} for _ in vehicles]
+        self._load = [None] * len(vehicles)
+
+    def _eval(self, v: Vehicle, route: List[Hospital]) -> Tuple[float, float]:
+        return route_eval(v, route, self.D, self.penalties, self.use_ld, self.time_scale)
+
+    def invalidate(self, k: int) -> None:
+        self._base[k] = None
+        self._load[k] = None
+        self._best[k].clear()
+
+    def base(self, k: int) -> Tuple[float, float]:
+        if self._base[k] is None:
+            self._base[k] = self._eval(self.vehicles[k], self.vehicles[k].route)
+        return self._base[k]
+
+    def best(self, h: Hospital, k: int) -> Tuple[float, int]:
+        """Cheapest feasible (delta cost, position) of h in vehicle k, or (inf, -1)."""
+        hit = self._best[k].get(h.hospital_id)
+        if hit is not None:
+            return hit
+        v = self.vehicles[k]
+        if self._load[k] is None:
+            self._load[k] = (v.total_weight(), v.total_volume())
+        w, u = self._load[k]
+        res = (INF, -1)
+        if w + h.demand_weight <= v.weight_capacity and u + h.demand_volume <= v.volume_capacity:
+            base_cost, base_dist = self.base(k)
+            route, D, hid = v.route, self.D, h.hospital_id
+            lo = self.min_pos[k] if self.min_pos is not None else 0
+            prev = route[lo - 1].hospital_id if lo else 0
+            for pos in range(lo, len(route) + 1):
+                nxt = route[pos].hospital_id if pos < len(route) else 0
+                if base_dist - D[prev][nxt] + D[prev][hid] + D[hid][nxt] <= v.distance_capacity:
+                    cost, _ = self._eval(v, route[:pos] + [h] + route[pos:])
+                    if cost - base_cost < res[0]:
+                        res = (cost - base_cost, pos)
+                prev = nxt
+        self._best[k][h.hospital_id] = res
+        return res
+
+    def options(self, h: Hospital) -> List[Tuple[float, int, int]]:
+        """Feasible (delta, vehicle index, position) triples, cheapest first."""
+        out = []
+        for k in range(len(self.vehicles)):
+            delta, pos = self.best(h, k)
+            if pos >= 0:
+                out.append((delta, k, pos))
+        out.sort()
+        return out
+
+    def insert(self, h: Hospital, k: int, pos: int) -> None:
+        self.vehicles[k].route.insert(pos, h)
+        self.invalidate(k)
+
+    def remove(self, h: Hospital) -> None:
+        for k, v in enumerate(self.vehicles):
+            if h in v.route:
+                v.route.remove(h)
+                self.invalidate(k)
+                return
+
+
+def greedy_insert(cache: InsertionCache, pending: List[Hospital]) -> List[Hospital]:
+    """Insert the globally cheapest (hospital, vehicle, position) until done; returns leftovers."""
+    pending = list(pending)
+    while pending:
+        pick = None
+        for h in pending:
+            opts = cache.options(h)
+            if opts and (pick is None or opts[0][0] < pick[0]):
+                pick = (opts[0][0], h, opts[0][1], opts[0][2])
+        if pick is None:
+            break
+        _, h, k, pos = pick
+        cache.insert(h, k, pos)
+        pending.remove(h)
+    return pending
+
+
+def regret_insert(cache: InsertionCache, pending: List[Hospital], k: int = 2) -> List[Hospital]:
+    """Regret-k: insert the hospital that loses most by not getting its best vehicle now."""
+    pending = list(pending)
+    while pending:
+        pick = None
+        for h in pending:
+            opts = cache.options(h)
+            if not opts:
+                continue
+            regret = sum((opts[i][0] if i < len(opts) else INF) - opts[0][0] for i in range(1, k))
+            key = (regret, -opts[0][0], -h.hospital_id)
+            if pick is None or key > pick[0]:
+                pick = (key, h, opts[0][1], opts[0][2])
+        if pick is None:
+            break
+        _, h, kk, pos = pick
+        cache.insert(h, kk, pos)
+        pending.remove(h)
+    return pending
@@ -0,0 +1,162 @@
+# heuristics/jit.py
+"""
+Optional Numba backend for Solution.total_cost.
+- "numba" when numba is importable, else "python" (total_cost keeps the Vehicle loops). numba is
+  imported and the kernel compiled on the first total_cost call; VRP_JIT=0 forces the Python path.
+- One compiled call costs the whole solution: the total_distance, arrival_times/penalty and
+  load_distance_cost loops of every vehicle run over a flat int64 array of hospital ids and the
+  distances of the arcs they use, read from sol.distances on every call (one C-level gather), so
+  in-place edits of D are seen exactly as the Python path sees them. Vehicle rates are read from
+  sol.vehicles on every call; only hospital windows/volumes/alpha are cached per hospitals list.
+- Operations run in the same order as the Python loops: both backends return identical costs.
+- float64 ndarrays and list-of-lists matrices are supported; other dtypes stay on the Python path,
+  as do instances with fewer than MIN_HOSPITALS hospitals (call overhead would dominate).
+"""
+from itertools import chain
+from operator import attrgetter, getitem
+import os
+
+import numpy as np
+
+BACKENDS = ("auto", "python", "numba")
+MIN_HOSPITALS = 16
+_RATES = attrgetter("speed", "fixed_cost", "time_cost_coeff", "distance_cost_coeff")
+_ROUTE, _ID = attrgetter("route"), attrgetter("hospital_id")
+
+_state = {"backend": None, "kernel": None, "arcs": None}
+_instances = {}                                 # id(hospitals) -> (hospitals, n, tables)
+
+
+def _solution_cost(ids, lens, legs, earliest, latest, alpha, volume, vparams,
+                   early, late, time_scale, start, use_ld):
+    # legs[i]: distance into stop ids[i]; legs[len(ids) + r]: back to the depot from the r-th used route
+    total, off, back = 0.0, 0, len(ids)
+    for k in range(len(lens)):
+        n = lens[k]
+        if n == 0:
+            continue
+        speed, fixed, tc, dc = vparams[k, 0], vparams[k, 1], vparams[k, 2], vparams[k, 3]
+        # total_distance
+        s = 0.0
+        for i in range(off, off + n):
+            s += legs[i]
+        s += legs[back]
+        # arrival_times + penalty
+        pen, t = 0.0, start
+        for i in range(off, off + n):
+            h = ids[i]
+            t += legs[i] / speed
+            if t < earliest[h]:
+                pen += alpha[h] * early * (earliest[h] - t) * time_scale
+            elif t > latest[h]:
+                pen += alpha[h] * late * (t - latest[h]) * time_scale
+        # load_distance_cost
+        if use_ld:
+            remaining = 0.0
+            for i in range(off, off + n):
+                remaining += volume[ids[i]]
+            dist_c = 0.0
+            for i in range(off, off + n):
+                dist_c += dc * legs[i] * remaining
+                remaining -= volume[ids[i]]
+        else:
+            dist_c = s * dc
+        tt = 0.0 if s == 0 else s / speed
+        total += fixed + tt * tc + dist_c + pen
+        off += n
+        back += 1
+    return total
+
+
+def set_backend(name: str = "auto") -> str:
+    """"python", "numba" (ImportError without numba) or "auto"; returns the active backend."""
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {name!r}")
+    _state["backend"], _state["kernel"], _state["arcs"] = "python", None, None
+    if name == "numba" or (name == "auto" and os.environ.get("VRP_JIT", "1") != "0"):
+        try:
+            import numba
+        except ImportError:
+            if name == "numba":
+                raise
+        else:
+            _state["kernel"] = numba.njit(cache=True)(_solution_cost)
+            _state["arcs"] = numba.njit(cache=True)(_arcs)
+            _state["backend"] = "numba"
+    return _state["backend"]
+
+
+def backend() -> str:
+    if _state["backend"] is None:
+        set_backend("auto")
+    return _state["backend"]
+
+
+def clear_cache():
+    _instances.clear()
+
+
+def _tables(hs):
+    hit = _instances.get(id(hs))
+    if hit is not None and hit[0] is hs and hit[1] == len(hs):
+        return hit[2]
+    n = max(h.hospital_id for h in hs) + 1
+    earliest, latest, alpha, volume = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+    for h in hs:
+        i = h.hospital_id
+        earliest[i], latest[i], alpha[i], volume[i] = h.earliest_time, h.latest_time, h.alpha, h.demand_volume
+    tables = (earliest, latest, alpha, volume)
+    if len(_instances) >= 8:
+        _instances.clear()
+    _instances[id(hs)] = (hs, len(hs), tables)
+    return tables
+
+
+def _arcs(ids, lens):
+    """(src, dst) of every arc the routes use: into each stop (in ids order), then back to the depot."""
+    used = 0
+    for k in range(len(lens)):
+        if lens[k] > 0:
+            used += 1
+    src, dst = np.empty(len(ids) + used, np.int64), np.zeros(len(ids) + used, np.int64)
+    off, back = 0, len(ids)
+    for k in range(len(lens)):
+        n = lens[k]
+        if n == 0:
+            continue
+        src[off] = 0
+        for i in range(off, off + n):
+            if i > off:
+                src[i] = ids[i - 1]
+            dst[i] = ids[i]
+        src[back] = ids[off + n - 1]
+        off += n
+        back += 1
+    return src, dst
+
+
+def _legs(D, ids, lens):
+    src, dst = (_state["arcs"] or _arcs)(ids, lens)
+    if isinstance(D, np.ndarray):
+        return np.asarray(D)[src, dst]                                 # memmap -> plain ndarray
+    return np.fromiter(map(getitem, map(D.__getitem__, src.tolist()), dst.tolist()), dtype=np.float64, count=len(src))
+
+
+def kernel_args(sol, penalties, use_load_distance_cost=True, time_scale=6.0, start=8.0):
+    """Argument tuple for _solution_cost, or None when this solution has to use the Python path."""
+    D = sol.distances
+    if len(sol.hospitals) < MIN_HOSPITALS or (isinstance(D, np.ndarray) and D.dtype != np.float64):
+        return None
+    earliest, latest, alpha, volume = _tables(sol.hospitals)
+    vs = sol.vehicles
+    vparams = np.fromiter(chain.from_iterable(map(_RATES, vs)), dtype=np.float64, count=4 * len(vs)).reshape(-1, 4)
+    lens = np.fromiter(map(len, map(_ROUTE, vs)), dtype=np.int64, count=len(vs))
+    ids = np.fromiter(map(_ID, chain.from_iterable(map(_ROUTE, vs))), dtype=np.int64, count=int(lens.sum()))
+    return (ids, lens, _legs(D, ids, lens), earliest, latest, alpha, volume, vparams, float(penalties["early"]),
+            float(penalties["late"]), float(time_scale), float(start), bool(use_load_distance_cost))
+
+
+def solution_cost(sol, penalties, use_load_distance_cost=True, time_scale=6.0, start=8.0):
+    """Compiled Solution.total_cost, or None when this solution has to use the Python path."""
+    args = kernel_args(sol, penalties, use_load_distance_cost, time_scale, start)
+    return None if args is None else _state["kernel"](*args)
@@ -0,0 +1,118 @@
+# heuristics/kernels.py
+"""
+Batched NumPy cost kernel: score many routes / many candidate solutions in one vectorised pass.
+- Routes are packed into a padded (R, L) array of hospital ids with their lengths and vehicle
+  indices; one gather of D gives every leg, from which distance, travel time, arrival times,
+  load-distance cost and early/late penalties are derived together.
+- Accumulation walks the stop positions (L vector steps across all R routes), so every sum is taken
+  in the same order as the Python loops and every term is formed like Vehicle.vehicle_cost: results
+  equal Solution.total_cost bit for bit in both use_load_distance_cost modes.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .common import Hospital, Vehicle, Solution
+
+
+class CostKernel:
+    """
+    kern = CostKernel(D, hospitals, vehicles, penalties, use_load_distance_cost=False)
+    kern.solution_costs([sol1, sol2, ...])        # == [s.total_cost(...) for s in sols]
+    kern.route_terms(routes, vehicle_ids)         # per-route distance/time/ld/penalty/cost arrays
+    """
+
+    def __init__(self, D, hospitals: Sequence[Hospital], vehicles: Sequence[Vehicle], penalties: Dict[str, float], *,
+                 use_load_distance_cost: bool = True, time_scale: float = 6.0, start: float = 8.0):
+        self.D = np.asarray(D, dtype=np.float64)
+        n = self.D.shape[0]
+        self.earliest = np.zeros(n)
+        self.latest = np.zeros(n)
+        self.alpha = np.zeros(n)
+        self.volume = np.zeros(n)
+        for h in hospitals:
+            i = h.hospital_id
+            self.earliest[i], self.latest[i] = h.earliest_time, h.latest_time
+            self.alpha[i], self.volume[i] = h.alpha, h.demand_volume
+        self.vindex = {v.vehicle_id: k for k, v in enumerate(vehicles)}
+        self.speed = np.array([v.speed for v in vehicles], dtype=np.float64)
+        self.fixed = np.array([v.fixed_cost for v in vehicles], dtype=np.float64)
+        self.tc = np.array([v.time_cost_coeff for v in vehicles], dtype=np.float64)
+        self.dc = np.array([v.distance_cost_coeff for v in vehicles], dtype=np.float64)
+        self.early, self.late = float(penalties["early"]), float(penalties["late"])
+        self.use_ld = bool(use_load_distance_cost)
+        self.time_scale = float(time_scale)
+        self.start = float(start)
+
+    @staticmethod
+    def pack(routes: Sequence[Sequence[int]]):
+        """Padded (R, max(L, 1)) int array of hospital ids (0 in the padding) and the route lengths."""
+        lens = np.fromiter((len(r) for r in routes), dtype=np.int64, count=len(routes))
+        L = max(int(lens.max()), 1) if len(routes) else 1
+        idx = np.zeros((len(routes), L), dtype=np.int64)
+        for k, r in enumerate(routes):
+            idx[k, :len(r)] = r
+        return idx, lens
+
+    def route_terms(self, routes: Sequence[Sequence[int]], vehicle_ids: Sequence) -> Dict[str, np.ndarray]:
+        """{"distance", "travel_time", "load_distance", "penalty", "cost"} per route (hospital-id lists)."""
+        idx, lens = self.pack(routes)
+        k = np.fromiter((self.vindex[v] for v in vehicle_ids), dtype=np.int64, count=len(vehicle_ids))
+        return self._terms(idx, lens, k)
+
+    def _terms(self, idx: np.ndarray, lens: np.ndarray, k: np.ndarray) -> Dict[str, np.ndarray]:
+        R, L = idx.shape
+        mask = np.arange(L)[None, :] < lens[:, None]
+        prev = np.zeros_like(idx)
+        prev[:, 1:] = idx[:, :-1]
+        legs = np.where(mask, self.D[prev, idx], 0.0).T              # (L, R): one row per stop position
+        maskT = mask.T
+        last = idx[np.arange(R), np.maximum(lens - 1, 0)]
+        back = np.where(lens > 0, self.D[last, 0], 0.0)
+        sp, dc = self.speed[k], self.dc[k]
+        e, l, a = self.earliest[idx].T, self.latest[idx].T, self.alpha[idx].T
+        vol = np.where(mask, self.volume[idx], 0.0).T
+        early, late, ts = self.early, self.late, self.time_scale
+
+        path, t, pen, ld, total_vol = (np.zeros(R) for _ in range(5))
+        t += self.start
+        for p in range(L):                                            # vectorised over routes
+            total_vol += vol[p]
+        remaining = total_vol.copy()
+        for p in range(L):
+            d, m = legs[p], maskT[p]
+            path += d
+            t += d / sp
+            pen += np.where(m & (t < e[p]), a[p] * early * (e[p] - t) * ts,
+                            np.where(m & (t > l[p]), a[p] * late * (t - l[p]) * ts, 0.0))
+            ld += dc * d * remaining
+            remaining -= vol[p]
+        dist = path + back
+
+        tt = np.where(dist == 0, 0.0, dist / sp)
+        dist_c = ld if self.use_ld else dist * dc
+        cost = np.where(lens > 0, self.fixed[k] + tt * self.tc[k] + dist_c + pen, 0.0)
+        return {"distance": dist, "travel_time": tt, "load_distance": ld, "penalty": pen, "cost": cost}
+
+    def solution_costs(self, solutions: Sequence[Solution]) -> np.ndarray:
+        """Total cost per solution; equals Solution.total_cost with this kernel's settings."""
+        routes: List[List[int]] = []
+        vids: List[int] = []
+        slot = np.zeros((len(solutions), max((len(s.vehicles) for s in solutions), default=0)), dtype=np.int64)
+        for si, s in enumerate(solutions):
+            for vi, v in enumerate(s.vehicles):
+                slot[si, vi] = len(routes) + 1
+                routes.append([h.hospital_id for h in v.route])
+                vids.append(self.vindex[v.vehicle_id])
+        if not routes:
+            return np.zeros(len(solutions))
+        idx, lens = self.pack(routes)
+        cost = self._terms(idx, lens, np.asarray(vids, dtype=np.int64))["cost"]
+        M = np.where(slot > 0, np.concatenate([[0.0], cost])[slot], 0.0)
+        out = np.zeros(len(solutions))
+        for col in M.T:
+            out += col
+        return out
+
+    def solution_cost(self, solution: Solution) -> float:
+        return float(self.solution_costs([solution])[0])
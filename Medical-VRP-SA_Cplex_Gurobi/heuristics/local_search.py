@@ -0,0 +1,150 @@
+# heuristics/local_search.py
+"""
+Deterministic first-improvement local search on a Solution, using the SA move set:
+- two_opt: reverse a segment of one route;  insert: move a stop within its route;
+- relocate: move a stop to another route;   swap: exchange stops of two routes.
+Delta evaluation: a move re-evaluates only the one or two routes it touches (route_eval, same
+objective as Vehicle.vehicle_cost) against cached route costs and loads. Moves must keep the
+touched routes within weight/volume/distance limits. Modifies the solution in place.
+Optional restrictions (used by decompose and reoptimize):
+- routes: vehicle indices the search may touch (moves stay among them);
+- min_pos: per-vehicle locked prefix length, stops before it are never moved or preceded;
+- neighbors: relocate a stop only next to one of its `neighbors` nearest hospitals in another route.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+import time
+
+from .common import Solution
+from .insertion import route_eval
+
+OPERATORS = ("two_opt", "insert", "relocate", "swap")
+DEFAULT_OPERATORS = ("two_opt", "relocate")
+
+EPS = 1e-9
+
+
+def local_search(sol: Solution, penalties: Dict[str, float], *, operators: Sequence[str] = DEFAULT_OPERATORS,
+                 use_load_distance_cost: bool = False, time_scale: float = 6.0, max_passes: int = 5,
+                 time_limit: float = 0.0, routes: Optional[Iterable[int]] = None,
+                 min_pos: Optional[Sequence[int]] = None, neighbors: Optional[int] = None) -> int:
+    """Apply improving moves until a pass finds none (or max_passes / time_limit). Returns moves made."""
+    bad = [op for op in operators if op not in OPERATORS]
+    if bad:
+        raise ValueError(f"unknown operators {bad}, choose from {OPERATORS}")
+    D, vs = sol.distances, sol.vehicles
+    ks = list(range(len(vs))) if routes is None else sorted(set(routes))
+    lo = (lambda k: 0) if min_pos is None else (lambda k: min_pos[k])
+    ev = lambda v, r: route_eval(v, r, D, penalties, use_load_distance_cost, time_scale)
+    cost = {k: ev(vs[k], vs[k].route)[0] for k in ks}
+    load = {k: [vs[k].total_weight(), vs[k].total_volume()] for k in ks}
+    near = _nearest(D, vs, ks, lo, neighbors) if neighbors else None
+    owner = {h.hospital_id: k for k in ks for h in vs[k].route}
+    t0, moves = time.perf_counter(), 0
+    out_of_time = lambda: time_limit and time.perf_counter() - t0 >= time_limit
+
+    def fits(k, dw, du):
+        return load[k][0] + dw <= vs[k].weight_capacity and load[k][1] + du <= vs[k].volume_capacity
+
+    def intra(k, cand):
+        c, d = ev(vs[k], cand)
+        if c < cost[k] - EPS and d <= vs[k].distance_capacity:
+            vs[k].route, cost[k] = cand, c
+            return True
+        return False
+
+    def targets(k, h):
+        """(k2, pos) insertion points for h in the other routes that have room for it."""
+        ok = lambda k2: k2 != k and fits(k2, h.demand_weight, h.demand_volume)
+        if near is None:
+            return [(k2, pos) for k2 in ks if ok(k2) for pos in range(lo(k2), len(vs[k2].route) + 1)]
+        out = []
+        for n_id in near[h.hospital_id]:
+            k2 = owner[n_id]
+            if ok(k2):
+                j = next(p for p, x in enumerate(vs[k2].route) if x.hospital_id == n_id)
+                out += [(k2, pos) for pos in (j, j + 1) if pos >= lo(k2)]
+        return out
+
+    for _ in range(max_passes):
+        improved = False
+        for k in ks:
+            if "two_opt" in operators:
+                r = vs[k].route
+                for i in range(lo(k), len(r) - 1):
+                    for j in range(i + 1, len(r)):
+                        r = vs[k].route
+                        if intra(k, r[:i] + r[i:j + 1][::-1] + r[j + 1:]):
+                            moves += 1; improved = True
+            if "insert" in operators:
+                for i in range(lo(k), len(vs[k].route)):
+                    for j in range(lo(k), len(vs[k].route)):
+                        r = vs[k].route
+                        if i == j or i >= len(r):
+                            continue
+                        rest = r[:i] + r[i + 1:]
+                        if intra(k, rest[:j] + [r[i]] + rest[j:]):
+                            moves += 1; improved = True
+            if "relocate" in operators:
+                i = len(vs[k].route) - 1
+                while i >= lo(k):
+                    r = vs[k].route
+                    h = r[i]
+                    r_wo = r[:i] + r[i + 1:]
+                    c_wo = ev(vs[k], r_wo)[0]
+                    best = (-EPS, None)
+                    for k2, pos in targets(k, h):
+                        v2, r2 = vs[k2], vs[k2].route
+                        c2, d2 = ev(v2, r2[:pos] + [h] + r2[pos:])
+                        delta = (c2 - cost[k2]) + (c_wo - cost[k])
+                        if delta < best[0] and d2 <= v2.distance_capacity:
+                            best = (delta, (k2, pos, c2))
+                    if best[1] is not None:
+                        k2, pos, c2 = best[1]
+                        vs[k].route = r_wo
+                        vs[k2].route = vs[k2].route[:pos] + [h] + vs[k2].route[pos:]
+                        cost[k], cost[k2] = c_wo, c2
+                        load[k][0] -= h.demand_weight; load[k][1] -= h.demand_volume
+                        load[k2][0] += h.demand_weight; load[k2][1] += h.demand_volume
+                        owner[h.hospital_id] = k2
+                        moves += 1; improved = True
+                    i = min(i - 1, len(vs[k].route) - 1)
+            if "swap" in operators:
+                for k2 in ks:
+                    if k2 <= k:
+                        continue
+                    for i in range(lo(k), len(vs[k].route)):
+                        for j in range(lo(k2), len(vs[k2].route)):
+                            r1, r2 = vs[k].route, vs[k2].route
+                            a, b = r1[i], r2[j]
+                            dw, du = b.demand_weight - a.demand_weight, b.demand_volume - a.demand_volume
+                            if not (fits(k, dw, du) and fits(k2, -dw, -du)):
+                                continue
+                            n1 = r1[:i] + [b] + r1[i + 1:]
+                            n2 = r2[:j] + [a] + r2[j + 1:]
+                            c1, d1 = ev(vs[k], n1)
+                            c2, d2 = ev(vs[k2], n2)
+                            if c1 + c2 < cost[k] + cost[k2] - EPS and d1 <= vs[k].distance_capacity \
+                                    and d2 <= vs[k2].distance_capacity:
+                                vs[k].route, vs[k2].route = n1, n2
+                                cost[k], cost[k2] = c1, c2
+                                load[k][0] += dw; load[k][1] += du
+                                load[k2][0] -= dw; load[k2][1] -= du
+                                owner[a.hospital_id], owner[b.hospital_id] = k2, k
+                                moves += 1; improved = True
+            if out_of_time():
+                return moves
+        if not improved:
+            break
+    return moves
+
+
+def _nearest(D, vs, ks, lo, neighbors: int) -> Dict[int, List[int]]:
+    """hospital id -> its `neighbors` nearest movable hospitals in the searched routes (by D)."""
+    import numpy as np
+    ids = sorted(h.hospital_id for k in ks for h in vs[k].route[lo(k):])
+    if len(ids) < 2:
+        return {i: [] for i in ids}
+    A = np.asarray(D, dtype=float)
+    sub = A[np.ix_(ids, ids)] + np.diag(np.full(len(ids), np.inf))
+    nn = min(neighbors, len(ids) - 1)
+    return {ids[i]: [ids[j] for j in np.argpartition(sub[i], nn - 1)[:nn]] for i in range(len(ids))}
@@ -0,0 +1,105 @@
+# heuristics/mip_start.py
+"""
+MIP starts for the CPLEX/Gurobi models built from heuristic incumbents.
+- mip_start_values: Solution -> values of x, z, y, t, e, l and MTZ order u (model indexing).
+- heuristic_start: run SA/PSO once and return its best Solution.
+- start_incumbent_feed: background heuristic restarts that push improvements into a queue.
+"""
+from typing import List, Dict, Tuple, Optional
+import queue
+import random
+import threading
+
+from heuristics.common import Hospital, Vehicle, Solution
+
+
+def mip_start_values(solution: Solution, vehicles: List[Vehicle], n: int, *,
+                     start_time: float = 8.0) -> Dict[str, dict]:
+    """Values keyed like the MILP variables; vehicle k is matched by vehicle_id."""
+    K = list(range(len(vehicles)))
+    V_nodes = list(range(1, n))
+    k_by_id = {v.vehicle_id: k for k, v in enumerate(vehicles)}
+
+    x = {(k, i, j): 0.0 for k in K for i in range(n) for j in range(n) if i != j}
+    z = {(k, i): 0.0 for k in K for i in V_nodes}
+    y = {k: 0.0 for k in K}
+    t, e, ell, u = {}, {}, {}, {}
+
+    for veh in solution.vehicles:
+        if not veh.route:
+            continue
+        k = k_by_id[veh.vehicle_id]
+        y[k] = 1.0
+        sp = max(float(vehicles[k].speed), 1e-9)
+        last, at = 0, float(start_time)
+        for pos, h in enumerate(veh.route, start=1):
+            i = h.hospital_id
+            x[(k, last, i)] = 1.0
+            z[(k, i)] = 1.0
+            at += float(solution.distances[last][i]) / sp
+            t[i] = at
+            e[i] = max(0.0, float(h.earliest_time) - at)
+            ell[i] = max(0.0, at - float(h.latest_time))
+            u[i] = float(pos)
+            last = i
+        x[(k, last, 0)] = 1.0
+
+    return {"x": x, "z": z, "y": y, "t": t, "e": e, "l": ell, "u": u}
+
+
+def _records_to_objects(hosp_recs, veh_recs) -> Tuple[List[Hospital], List[Vehicle]]:
+    return [Hospital(**r) for r in hosp_recs], [Vehicle(**r) for r in veh_recs]
+
+
+def heuristic_start(method: str, D, hosp_recs, veh_recs, penalties: Dict[str, float], *,
+                    max_iters: int = 2000, seed: Optional[int] = None,
+                    time_scale: float = 6.0) -> Tuple[Solution, float]:
+    """Run SA or PSO on fresh objects with the MILP objective (plain distance)."""
+    hospitals, vehicles = _records_to_objects(hosp_recs, veh_recs)
+    if seed is not None:
+        random.seed(seed)
+    if method == "sa":
+        from heuristics.sa import SimulatedAnnealing
+        sa = SimulatedAnnealing(D, initial_temp=1000.0, cooling_rate=0.999, min_temp=1e-3,
+                                max_iters=max_iters, penalties=penalties,
+                                use_load_distance_cost=False, time_scale=time_scale)
+        return sa.run(vehicles, hospitals, verbose_every=0)
+    if method == "pso":
+        from heuristics.pso.pso import PSO
+        pso = PSO(D, penalties, max_iters=max_iters, use_load_distance_cost=False,
+                  time_scale=time_scale, seed=seed)
+        return pso.run(vehicles, hospitals, verbose_every=0)
+    raise ValueError(f"Unknown warm-start heuristic: {method}")
+
+
+def start_incumbent_feed(method: str, D, hosp_recs, veh_recs, penalties: Dict[str, float], *,
+                         restarts: int = 10, max_iters: int = 2000, seed: int = 0,
+                         time_scale: float = 6.0, best_cost: float = float("inf")):
+    """Restart the heuristic in a daemon thread; each improvement is put as (cost, Solution)."""
+    feed: "queue.Queue[Tuple[float, Solution]]" = queue.Queue()
+
+    def _work():
+        best = best_cost
+        for r in range(restarts):
+            sol, cost = heuristic_start(method, D, hosp_recs, veh_recs, penalties,
+                                        max_iters=max_iters, seed=seed + r + 1,
+                                        time_scale=time_scale)
+            if cost < best:
+                best = cost
+                feed.put((cost, sol))
+
+    th = threading.Thread(target=_work, name=f"{method}-incumbent-feed", daemon=True)
+    th.start()
+    return feed, th
+
+
+def drain_best(feed) -> Optional[Tuple[float, Solution]]:
+    """Pop everything currently queued and keep the cheapest entry."""
+    best = None
+    while True:
+        try:
+            item = feed.get_nowait()
+        except queue.Empty:
+            return best
+        if best is None or item[0] < best[0]:
+            best = item
@@ -0,0 +1,277 @@
+"""
+Portfolio solver: race several solvers on one instance under a single wall-clock deadline.
+- Heuristic members (SA multi-start, PSO, ALNS) run in spawn-context worker processes and send
+  every improved incumbent (cost, routes) to the parent; all use the MILP objective (plain distance).
+- The parent keeps the global incumbent, shares it back (every other SA restart starts from it)
+  and, when a MILP backend is available, injects it into branch-and-bound through the incumbent feed.
+- The race ends at the deadline, when every member has finished, or as soon as the MILP proves
+  optimality; the report names the member that found the returned solution.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import multiprocessing as mp
+import queue
+import random
+import threading
+import time
+
+from heuristics.common import Hospital, Vehicle, Solution
+from utils.checkpoint import encode_routes, decode_routes
+
+HEURISTICS = ("sa", "pso", "alns")
+MILP_BACKENDS = ("gurobi", "cplex")
+PUBLISH_EVERY = 0.1   # seconds between incumbent messages from a worker
+POLL_EVERY = 0.05     # seconds between stop-flag checks in a worker
+JOIN_GRACE = 5.0      # seconds a member gets to stop after the race ends
+MILP_GRACE = 1.0      # seconds past the deadline the MILP gets to return its incumbent
+
+# defaults on the MILP objective; per-member params override them
+MEMBER_DEFAULTS = {
+    "sa": dict(initial_temp=1000.0, cooling_rate=0.999, min_temp=1e-3, max_iters=20000),
+    "pso": dict(max_iters=10 ** 9),
+    "alns": dict(max_iters=10 ** 9),
+}
+
+
+class _Reporter:
+    """Worker-side solver callback: throttled incumbent messages, stop on deadline or stop flag."""
+
+    def __init__(self, name, out, stop, deadline):
+        self.name, self.out, self.stop, self.deadline = name, out, stop, deadline
+        self.best = float("inf")
+        self.pending = None
+        self.last_pub = self.last_poll = 0.0
+
+    def flush(self):
+        if self.pending is not None:
+            self.out.put(("inc", self.name) + self.pending)
+            self.pending = None
+
+    def __call__(self, it, cost, sol):
+        now = time.time()
+        if cost < self.best - 1e-9:
+            self.best = cost
+            self.pending = (float(cost), encode_routes(sol.vehicles), now)
+        if now - self.last_pub >= PUBLISH_EVERY:
+            self.last_pub = now
+            self.flush()
+        if now >= self.deadline:
+            return True
+        if now - self.last_poll >= POLL_EVERY:
+            self.last_poll = now
+            return self.stop.is_set()
+        return False
+
+
+def _member(name, kind, data, params, seed, deadline, time_scale, out, stop, shared):
+    """Worker process entry point: run one portfolio member until it finishes or is stopped."""
+    D, Hrec, Vrec, P = data
+    rep = _Reporter(name, out, stop, deadline)
+    runs = 0
+    try:
+        while time.time() < deadline and not stop.is_set():
+            hospitals = [Hospital(**r) for r in Hrec]
+            vehicles = [Vehicle(**r) for r in Vrec]
+            run_seed = seed + runs
+            random.seed(run_seed)
+            kw = {**MEMBER_DEFAULTS.get(kind, {}), "use_load_distance_cost": False,
+                  "time_scale": time_scale, "time_limit": max(0.01, deadline - time.time()), **params}
+            if kind == "sa":
+                from heuristics.sa import SimulatedAnnealing
+                sa = SimulatedAnnealing(D, penalties=P, **kw)
+                start = shared.get("best") if runs % 2 else None
+                if start is not None:
+                    sa.init_solution = lambda vs, hs, rows=start[1]: Solution(decode_routes(rows, vs, hs), hs, D)
+                sa.run(vehicles, hospitals, verbose_every=0, callback=rep)
+            elif kind == "pso":
+                from heuristics.pso.pso import PSO
+                PSO(D, P, seed=run_seed, **kw).run(vehicles, hospitals, verbose_every=0, callback=rep)
+            elif kind == "alns":
+                from heuristics.alns import ALNS
+                ALNS(D, P, seed=run_seed, **kw).run(vehicles, hospitals, verbose_every=0, callback=rep)
+            else:
+                raise ValueError(f"Unknown portfolio member: {kind}")
+            runs += 1
+        rep.flush()
+        out.put(("done", name, {"runs": runs, "error": ""}))
+    except Exception as e:
+        rep.flush()
+        out.put(("done", name, {"runs": runs, "error": f"{type(e).__name__}: {e}"}))
+
+
+def _solve_milp(backend, D, hospitals, vehicles, P, *, time_limit, time_scale, start_time, feed):
+    """One MILP attempt; returns (Solution or None, cost, proven_optimal)."""
+    if backend == "gurobi":
+        from gurobipy import GRB
+        from gurobi_solver.gurobi_solver import solve_gurobi, extract_solution_from_gurobi
+        m = solve_gurobi(D, hospitals, vehicles, P, time_limit=time_limit, time_scale=time_scale,
+                         start_time=start_time, incumbent_feed=feed)
+        if m.SolCount == 0:
+            return None, float("inf"), False
+        sol, cost = extract_solution_from_gurobi(m, D, hospitals, vehicles, P, time_scale=time_scale)
+        return sol, cost, m.Status == GRB.OPTIMAL
+    if backend == "cplex":
+        from cplex_solver.cplex_solver import solve_cplex, extract_solution_from_cplex
+        mdl, res = solve_cplex(D, hospitals, vehicles, P, time_limit=time_limit, time_scale=time_scale,
+                               start_time=start_time, incumbent_feed=feed)
+        if res is None:
+            return None, float("inf"), False
+        sol, cost = extract_solution_from_cplex(mdl, D, hospitals, vehicles, P, time_scale=time_scale)
+        return sol, cost, mdl.solve_details.status_code in (101, 102)   # CPXMIP_OPTIMAL(_TOL)
+    raise ValueError(f"Unknown MILP backend: {backend}")
+
+
+def _milp_candidates(milp: str) -> List[str]:
+    if milp == "none":
+        return []
+    names = MILP_BACKENDS if milp == "auto" else (milp,)
+    found = []
+    for b in names:
+        try:
+            __import__("gurobipy" if b == "gurobi" else "docplex.mp.model")
+            found.append(b)
+        except ImportError:
+            if milp != "auto":
+                raise
+    return found
+
+
+def run_portfolio(D, hosp_recs, veh_recs, penalties: Dict[str, float], *,
+                  deadline: float = 60.0,
+                  members: Sequence[str] = ("sa", "sa", "pso", "alns"),
+                  params: Optional[Dict[str, dict]] = None,
+                  milp: str = "auto",
+                  seed: int = 42,
+                  time_scale: float = 6.0,
+                  start_time: float = 8.0,
+                  verbose: bool = True) -> Tuple[Optional[Solution], float, dict]:
+    """Race `members` (names from HEURISTICS, repeats allowed) and a MILP backend
+    ("auto": first of gurobi/cplex that imports and solves, "none": heuristics only) for `deadline`
+    seconds. Returns (best Solution, cost, report)."""
+    params = params or {}
+    for kind in members:
+        if kind not in HEURISTICS:
+            raise ValueError(f"portfolio members must be in {HEURISTICS}, got '{kind}'")
+    backends = _milp_candidates(milp)
+    t0 = time.time()
+    t_end = t0 + float(deadline)
+    hospitals = [Hospital(**r) for r in hosp_recs]
+    vehicles = [Vehicle(**r) for r in veh_recs]
+
+    counts: Dict[str, int] = {}
+    names = []
+    for kind in members:
+        names.append(f"{kind}#{counts.get(kind, 0)}" if members.count(kind) > 1 else kind)
+        counts[kind] = counts.get(kind, 0) + 1
+    stats = {n: {"best": None, "time_to_best_s": None, "improvements": 0, "status": "running"}
+             for n in names}
+
+    ctx = mp.get_context("spawn")
+    manager = ctx.Manager()
+    shared = manager.dict()
+    out, stop = ctx.Queue(), ctx.Event()
+    data = (D, hosp_recs, veh_recs, penalties)
+    procs = []
+    for i, (name, kind) in enumerate(zip(names, members)):
+        p = ctx.Process(target=_member, name=f"portfolio-{name}", daemon=True,
+                        args=(name, kind, data, params.get(kind, {}), seed + 1000 * i, t_end,
+                              time_scale, out, stop, shared))
+        p.start()
+        procs.append(p)
+
+    best = {"cost": float("inf"), "routes": None, "sol": None, "by": ""}
+    feed: "queue.Queue[Tuple[float, Solution]]" = queue.Queue()
+    milp_box: dict = {}
+
+    def _milp_work():
+        for backend in backends:
+            name = backend
+            stats[name] = {"best": None, "time_to_best_s": None, "improvements": 0, "status": "running"}
+            try:
+                sol, cost, optimal = _solve_milp(backend, D, hospitals, vehicles, penalties,
+                                                 time_limit=max(1.0, t_end - time.time()),
+                                                 time_scale=time_scale, start_time=start_time, feed=feed)
+            except Exception as e:
+                stats[name]["status"] = f"error: {type(e).__name__}: {e}"
+                continue
+            stats[name]["status"] = "optimal" if optimal else ("feasible" if sol is not None else "no solution")
+            milp_box.update(name=name, sol=sol, cost=cost, optimal=optimal, t=time.time())
+            return
+
+    th = None
+    if backends:
+        th = threading.Thread(target=_milp_work, name="portfolio-milp", daemon=True)
+        th.start()
+
+    def _record(name, cost, t, routes=None, sol=None):
+        st = stats[name]
+        if st["best"] is None or cost < st["best"] - 1e-9:
+            st["best"], st["time_to_best_s"] = cost, round(t - t0, 3)
+            st["improvements"] += 1
+        if cost < best["cost"] - 1e-9:
+            best.update(cost=cost, routes=routes, sol=sol, by=name)
+            if routes is not None:
+                shared["best"] = (cost, routes)
+                if th is not None:
+                    feed.put((cost, Solution(decode_routes(routes, vehicles, hospitals), hospitals, D)))
+            if verbose:
+                print(f"[portfolio] {t - t0:7.2f}s {name:>8}: {cost:.2f}")
+
+    def _on_message(msg, done_status):
+        if msg[0] == "inc":
+            _record(msg[1], msg[2], msg[4], routes=msg[3])
+        else:
+            running.discard(msg[1])
+            stats[msg[1]]["runs"] = msg[2]["runs"]
+            stats[msg[1]]["status"] = f"error: {msg[2]['error']}" if msg[2]["error"] else done_status
+
+    stop_reason = "completed"
+    running = set(names)
+    while True:
+        if milp_box.get("optimal"):
+            stop_reason = "optimal"
+        elif time.time() >= t_end:
+            stop_reason = "deadline"
+        elif not running and (th is None or not th.is_alive()):
+            break
+        if stop_reason != "completed":
+            stop.set()
+            break
+        try:
+            msg = out.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        _on_message(msg, "finished")
+
+    # members flush their last incumbent and report "done" once they notice the stop flag;
+    # drain before joining so no worker blocks on a full queue pipe
+    grace_end = time.time() + JOIN_GRACE
+    while running and time.time() < grace_end:
+        try:
+            msg = out.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        _on_message(msg, "stopped")
+    for p in procs:
+        p.join(timeout=0.5)
+        if p.is_alive():
+            p.terminate()
+            stats[p.name.split("-", 1)[1]]["status"] = "terminated"
+    manager.shutdown()
+
+    if th is not None:
+        th.join(timeout=max(0.0, t_end - time.time()) + MILP_GRACE)
+        if th.is_alive():
+            for b in backends:
+                if stats.get(b, {}).get("status") == "running":
+                    stats[b]["status"] = "abandoned"
+    if milp_box.get("sol") is not None:
+        _record(milp_box["name"], milp_box["cost"], milp_box["t"], sol=milp_box["sol"])
+
+    sol = best["sol"]
+    if sol is None and best["routes"] is not None:
+        sol = Solution(decode_routes(best["routes"], vehicles, hospitals), hospitals, D)
+    report = {"winner": best["by"] or None, "cost": best["cost"] if sol is not None else None,
+              "stop": stop_reason, "elapsed_s": round(time.time() - t0, 3),
+              "milp_optimal": bool(milp_box.get("optimal")),
+              "members": stats}
+    return sol, best["cost"], report
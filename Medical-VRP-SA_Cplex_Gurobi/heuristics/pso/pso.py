@@ -1,13 +1,33 @@
 # heuristics/pso.py
 """
 Particle Swarm Optimization (PSO) for Medical VRP (unitless, plain distance).
-- Encoding: Random Keys for visit order; greedy split to vehicles.
+- Encoding: Random Keys for visit order; greedy split to vehicles, or the optimal Prins split
+  (decoder="split", see split.py) with the greedy decoder as fallback when no feasible split exists.
+- Decode cache: bounded LRU keyed by a 128-bit digest of the visit order (the argsort of the keys),
+  holding cost and route partition; converged swarms repeat orders and skip decoding/costing.
+  Cleared at the start of each run(). Counters: cache_hits, cache_misses, cache_evictions, cache_hit_rate.
+- Hybrid mode (local_search_every=N): every N iterations the gbest and the top-k pbest solutions
+  get a route-level local search (heuristics.local_search); improved solutions are re-encoded as
+  keys (the particle's own key values reassigned in the new visit order), decoded again, and replace
+  pbest/gbest only if the decoded cost is lower, so stored costs always match their keys.
+- Batch scoring (batch_scoring=True): each iteration moves the whole swarm against the gbest of the
+  previous iteration, decodes every particle, and costs all cache misses in one heuristics.kernels.CostKernel
+  pass (equal to Solution.total_cost); pbest/gbest are then updated in particle order.
 - Objective: use heuristics.common.Solution.total_cost(...), use_load_distance_cost=False by default.
 """
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Callable
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
 import random
+import time
 
 from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.local_search import local_search, DEFAULT_OPERATORS
+from heuristics.bounds import resolve_bound, gap
+from heuristics.pso.split import split_tour
+from utils.checkpoint import save_checkpoint, load_checkpoint, encode_routes, decode_routes, rng_state, set_rng_state
 
 def _clone_vehicle(v: Vehicle) -> Vehicle:
     return Vehicle(
@@ -31,10 +51,17 @@ def _fits_after_append(veh: Vehicle, h: Hospital, D: List[List[float]]) -> bool:
     new_dist = _route_distance(D, new_ids)
     return new_dist <= veh.distance_capacity
 
+def _key_order(keys: List[float], ids: List[int]) -> List[int]:
+    return [i for i, _ in sorted(zip(ids, keys), key=lambda t: t[1])]
+
+def _order_digest(order: List[int]) -> bytes:
+    return hashlib.blake2b(array("q", order).tobytes(), digest_size=16).digest()
+
 def _decode_random_keys(keys: List[float], hospitals: List[Hospital], vehicles: List[Vehicle], D: List[List[float]]) -> List[Vehicle]:
     hosp_by_id = {h.hospital_id: h for h in hospitals}
-    ids = sorted(hosp_by_id.keys())
-    order = [i for i, _ in sorted(zip(ids, keys), key=lambda t: t[1])]
+    return _greedy_decode(_key_order(keys, sorted(hosp_by_id.keys())), hosp_by_id, vehicles, D)
+
+def _greedy_decode(order: List[int], hosp_by_id: Dict[int, Hospital], vehicles: List[Vehicle], D: List[List[float]]) -> List[Vehicle]:
     new_vs = [_clone_vehicle(v) for v in vehicles]
 
     for hid in order:
@@ -68,6 +95,8 @@ def _feasibility_penalty(vehicles: List[Vehicle], D: List[List[float]]) -> float
         if d > v.distance_capacity: pen += (d - v.distance_capacity) * M
     return pen
 
+DECODERS = ("greedy", "split")
+
 class Particle:
     def __init__(self, dim: int):
         self.x = [random.random() for _ in range(dim)]
@@ -90,9 +119,35 @@ class PSO:
         use_load_distance_cost: bool = False,
         time_scale: float = 6.0,
         seed: Optional[int] = None,
+        time_limit: float = 0.0,
+        decoder: str = "greedy",
+        decode_cache_size: int = 4096,
+        local_search_every: int = 0,
+        local_search_top_k: int = 0,
+        local_search_ops: Tuple[str, ...] = DEFAULT_OPERATORS,
+        local_search_time: float = 0.0,
+        lower_bound=None,
+        target_gap: float = 0.0,
+        batch_scoring: bool = False,
     ):
+        if decoder not in DECODERS:
+            raise ValueError(f"decoder must be one of {DECODERS}, got {decoder!r}")
+        self.decoder = decoder
+        self.decode_cache_size = int(decode_cache_size)
+        self.ls_every, self.ls_top_k = int(local_search_every), int(local_search_top_k)
+        self.ls_ops, self.ls_time = tuple(local_search_ops), float(local_search_time)
+        self.ls_improvements = 0
+        self.lower_bound = lower_bound          # float, bounds.lower_bound() dict or its Future
+        self.target_gap = float(target_gap)
+        self.gap: Optional[float] = None
+        self.stop_reason = ""
+        self.batch_scoring = bool(batch_scoring)
+        self._kernel = None                     # CostKernel of the current run when batch_scoring
+        self._decode_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
         self.D = distances
         self.penalties = penalties
+        self.time_limit = float(time_limit)
         self.swarm_size = swarm_size
         self.max_iters = max_iters
         self.w = inertia
@@ -106,24 +161,160 @@ class PSO:
         self.gbest_cost: float = float('inf')
         self.gbest_solution: Optional[Solution] = None
 
+    @property
+    def cache_hit_rate(self) -> float:
+        n = self.cache_hits + self.cache_misses
+        return self.cache_hits / n if n else 0.0
+
+    def _decode(self, order: List[int], hosp_by_id: Dict[int, Hospital], vehicles: List[Vehicle]) -> List[Vehicle]:
+        if self.decoder == "split":
+            routes = split_tour([hosp_by_id[i] for i in order], vehicles, self.D, self.penalties,
+                                use_load_distance_cost=self.use_load_distance_cost, time_scale=self.time_scale)
+            if routes is not None:
+                new_vs = [_clone_vehicle(v) for v in vehicles]
+                for nv, r in zip(new_vs, routes):
+                    nv.route = r
+                return new_vs
+        return _greedy_decode(order, hosp_by_id, vehicles, self.D)
+
     def _evaluate(self, keys: List[float], vehicles: List[Vehicle], hospitals: List[Hospital]):
-        new_vs = _decode_random_keys(keys, hospitals, vehicles, self.D)
-        sol = Solution(new_vs, hospitals, self.D)
-        cost = sol.total_cost(self.penalties, use_load_distance_cost=self.use_load_distance_cost, time_scale=self.time_scale)
-        cost += _feasibility_penalty(new_vs, self.D)
-        return cost, sol
+        return self._evaluate_many([keys], vehicles, hospitals)[0]
 
-    def run(self, vehicles: List[Vehicle], hospitals: List[Hospital], *, verbose_every: int = 100):
-        dim = len(hospitals)
-        swarm = [Particle(dim) for _ in range(self.swarm_size)]
+    def _evaluate_many(self, xs: List[List[float]], vehicles: List[Vehicle],
+                       hospitals: List[Hospital]) -> List[Tuple[float, Solution]]:
+        """(cost, solution) per key vector; cache misses are decoded, then costed together by the run's kernel."""
+        hosp_by_id = {h.hospital_id: h for h in hospitals}
+        ids = sorted(hosp_by_id)
+        out: List[Optional[Tuple[float, Solution]]] = [None] * len(xs)
+        misses: "OrderedDict[object, List[int]]" = OrderedDict()
+        for n, keys in enumerate(xs):
+            order = _key_order(keys, ids)
+            key = _order_digest(order) if self.decode_cache_size > 0 else None
+            hit = self._decode_cache.get(key) if key is not None else None
+            if hit is not None:
+                self._decode_cache.move_to_end(key)
+                self.cache_hits += 1
+                cost, routes = hit
+                new_vs = [_clone_vehicle(v) for v in vehicles]
+                for nv, r in zip(new_vs, routes):
+                    nv.route = list(r)
+                out[n] = (cost, Solution(new_vs, hospitals, self.D))
+            elif key is not None and key in misses:
+                self.cache_hits += 1                # same order earlier in this batch: decoded once
+                misses[key].append(n)
+            else:
+                misses[key if key is not None else n] = [n]
+                out[n] = (0.0, Solution(self._decode(order, hosp_by_id, vehicles), hospitals, self.D))
+        if not misses:
+            return out  # type: ignore
+        sols = [out[ns[0]][1] for ns in misses.values()]
+        if self._kernel is not None:
+            costs = self._kernel.solution_costs(sols).tolist()
+        else:
+            costs = [s.total_cost(self.penalties, use_load_distance_cost=self.use_load_distance_cost,
+                                  time_scale=self.time_scale) for s in sols]
+        for (key, ns), sol, cost in zip(misses.items(), sols, costs):
+            cost += _feasibility_penalty(sol.vehicles, self.D)
+            out[ns[0]] = (cost, sol)
+            for n in ns[1:]:
+                out[n] = (cost, sol.deepcopy())
+            if self.decode_cache_size > 0:
+                self.cache_misses += 1
+                self._decode_cache[key] = (cost, tuple(tuple(v.route) for v in sol.vehicles))
+                if len(self._decode_cache) > self.decode_cache_size:
+                    self._decode_cache.popitem(last=False)
+                    self.cache_evictions += 1
+        return out  # type: ignore
 
-        for p in swarm:
-            c, s = self._evaluate(p.x, vehicles, hospitals)
+    def _update_best(self, p: Particle, c: float, s: Solution) -> None:
+        if c < p.pbest_cost:
             p.pbest_cost, p.pbest_solution, p.pbest_x = c, s, list(p.x)
-            if c < self.gbest_cost:
-                self.gbest_cost, self.gbest_solution, self.gbest_x = c, s, list(p.x)
+        if c < self.gbest_cost:
+            self.gbest_cost, self.gbest_solution, self.gbest_x = c, s, list(p.x)
+
+    def _refine(self, sol: Solution, keys: List[float], vehicles: List[Vehicle],
+                hospitals: List[Hospital]) -> Optional[Tuple[float, Solution, List[float]]]:
+        """Local search on a copy of sol, re-encoded as keys; (cost, solution, keys) of the decoded keys, or None."""
+        s = sol.deepcopy()
+        if not local_search(s, self.penalties, operators=self.ls_ops, use_load_distance_cost=self.use_load_distance_cost,
+                            time_scale=self.time_scale, time_limit=self.ls_time):
+            return None
+        ids = sorted(h.hospital_id for h in s.hospitals)
+        order = [h.hospital_id for v in s.vehicles for h in v.route]
+        vals = sorted(keys)
+        pos = {i: r for r, i in enumerate(ids)}
+        new_keys = list(keys)
+        for r, hid in enumerate(order):
+            new_keys[pos[hid]] = vals[r]
+        # the decoder need not rebuild the refined routes from this order: keep what the keys decode to
+        cost, decoded = self._evaluate(new_keys, vehicles, hospitals)
+        return cost, decoded, new_keys
+
+    def _hybrid_step(self, swarm: List[Particle], vehicles: List[Vehicle], hospitals: List[Hospital]) -> None:
+        for p in sorted(swarm, key=lambda p: p.pbest_cost)[:self.ls_top_k]:
+            res = self._refine(p.pbest_solution, p.pbest_x, vehicles, hospitals)
+            if res is not None and res[0] < p.pbest_cost:
+                p.pbest_cost, p.pbest_solution, p.pbest_x = res
+                self.ls_improvements += 1
+                if p.pbest_cost < self.gbest_cost:
+                    self.gbest_cost, self.gbest_solution, self.gbest_x = p.pbest_cost, p.pbest_solution, list(p.pbest_x)
+        res = self._refine(self.gbest_solution, self.gbest_x, vehicles, hospitals)
+        if res is not None and res[0] < self.gbest_cost:
+            self.gbest_cost, self.gbest_solution, self.gbest_x = res
+            self.ls_improvements += 1
+
+    def _checkpoint_state(self, swarm: List[Particle], next_it: int) -> dict:
+        return {
+            "it": next_it,
+            "swarm": [{"x": p.x, "v": p.v, "pbest_x": p.pbest_x, "pbest_cost": p.pbest_cost,
+                       "pbest": encode_routes(p.pbest_solution.vehicles)} for p in swarm],
+            "gbest_x": self.gbest_x, "gbest_cost": self.gbest_cost,
+            "gbest": encode_routes(self.gbest_solution.vehicles),
+            "history": self.history,
+            "rng": rng_state(),
+        }
 
-        for it in range(1, self.max_iters + 1):
+    def _restore(self, st: dict, vehicles: List[Vehicle], hospitals: List[Hospital]) -> List[Particle]:
+        swarm = []
+        for rec in st["swarm"]:
+            p = Particle.__new__(Particle)
+            p.x, p.v, p.pbest_x, p.pbest_cost = rec["x"], rec["v"], rec["pbest_x"], rec["pbest_cost"]
+            p.pbest_solution = Solution(decode_routes(rec["pbest"], vehicles, hospitals), hospitals, self.D)
+            swarm.append(p)
+        self.gbest_x, self.gbest_cost = st["gbest_x"], st["gbest_cost"]
+        self.gbest_solution = Solution(decode_routes(st["gbest"], vehicles, hospitals), hospitals, self.D)
+        self.history = st["history"]
+        set_rng_state(st["rng"])
+        return swarm
+
+    def run(self, vehicles: List[Vehicle], hospitals: List[Hospital], *, verbose_every: int = 100,
+            checkpoint: str = "", checkpoint_every: int = 0, resume: bool = False,
+            callback: Optional[Callable[[int, float, Solution], bool]] = None):
+        dim = len(hospitals)
+        self.stop_reason = ""
+        self._decode_cache.clear()              # entries are only valid for this run's hospitals, vehicles and D
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
+        self._kernel = None
+        if self.batch_scoring and getattr(self.D, "dtype", None) != "float32":
+            from heuristics.kernels import CostKernel     # numpy; float32 D keeps the per-solution path
+            self._kernel = CostKernel(self.D, hospitals, vehicles, self.penalties, time_scale=self.time_scale,
+                                      use_load_distance_cost=self.use_load_distance_cost)
+        start = 1
+        if resume and checkpoint and os.path.exists(checkpoint):
+            st = load_checkpoint(checkpoint, "pso")
+            swarm, start = self._restore(st, vehicles, hospitals), st["it"]
+        else:
+            self.gbest_x, self.gbest_cost, self.gbest_solution, self.history = None, float('inf'), None, []
+            swarm = [Particle(dim) for _ in range(self.swarm_size)]
+            for p, (c, s) in zip(swarm, self._evaluate_many([p.x for p in swarm], vehicles, hospitals)):
+                p.pbest_cost, p.pbest_solution, p.pbest_x = c, s, list(p.x)
+                if c < self.gbest_cost:
+                    self.gbest_cost, self.gbest_solution, self.gbest_x = c, s, list(p.x)
+        save_every = checkpoint_every if checkpoint else 0
+        t_start = time.perf_counter()
+        next_it = start
+
+        for it in range(start, self.max_iters + 1):
             for p in swarm:
                 for d in range(dim):
                     r1 = random.random(); r2 = random.random()
@@ -140,14 +331,35 @@ class PSO:
                     i = random.randrange(dim); j = random.randrange(dim)
                     p.x[i], p.x[j] = p.x[j], p.x[i]
 
-                c, s = self._evaluate(p.x, vehicles, hospitals)
-                if c < p.pbest_cost:
-                    p.pbest_cost, p.pbest_solution, p.pbest_x = c, s, list(p.x)
-                if c < self.gbest_cost:
-                    self.gbest_cost, self.gbest_solution, self.gbest_x = c, s, list(p.x)
+                if not self.batch_scoring:
+                    self._update_best(p, *self._evaluate(p.x, vehicles, hospitals))
+            if self.batch_scoring:
+                for p, (c, s) in zip(swarm, self._evaluate_many([p.x for p in swarm], vehicles, hospitals)):
+                    self._update_best(p, c, s)
 
+            if self.ls_every and it % self.ls_every == 0:
+                self._hybrid_step(swarm, vehicles, hospitals)
             self.history.append(self.gbest_cost)
             if verbose_every and it % verbose_every == 0:
                 print(f"[PSO] iter={it}, gbest={self.gbest_cost:.4f}")
+            next_it = it + 1
+            if save_every and it % save_every == 0:
+                save_checkpoint(checkpoint, "pso", self._checkpoint_state(swarm, next_it))
+            if self.target_gap:
+                lb = resolve_bound(self.lower_bound)
+                g = gap(self.gbest_cost, lb)
+                if g is not None and g <= self.target_gap:
+                    self.stop_reason = "gap"
+                    break
+            if self.time_limit and time.perf_counter() - t_start >= self.time_limit:
+                self.stop_reason = "time_limit"
+                break
+            if callback is not None and callback(it, self.gbest_cost, self.gbest_solution):
+                self.stop_reason = "callback"
+                break
 
+        if save_every:
+            save_checkpoint(checkpoint, "pso", self._checkpoint_state(swarm, next_it))
+        self.stop_reason = self.stop_reason or "max_iters"
+        self.gap = gap(self.gbest_cost, resolve_bound(self.lower_bound))
         return self.gbest_solution, self.gbest_cost  # type: ignore
@@ -0,0 +1,101 @@
+# heuristics/pso/split.py
+"""
+Prins split for giant tours: cut a visit order into consecutive routes at minimum total cost.
+- Segment costs: for every start j the tour is scanned forward while the segment still fits the
+  vehicle's weight/volume and its open path stays within the distance limit (bounded window), so
+  each start costs O(window) with cost, arrival times and penalty extended in O(1) per stop.
+  Same objective as Vehicle.vehicle_cost (either use_load_distance_cost mode).
+- Heterogeneous fleet: vehicles are used in the given order, each for one (possibly empty)
+  segment; a shortest path over layers (vehicle k, tour position i) gives the optimal split for
+  that order. Vehicles with identical parameters share one segment table.
+- Returns None when no feasible split exists (the caller falls back to the greedy decoder).
+"""
+from typing import Dict, List, Optional, Sequence
+
+from heuristics.common import Hospital, Vehicle
+
+INF = float("inf")
+
+
+def _vehicle_type(v: Vehicle) -> tuple:
+    return (v.weight_capacity, v.volume_capacity, v.distance_capacity, v.speed,
+            v.fixed_cost, v.time_cost_coeff, v.distance_cost_coeff)
+
+
+def segment_costs(tour: Sequence[Hospital], v: Vehicle, D, penalties: Dict[str, float], *,
+                  use_load_distance_cost: bool = False, time_scale: float = 6.0,
+                  start: float = 8.0) -> List[List[tuple]]:
+    """arcs[j] = [(i + 1, cost of serving tour[j..i] with v), ...] for every feasible i >= j."""
+    n = len(tour)
+    W, U, Dcap, sp = v.weight_capacity, v.volume_capacity, v.distance_capacity, v.speed
+    fixed, tc, dc = v.fixed_cost, v.time_cost_coeff, v.distance_cost_coeff
+    early, late = penalties["early"], penalties["late"]
+    ids = [h.hospital_id for h in tour]
+    back = [D[i][0] for i in ids]
+    arcs: List[List[tuple]] = []
+    for j in range(n):
+        out = []
+        w = u = path = pen = s2 = 0.0
+        last = 0
+        for i in range(j, n):
+            h = tour[i]
+            w += h.demand_weight
+            u += h.demand_volume
+            if w > W or u > U:
+                break
+            d = D[last][ids[i]]
+            s2 += d * (u - h.demand_volume)                  # volume already delivered before this leg
+            path += d
+            if path > Dcap:
+                break
+            t = start + path / sp
+            if t < h.earliest_time:
+                pen += h.alpha * early * (h.earliest_time - t) * time_scale
+            elif t > h.latest_time:
+                pen += h.alpha * late * (t - h.latest_time) * time_scale
+            last = ids[i]
+            dist = path + back[i]
+            if dist > Dcap:
+                continue
+            dist_c = dc * (u * path - s2) if use_load_distance_cost else dist * dc
+            out.append((i + 1, fixed + dist / sp * tc + dist_c + pen))
+        arcs.append(out)
+    return arcs
+
+
+def split_tour(tour: Sequence[Hospital], vehicles: Sequence[Vehicle], D, penalties: Dict[str, float], *,
+               use_load_distance_cost: bool = False, time_scale: float = 6.0,
+               start: float = 8.0) -> Optional[List[List[Hospital]]]:
+    """Optimal routes (one list per vehicle, same order as `vehicles`) or None if infeasible."""
+    n = len(tour)
+    tables: Dict[tuple, List[List[tuple]]] = {}
+    f = [0.0] + [INF] * n
+    preds = []
+    for v in vehicles:
+        key = _vehicle_type(v)
+        arcs = tables.get(key)
+        if arcs is None:
+            arcs = tables[key] = segment_costs(tour, v, D, penalties, use_load_distance_cost=use_load_distance_cost,
+                                               time_scale=time_scale, start=start)
+        g = list(f)
+        pred = [-1] * (n + 1)                                  # -1: vehicle left empty
+        for j in range(n):
+            fj = f[j]
+            if fj == INF:
+                continue
+            for i1, c in arcs[j]:
+                if fj + c < g[i1]:
+                    g[i1] = fj + c
+                    pred[i1] = j
+        preds.append(pred)
+        f = g
+    if f[n] == INF:
+        return None
+    routes: List[List[Hospital]] = [[] for _ in vehicles]
+    i = n
+    for k in range(len(vehicles) - 1, -1, -1):
+        j = preds[k][i]
+        if j >= 0:
+            routes[k] = list(tour[j:i])
+            i = j
+    return routes
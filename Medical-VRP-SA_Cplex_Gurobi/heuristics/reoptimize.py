@@ -0,0 +1,96 @@
+# heuristics/reoptimize.py
+"""
+Incremental re-optimization of an existing plan when hospitals are added, removed or changed mid-day.
+- Stops whose planned arrival is before `start_time` are locked (already served or under way);
+  nothing is inserted in front of them and they are never moved.
+- Removed hospitals are dropped; changed hospitals (new demand / time window) are re-inserted;
+  added ones are inserted with regret-2 over an InsertionCache, so only the routes that change
+  are re-evaluated.
+- A short local search (heuristics.local_search: 2-opt and relocate with two-route delta evaluation)
+  then runs on the unlocked tails of the affected routes only, bounded by max_iters passes and time_limit.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import time
+
+from .common import Hospital, Vehicle, Solution
+from .insertion import InsertionCache, regret_insert
+from .local_search import local_search
+
+
+def _locked_prefix(v: Vehicle, D, start_time: Optional[float]) -> int:
+    if start_time is None or not v.route:
+        return 0
+    at = v.arrival_times(D)
+    n = 0
+    for h in v.route:
+        if at[h.hospital_id] >= start_time:
+            break
+        n += 1
+    return n
+
+
+def reoptimize(solution: Solution, penalties: Dict[str, float], *,
+               added: Iterable[Hospital] = (), removed: Iterable[int] = (), changed: Iterable[Hospital] = (),
+               start_time: Optional[float] = None, distances=None,
+               use_load_distance_cost: bool = False, time_scale: float = 6.0,
+               max_iters: int = 50, time_limit: float = 0.2) -> Tuple[Solution, float, dict]:
+    """Return (updated Solution, cost, report); the input solution is not modified.
+    `changed` hospitals replace the hospital with the same id; `distances` replaces the matrix
+    (it must contain rows for added hospitals)."""
+    t0 = time.perf_counter()
+    D = distances if distances is not None else solution.distances
+    sol = solution.deepcopy()
+    sol.distances = D
+    vs = sol.vehicles
+    locked = [_locked_prefix(v, D, start_time) for v in vs]
+    is_locked = {h.hospital_id for v, n in zip(vs, locked) for h in v.route[:n]}
+    added, changed = list(added), list(changed)
+    removed_ids = set(removed)
+    changed_by_id = {h.hospital_id: h for h in changed}
+    report = {"removed": [], "inserted": [], "unassigned": [], "locked": [], "affected": [], "moves": 0}
+    for hid in sorted((removed_ids | set(changed_by_id)) & is_locked):
+        report["locked"].append(hid)
+
+    touched = set()
+    for k, v in enumerate(vs):
+        keep = []
+        for pos, h in enumerate(v.route):
+            hid = h.hospital_id
+            if pos < locked[k]:
+                keep.append(changed_by_id.get(hid, h) if hid not in removed_ids else h)
+            elif hid in removed_ids:
+                report["removed"].append(hid)
+                touched.add(k)
+            elif hid in changed_by_id:
+                touched.add(k)                                   # re-inserted below
+            else:
+                keep.append(h)
+        v.route = keep
+
+    planned = {h.hospital_id for v in vs for h in v.route}
+    pending = [h for h in added if h.hospital_id not in planned] + \
+              [h for hid, h in changed_by_id.items() if hid not in is_locked and hid not in removed_ids]
+    gone = removed_ids - is_locked
+    by_id = {h.hospital_id: changed_by_id.get(h.hospital_id, h) for h in sol.hospitals if h.hospital_id not in gone}
+    by_id.update({h.hospital_id: h for h in added})
+    sol.hospitals = list(by_id.values())
+
+    if pending:
+        cache = InsertionCache(vs, D, penalties, use_load_distance_cost=use_load_distance_cost,
+                               time_scale=time_scale, min_pos=locked)
+        before = {k: len(v.route) for k, v in enumerate(vs)}
+        left = regret_insert(cache, pending, 2)
+        report["inserted"] = [h.hospital_id for h in pending if h not in left]
+        report["unassigned"] = [h.hospital_id for h in left]
+        touched |= {k for k, v in enumerate(vs) if len(v.route) != before[k]}
+
+    affected = sorted(touched)
+    left_s = t0 + time_limit - time.perf_counter()
+    if affected and max_iters > 0 and left_s > 0:
+        report["moves"] = local_search(sol, penalties, operators=("two_opt", "relocate"), routes=affected,
+                                       min_pos=locked, use_load_distance_cost=use_load_distance_cost,
+                                       time_scale=time_scale, max_passes=max_iters, time_limit=left_s)
+    report["affected"] = [vs[k].vehicle_id for k in affected]
+    cost = sol.total_cost(penalties, use_load_distance_cost=use_load_distance_cost, time_scale=time_scale)
+    report["runtime_ms"] = round(1000 * (time.perf_counter() - t0), 3)
+    return sol, cost, report
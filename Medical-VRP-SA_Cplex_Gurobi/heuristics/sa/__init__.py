@@ -1,3 +1,4 @@
-from .sa import SimulatedAnnealing
+from .sa import SimulatedAnnealing, BASIC_OPERATORS, ALL_OPERATORS, SCHEDULES
+from .profile import SAProfiler
 
-__all__ = ["SimulatedAnnealing"]
+__all__ = ["SimulatedAnnealing", "SAProfiler", "BASIC_OPERATORS", "ALL_OPERATORS", "SCHEDULES"]
@@ -0,0 +1,86 @@
+"""
+Optional instrumentation for SimulatedAnnealing.run.
+Per neighborhood operator: calls, rejected moves (infeasible or no-op, undone in place),
+accepted candidates, improvements over the current solution, new bests and cumulative time.
+Run level: iterations/sec and time-to-best. Export as JSON or a Chrome trace
+(chrome://tracing, Perfetto). SA only touches the profiler when one is passed in.
+"""
+from __future__ import annotations
+import json
+import time
+from typing import Dict, List, Optional
+
+
+class SAProfiler:
+    def __init__(self, trace: bool = False, max_events: int = 200_000) -> None:
+        self.trace = bool(trace)
+        self.max_events = int(max_events)
+        self.ops: Dict[str, Dict[str, float]] = {}
+        self.iters = 0
+        self.t_start = 0.0
+        self.t_end = 0.0
+        self.time_to_best: Optional[float] = None
+        self.iter_of_best: Optional[int] = None
+        self.events: List[dict] = []
+
+    def start(self) -> None:
+        self.t_start = time.perf_counter()
+        self.t_end = self.t_start
+
+    def _op(self, name: str) -> Dict[str, float]:
+        st = self.ops.get(name)
+        if st is None:
+            st = self.ops[name] = {"calls": 0, "rejected": 0, "accepted": 0, "improved": 0,
+                                   "new_best": 0, "time": 0.0}
+        return st
+
+    def record(self, op: str, t0: float, t1: float, moved: bool, accepted: bool,
+               improved: bool, new_best: bool, best_cost: float) -> None:
+        st = self._op(op)
+        st["calls"] += 1
+        st["rejected"] += not moved
+        st["accepted"] += accepted
+        st["improved"] += improved
+        st["new_best"] += new_best
+        st["time"] += t1 - t0
+        self.iters += 1
+        self.t_end = t1
+        if new_best:
+            self.time_to_best = t1 - self.t_start
+            self.iter_of_best = self.iters
+        if self.trace and len(self.events) < self.max_events:
+            ts = (t0 - self.t_start) * 1e6
+            self.events.append({"name": op, "cat": "sa", "ph": "X", "ts": ts,
+                                "dur": (t1 - t0) * 1e6, "pid": 0, "tid": 0,
+                                "args": {"moved": moved, "accepted": accepted}})
+            if new_best:
+                self.events.append({"name": "best_cost", "ph": "C", "ts": ts, "pid": 0,
+                                    "args": {"best": best_cost}})
+
+    def summary(self) -> dict:
+        elapsed = self.t_end - self.t_start
+        ops = {}
+        for name, st in sorted(self.ops.items()):
+            calls = st["calls"] or 1
+            ops[name] = dict(st, reject_rate=st["rejected"] / calls,
+                             accept_rate=st["accepted"] / calls,
+                             improve_rate=st["improved"] / calls,
+                             mean_time_us=st["time"] / calls * 1e6)
+        return {
+            "iterations": self.iters,
+            "elapsed_s": elapsed,
+            "iters_per_s": self.iters / elapsed if elapsed > 0 else 0.0,
+            "time_to_best_s": self.time_to_best,
+            "iter_of_best": self.iter_of_best,
+            "operators": ops,
+        }
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def to_chrome_trace(self, path: str) -> None:
+        meta = [{"name": "process_name", "ph": "M", "pid": 0, "args": {"name": "SimulatedAnnealing"}}]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + self.events, "displayTimeUnit": "ms",
+                       "otherData": self.summary()}, f)
@@ -1,20 +1,88 @@
 from __future__ import annotations
-import random, math
-from typing import List, Tuple, Dict, Optional
+import random, math, time, os
+from typing import List, Tuple, Dict, Optional, Sequence, Callable
 from ..common import Solution
+from ..bounds import resolve_bound, gap
+from utils.checkpoint import save_checkpoint, load_checkpoint, encode_routes, decode_routes, rng_state, set_rng_state
+from .profile import SAProfiler
+
+BASIC_OPERATORS = ("swap", "relocate", "two_opt", "insert")
+ALL_OPERATORS = BASIC_OPERATORS + ("or_opt", "two_opt_star", "cross")
+SCHEDULES = ("geometric", "lundy_mees", "adaptive")
 
 class SimulatedAnnealing:
     def __init__(self, distances: List[List[float]], initial_temp: float, cooling_rate: float,
                  min_temp: float, max_iters: int, penalties: Dict[str, float],
-                 use_load_distance_cost: bool = True, time_scale: float = 6.0) -> None:
+                 use_load_distance_cost: bool = True, time_scale: float = 6.0,
+                 init: str = "random", profiler: Optional[SAProfiler] = None,
+                 operators: Sequence[str] = BASIC_OPERATORS, operator_selection: str = "uniform",
+                 segment_length: int = 100, reaction: float = 0.2,
+                 scores: Tuple[float, float, float] = (33.0, 9.0, 13.0), ucb_c: float = math.sqrt(2.0),
+                 schedule: str = "geometric", lm_beta: Optional[float] = None,
+                 target_accept: float = 0.3, adapt_window: int = 100,
+                 reheat_after: int = 0, reheat_temp: Optional[float] = None, max_reheats: int = 10,
+                 patience: int = 0, patience_seconds: float = 0.0, time_limit: float = 0.0,
+                 lower_bound=None, target_gap: float = 0.0) -> None:
         self.D = distances
-        self.T = float(initial_temp)
+        self.T0 = float(initial_temp)
+        self.T = self.T0
         self.cool = float(cooling_rate)
         self.Tmin = float(min_temp)
         self.max_iters = int(max_iters)
         self.penalties = penalties
         self.use_ld = bool(use_load_distance_cost)
         self.time_scale = float(time_scale)
+        self.init = init
+        self.profiler = profiler
+        self.last_op: str = ""
+        self.last_moved: bool = False
+
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown cooling schedule: {schedule}")
+        self.schedule = schedule
+        self.lm_beta = lm_beta
+        self.target_accept = float(target_accept)
+        self.adapt_window = int(adapt_window)
+        self.reheat_after = int(reheat_after)
+        self.reheat_temp = float(reheat_temp) if reheat_temp is not None else 0.5 * self.T0
+        self.max_reheats = int(max_reheats)
+        self.patience = int(patience)
+        self.patience_seconds = float(patience_seconds)
+        self.time_limit = float(time_limit)
+        self.lower_bound = lower_bound          # float, bounds.lower_bound() dict or its Future
+        self.target_gap = float(target_gap)
+        self.gap: Optional[float] = None
+        self._lb: Optional[float] = None
+        self.n_reheats = 0
+        self.iterations = 0
+        self.stop_reason = ""
+        self._win_moves = self._win_acc = 0
+
+        if operator_selection not in ("uniform", "roulette", "ucb"):
+            raise ValueError(f"Unknown operator selection: {operator_selection}")
+        self._ops = {
+            "swap": self._inter_route_swap,
+            "relocate": self._inter_route_relocate,
+            "two_opt": self._intra_route_two_opt,
+            "insert": self._intra_route_insert,
+            "or_opt": self._or_opt,
+            "two_opt_star": self._two_opt_star,
+            "cross": self._cross_exchange,
+        }
+        unknown = [o for o in operators if o not in self._ops]
+        if unknown:
+            raise ValueError(f"Unknown operators: {unknown}")
+        self.op_names = tuple(operators)
+        self.operator_selection = operator_selection
+        self.segment_length = int(segment_length)
+        self.reaction = float(reaction)
+        self.sigma = scores
+        self.ucb_c = float(ucb_c)
+        self.op_weights = {o: 1.0 for o in self.op_names}
+        self.op_calls = {o: 0 for o in self.op_names}
+        self.op_reward = {o: 0.0 for o in self.op_names}
+        self._seg_score = {o: 0.0 for o in self.op_names}
+        self._seg_uses = {o: 0 for o in self.op_names}
         self.best_sol: Optional[Solution] = None
         self.best_cost: float = float("inf")
         self.history: List[float] = []
@@ -23,53 +91,126 @@ class SimulatedAnnealing:
         for h in hospitals:
             if hasattr(h, "assigned"): h.assigned = False
         s = Solution(vehicles, hospitals, self.D)
-        s.assign_initial()
+        if self.init == "random":
+            s.assign_initial()
+        else:
+            s.assign_insertion(self.penalties, regret_k=1 if self.init == "cheapest" else 2,
+                               use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
         return s
 
-    def _inter_route_swap(self, s: Solution) -> Solution:
+    def _inter_route_swap(self, s: Solution) -> bool:
         v1, v2 = random.sample(s.vehicles, 2)
-        if not v1.route or not v2.route: return s
+        if not v1.route or not v2.route: return False
         i1 = random.randrange(len(v1.route)); i2 = random.randrange(len(v2.route))
         v1.route[i1], v2.route[i2] = v2.route[i2], v1.route[i1]
         if not (v1.feasible(s.distances) and v2.feasible(s.distances)):
             v1.route[i1], v2.route[i2] = v2.route[i2], v1.route[i1]
-        return s
+            return False
+        return True
 
-    def _inter_route_relocate(self, s: Solution) -> Solution:
+    def _inter_route_relocate(self, s: Solution) -> bool:
         v_from, v_to = random.sample(s.vehicles, 2)
-        if not v_from.route: return s
+        if not v_from.route: return False
         i = random.randrange(len(v_from.route)); node = v_from.route.pop(i)
         j = random.randint(0, len(v_to.route));  v_to.route.insert(j, node)
         if not (v_from.feasible(s.distances) and v_to.feasible(s.distances)):
             v_to.route.pop(j); v_from.route.insert(i, node)
-        return s
+            return False
+        return True
 
-    def _intra_route_two_opt(self, s: Solution) -> Solution:
+    def _intra_route_two_opt(self, s: Solution) -> bool:
         v = random.choice(s.vehicles); n = len(v.route)
-        if n < 3: return s
+        if n < 3: return False
         i, j = sorted(random.sample(range(n), 2))
         v.route[i:j+1] = reversed(v.route[i:j+1])
         if not v.feasible(s.distances):
             v.route[i:j+1] = reversed(v.route[i:j+1])
-        return s
+            return False
+        return True
 
-    def _intra_route_insert(self, s: Solution) -> Solution:
+    def _intra_route_insert(self, s: Solution) -> bool:
         v = random.choice(s.vehicles); n = len(v.route)
-        if n < 2: return s
+        if n < 2: return False
         i, j = random.sample(range(n), 2)
         node = v.route.pop(i); v.route.insert(j, node)
         if not v.feasible(s.distances):
             v.route.pop(j); v.route.insert(i, node)
-        return s
+            return False
+        return True
+
+    def _or_opt(self, s: Solution) -> bool:
+        v_from, v_to = random.choice(s.vehicles), random.choice(s.vehicles)
+        n = len(v_from.route)
+        if n == 0: return False
+        L = random.randint(1, min(3, n)); i = random.randrange(n - L + 1)
+        chain = v_from.route[i:i+L]; del v_from.route[i:i+L]
+        j = random.randint(0, len(v_to.route)); v_to.route[j:j] = chain
+        if not (v_from.feasible(s.distances) and v_to.feasible(s.distances)):
+            del v_to.route[j:j+L]; v_from.route[i:i] = chain
+            return False
+        return True
+
+    def _two_opt_star(self, s: Solution) -> bool:
+        v1, v2 = random.sample(s.vehicles, 2)
+        if not v1.route and not v2.route: return False
+        i = random.randint(0, len(v1.route)); j = random.randint(0, len(v2.route))
+        if i == len(v1.route) and j == len(v2.route): return False    # both tails empty: no change
+        r1, r2 = v1.route, v2.route
+        v1.route, v2.route = r1[:i] + r2[j:], r2[:j] + r1[i:]
+        if not (v1.feasible(s.distances) and v2.feasible(s.distances)):
+            v1.route, v2.route = r1, r2
+            return False
+        return True
+
+    def _cross_exchange(self, s: Solution) -> bool:
+        v1, v2 = random.sample(s.vehicles, 2)
+        if not v1.route or not v2.route: return False
+        a = random.randint(1, min(3, len(v1.route))); b = random.randint(1, min(3, len(v2.route)))
+        i = random.randrange(len(v1.route) - a + 1); j = random.randrange(len(v2.route) - b + 1)
+        r1, r2 = v1.route, v2.route
+        v1.route = r1[:i] + r2[j:j+b] + r1[i+a:]
+        v2.route = r2[:j] + r1[i:i+a] + r2[j+b:]
+        if not (v1.feasible(s.distances) and v2.feasible(s.distances)):
+            v1.route, v2.route = r1, r2
+            return False
+        return True
+
+    def _select_operator(self) -> str:
+        if self.operator_selection == "uniform":
+            return random.choice(self.op_names)
+        if self.operator_selection == "roulette":
+            r = random.random() * sum(self.op_weights.values()); acc = 0.0
+            for o in self.op_names:
+                acc += self.op_weights[o]
+                if acc >= r: return o
+            return self.op_names[-1]
+        total = sum(self.op_calls.values())
+        for o in self.op_names:
+            if self.op_calls[o] == 0: return o
+        return max(self.op_names, key=lambda o: self.op_reward[o] / self.op_calls[o]
+                   + self.ucb_c * math.sqrt(math.log(total) / self.op_calls[o]))
+
+    def _credit(self, op: str, moved: bool, accepted: bool, improved: bool, new_best: bool) -> None:
+        score = 0.0
+        if moved:
+            score = (self.sigma[0] if new_best else self.sigma[1] if improved
+                     else self.sigma[2] if accepted else 0.0)
+        self.op_calls[op] += 1
+        self.op_reward[op] += score / self.sigma[0]
+        self._seg_score[op] += score
+        self._seg_uses[op] += 1
+        if self.operator_selection == "roulette" and sum(self._seg_uses.values()) >= self.segment_length:
+            for o in self.op_names:
+                if self._seg_uses[o]:
+                    w = (1 - self.reaction) * self.op_weights[o] + self.reaction * self._seg_score[o] / self._seg_uses[o]
+                    self.op_weights[o] = max(w, 0.05)
+                self._seg_score[o], self._seg_uses[o] = 0.0, 0
 
     def neighbor(self, s: Solution) -> Solution:
         ns = s.deepcopy()
-        return {
-            "swap": self._inter_route_swap,
-            "relocate": self._inter_route_relocate,
-            "two_opt": self._intra_route_two_opt,
-            "insert": self._intra_route_insert,
-        }[random.choice(("swap", "relocate", "two_opt", "insert"))](ns)
+        self.last_op = self._select_operator()
+        self.last_moved = self._ops[self.last_op](ns)
+        return ns
 
     def accept_prob(self, old: float, new: float) -> float:
         d = new - old
@@ -77,23 +218,158 @@ class SimulatedAnnealing:
         T = max(self.T, 1e-12)
         return 1.0 / (1.0 + math.log(1.0 + d / T))
 
-    def run(self, vehicles: list, hospitals: list, verbose_every: int = 100) -> Tuple[Solution, float]:
-        cur = self.init_solution(vehicles, hospitals)
-        cur_cost = cur.total_cost(self.penalties, use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
-        self.best_sol, self.best_cost = cur.deepcopy(), cur_cost
-        self.history = [self.best_cost]
+    def _cool(self, moved: bool, accepted: bool) -> None:
+        if self.schedule == "geometric":
+            self.T *= self.cool
+        elif self.schedule == "lundy_mees":
+            # T <- T / (1 + beta T); default beta reaches Tmin after max_iters steps
+            beta = self.lm_beta
+            if beta is None:
+                beta = (self.T0 - self.Tmin) / (max(self.max_iters, 1) * self.T0 * max(self.Tmin, 1e-12))
+            self.T /= 1.0 + beta * self.T
+        else:
+            # geometric, corrected every adapt_window moves towards target_accept
+            self.T *= self.cool
+            if moved:
+                self._win_moves += 1
+                self._win_acc += accepted
+            if self._win_moves >= self.adapt_window:
+                ratio = self._win_acc / self._win_moves
+                self.T *= math.exp(self.target_accept - ratio)
+                self._win_moves = self._win_acc = 0
+
+    def _checkpoint_state(self, cur: Solution, cur_cost: float, it: int, it_best: int, it_mark: int,
+                          elapsed: float, since_best: float) -> dict:
+        return {
+            "it": it, "it_best": it_best, "it_mark": it_mark,
+            "elapsed": elapsed, "since_best": since_best,
+            "T": self.T, "n_reheats": self.n_reheats, "stop_reason": self.stop_reason,
+            "cur": encode_routes(cur.vehicles), "cur_cost": cur_cost,
+            "best": encode_routes(self.best_sol.vehicles), "best_cost": self.best_cost,
+            "history": self.history,
+            "win": [self._win_moves, self._win_acc],
+            "op_weights": self.op_weights, "op_calls": self.op_calls, "op_reward": self.op_reward,
+            "seg_score": self._seg_score, "seg_uses": self._seg_uses,
+            "rng": rng_state(),
+        }
+
+    def _restore(self, st: dict, vehicles: list, hospitals: list) -> Tuple[Solution, float]:
+        self.T, self.n_reheats = st["T"], st["n_reheats"]
+        # a run stopped by max_iters or by the caller may be continued
+        self.stop_reason = "" if st["stop_reason"] in ("max_iters", "callback") else st["stop_reason"]
+        self.best_sol = Solution(decode_routes(st["best"], vehicles, hospitals), hospitals, self.D)
+        self.best_cost = st["best_cost"]
+        self.history = st["history"]
+        self._win_moves, self._win_acc = st["win"]
+        self.op_weights, self.op_calls, self.op_reward = st["op_weights"], st["op_calls"], st["op_reward"]
+        self._seg_score, self._seg_uses = st["seg_score"], st["seg_uses"]
+        set_rng_state(st["rng"])
+        return Solution(decode_routes(st["cur"], vehicles, hospitals), hospitals, self.D), st["cur_cost"]
 
-        it = 0
-        while it < self.max_iters and self.T > self.Tmin:
+    def run(self, vehicles: list, hospitals: list, verbose_every: int = 100, *,
+            checkpoint: str = "", checkpoint_every: int = 0, resume: bool = False,
+            callback: Optional[Callable[[int, float, Solution], bool]] = None) -> Tuple[Solution, float]:
+        """checkpoint_every > 0 writes the search state to `checkpoint` every that many iterations
+        (and once at the end); resume=True continues from that file when it exists.
+        callback(it, best_cost, best_sol) is called after every iteration; a truthy return stops."""
+        it = it_best = it_mark = 0
+        elapsed = since_best = 0.0
+        if resume and checkpoint and os.path.exists(checkpoint):
+            st = load_checkpoint(checkpoint, "sa")
+            cur, cur_cost = self._restore(st, vehicles, hospitals)
+            it, it_best, it_mark = st["it"], st["it_best"], st["it_mark"]
+            elapsed, since_best = st["elapsed"], st["since_best"]
+        else:
+            cur = self.init_solution(vehicles, hospitals)
+            cur_cost = cur.total_cost(self.penalties, use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
+            self.best_sol, self.best_cost = cur.deepcopy(), cur_cost
+            self.history = [self.best_cost]
+            self.n_reheats = 0
+            self.stop_reason = ""
+            self._win_moves = self._win_acc = 0
+
+        prof = self.profiler
+        if prof is not None: prof.start()
+        clock = self.patience_seconds > 0 or self.time_limit > 0
+        now = time.perf_counter()
+        t_start, t_best = now - elapsed, now - since_best
+        save_every = checkpoint_every if checkpoint else 0
+        while it < self.max_iters and not self.stop_reason:
+            if self.T <= self.Tmin:
+                if not (self.reheat_after and self.n_reheats < self.max_reheats):
+                    self.stop_reason = "min_temp"
+                    continue
+                it_mark = it
+                cur, cur_cost = self._reheat()
+            if prof is not None: t0 = time.perf_counter()
             cand = self.neighbor(cur)
             cand_cost = cand.total_cost(self.penalties, use_load_distance_cost=self.use_ld, time_scale=self.time_scale)
+            improved = cand_cost < cur_cost
+            accepted = new_best = False
             if self.accept_prob(cur_cost, cand_cost) > random.random():
+                accepted = True
                 cur, cur_cost = cand, cand_cost
                 if cand_cost < self.best_cost:
+                    new_best = True
                     self.best_sol, self.best_cost = cand.deepcopy(), cand_cost
+            if self.operator_selection != "uniform":
+                self._credit(self.last_op, self.last_moved, accepted, improved, new_best)
+            if prof is not None:
+                prof.record(self.last_op, t0, time.perf_counter(), self.last_moved,
+                            accepted, improved, new_best, self.best_cost)
             self.history.append(self.best_cost)
-            self.T *= self.cool
+            self._cool(self.last_moved, accepted)
             it += 1
             if verbose_every and it % verbose_every == 0:
                 print(f"[Iter {it}] T={self.T:.4f} Best={self.best_cost:.2f}")
+
+            if new_best:
+                it_best = it_mark = it
+                if clock: t_best = time.perf_counter()
+            if self.patience and it - it_best >= self.patience:
+                self.stop_reason = "patience"
+                break
+            if self.target_gap and (new_best or self._lb is None) and self._gap_reached():
+                self.stop_reason = "gap"
+                break
+            if clock:
+                now = time.perf_counter()
+                if self.patience_seconds and now - t_best >= self.patience_seconds:
+                    self.stop_reason = "patience_seconds"
+                    break
+                if self.time_limit and now - t_start >= self.time_limit:
+                    self.stop_reason = "time_limit"
+                    break
+            if self.reheat_after and it - it_mark >= self.reheat_after and self.n_reheats < self.max_reheats:
+                it_mark = it
+                cur, cur_cost = self._reheat()
+            if callback is not None and callback(it, self.best_cost, self.best_sol):
+                self.stop_reason = "callback"
+            if save_every and it % save_every == 0:
+                now = time.perf_counter()
+                save_checkpoint(checkpoint, "sa", self._checkpoint_state(
+                    cur, cur_cost, it, it_best, it_mark, now - t_start, now - t_best))
+        self.stop_reason = self.stop_reason or "max_iters"
+        self.iterations = it
+        self.gap = gap(self.best_cost, self._bound())
+        if save_every:
+            now = time.perf_counter()
+            save_checkpoint(checkpoint, "sa", self._checkpoint_state(
+                cur, cur_cost, it, it_best, it_mark, now - t_start, now - t_best))
         return self.best_sol, self.best_cost
+
+    def _bound(self) -> Optional[float]:
+        if self._lb is None:
+            self._lb = resolve_bound(self.lower_bound)
+        return self._lb
+
+    def _gap_reached(self) -> bool:
+        g = gap(self.best_cost, self._bound())
+        return g is not None and g <= self.target_gap
+
+    def _reheat(self) -> Tuple[Solution, float]:
+        """Raise T back to reheat_temp and restart the walk from the best solution."""
+        self.n_reheats += 1
+        self.T = max(self.T, self.reheat_temp)
+        self._win_moves = self._win_acc = 0
+        return self.best_sol.deepcopy(), self.best_cost
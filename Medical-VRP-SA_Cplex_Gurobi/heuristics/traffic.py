@@ -0,0 +1,175 @@
+# heuristics/traffic.py
+"""
+Incremental re-scoring of plans when entries of the distance matrix change (traffic updates).
+- PlanScorer keeps its own copy of D and any number of registered plans (Solutions).
+- Identical routes (same vehicle, same stop sequence) are scored once and shared between plans.
+- An arc index maps every arc (i, j) to the routes that traverse it, so update() re-evaluates only
+  the routes using a changed arc: their cost, distance, arrival times and time-window penalty.
+- Costs match Solution.total_cost on the updated matrix (either use_load_distance_cost mode).
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import itertools
+
+import numpy as np
+
+from .common import Solution, Vehicle
+
+
+def _route_state(v: Vehicle, hids: Tuple[int, ...], H, D, penalties: Dict[str, float],
+                 use_ld: bool, time_scale: float, start: float) -> dict:
+    """Cost, distance, penalty and arrival times of one route; same terms as Vehicle.vehicle_cost."""
+    if not hids:
+        return {"cost": 0.0, "distance": 0.0, "penalty": 0.0, "arrivals": ()}
+    sp = v.speed
+    early, late = penalties["early"], penalties["late"]
+    remaining = sum(H[i].demand_volume for i in hids) if use_ld else 0.0
+    last, dist, t, pen, ld, at = 0, 0.0, start, 0.0, 0.0, []
+    for hid in hids:
+        h = H[hid]
+        d = float(D[last, hid])
+        dist += d
+        t += d / sp
+        at.append(t)
+        if use_ld:
+            ld += v.distance_cost_coeff * d * remaining
+            remaining -= h.demand_volume
+        if t < h.earliest_time:
+            pen += h.alpha * early * (h.earliest_time - t) * time_scale
+        elif t > h.latest_time:
+            pen += h.alpha * late * (t - h.latest_time) * time_scale
+        last = hid
+    dist += float(D[last, 0])
+    dist_c = ld if use_ld else dist * v.distance_cost_coeff
+    time_c = (dist / sp) * v.time_cost_coeff
+    return {"cost": v.fixed_cost + time_c + dist_c + pen, "distance": dist, "penalty": pen,
+            "arrivals": tuple(at)}
+
+
+def _arcs(hids: Tuple[int, ...]):
+    if not hids:
+        return []
+    seq = (0,) + hids + (0,)
+    return list(zip(seq, seq[1:]))
+
+
+class PlanScorer:
+    """
+    scorer = PlanScorer(D, penalties)
+    pid = scorer.add(solution)                    # score and index a plan
+    changed = scorer.update({(i, j): d, ...})     # {pid: new cost} for the plans that moved
+    scorer.cost(pid), scorer.best(), scorer.route(pid, vehicle_id)
+    """
+
+    def __init__(self, D, penalties: Dict[str, float], *, use_load_distance_cost: bool = False,
+                 time_scale: float = 6.0, start: float = 8.0, copy: bool = True):
+        self.D = np.array(D, dtype=np.float64) if copy else D
+        self.penalties = penalties
+        self.use_ld = use_load_distance_cost
+        self.time_scale = time_scale
+        self.start = start
+        self.H: Dict[int, object] = {}
+        self._routes: Dict[tuple, dict] = {}             # key -> state + vehicle, refs
+        self._arc_index: Dict[Tuple[int, int], set] = {}
+        self._plans: Dict[int, List[tuple]] = {}
+        self._cost: Dict[int, float] = {}
+        self._ids = itertools.count()
+        self.stats = {"updates": 0, "arcs_changed": 0, "routes_rescored": 0, "plans_rescored": 0}
+
+    def __len__(self):
+        return len(self._plans)
+
+    def _state(self, key) -> dict:
+        r = self._routes[key]
+        return _route_state(r["vehicle"], key[1], self.H, self.D, self.penalties,
+                            self.use_ld, self.time_scale, self.start)
+
+    def add(self, solution: Solution) -> int:
+        pid = next(self._ids)
+        keys = []
+        for v in solution.vehicles:
+            hids = tuple(h.hospital_id for h in v.route)
+            for h in v.route:
+                self.H.setdefault(h.hospital_id, h)
+            key = (v.vehicle_id, hids)
+            r = self._routes.get(key)
+            if r is None:
+                r = self._routes[key] = {"vehicle": v, "plans": set()}
+                r.update(self._state(key))
+                for a in _arcs(hids):
+                    self._arc_index.setdefault(a, set()).add(key)
+            r["plans"].add(pid)
+            keys.append(key)
+        self._plans[pid] = keys
+        self._cost[pid] = sum(self._routes[k]["cost"] for k in keys)
+        return pid
+
+    def remove(self, pid: int) -> None:
+        for key in self._plans.pop(pid):
+            r = self._routes[key]
+            r["plans"].discard(pid)
+            if not r["plans"]:
+                del self._routes[key]
+                for a in _arcs(key[1]):
+                    s = self._arc_index.get(a)
+                    if s is not None:
+                        s.discard(key)
+                        if not s:
+                            del self._arc_index[a]
+        del self._cost[pid]
+
+    def update(self, changes: Dict[Tuple[int, int], float], *, symmetric: bool = False) -> Dict[int, float]:
+        """Write the changed entries into D and re-score only the routes using those arcs.
+        symmetric=True also sets D[j, i]. Returns {pid: new cost} for every affected plan."""
+        touched = set()
+        n = 0
+        for (i, j), d in changes.items():
+            pairs = ((i, j), (j, i)) if symmetric and i != j else ((i, j),)
+            for a in pairs:
+                if self.D[a] == d:
+                    continue
+                self.D[a] = d
+                n += 1
+                touched |= self._arc_index.get(a, set())
+        plans = set()
+        for key in touched:
+            r = self._routes[key]
+            r.update(self._state(key))
+            plans |= r["plans"]
+        for pid in plans:
+            self._cost[pid] = sum(self._routes[k]["cost"] for k in self._plans[pid])
+        st = self.stats
+        st["updates"] += 1
+        st["arcs_changed"] += n
+        st["routes_rescored"] += len(touched)
+        st["plans_rescored"] += len(plans)
+        return {pid: self._cost[pid] for pid in plans}
+
+    def cost(self, pid: int) -> float:
+        return self._cost[pid]
+
+    def costs(self) -> Dict[int, float]:
+        return dict(self._cost)
+
+    def best(self) -> Optional[Tuple[int, float]]:
+        if not self._cost:
+            return None
+        pid = min(self._cost, key=self._cost.get)
+        return pid, self._cost[pid]
+
+    def route(self, pid: int, vehicle_id) -> dict:
+        """{"route", "cost", "distance", "penalty", "arrivals"} of one vehicle of a plan."""
+        for key in self._plans[pid]:
+            if key[0] == vehicle_id:
+                r = self._routes[key]
+                return {"route": list(key[1]), "cost": r["cost"], "distance": r["distance"],
+                        "penalty": r["penalty"], "arrivals": dict(zip(key[1], r["arrivals"]))}
+        raise KeyError(vehicle_id)
+
+    def routes_using(self, arcs: Iterable[Tuple[int, int]]) -> Dict[int, List]:
+        """{pid: [vehicle ids]} of the plans whose routes traverse any of the given arcs."""
+        out: Dict[int, List] = {}
+        for a in arcs:
+            for key in self._arc_index.get(tuple(a), ()):
+                for pid in self._routes[key]["plans"]:
+                    out.setdefault(pid, []).append(key[0])
+        return out
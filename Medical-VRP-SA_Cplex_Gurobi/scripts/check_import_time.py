@@ -0,0 +1,61 @@
+"""
+Import-time budget for the heuristic entry points.
+Each module set is imported in a fresh interpreter; the best of --repeat runs must stay under
+--budget seconds and none of the heavy optional packages may have been loaded.
+
+    python -m scripts.check_import_time --budget 0.3
+"""
+import argparse
+import subprocess
+import sys
+
+HEAVY = ("matplotlib", "pandas", "openpyxl", "docplex", "cplex", "gurobipy", "numba")
+
+DEFAULT_TARGETS = [
+    "heuristics",
+    "heuristics.sa",
+    "heuristics.pso.pso",
+    "utils",
+    "scripts.run_sa",
+    "scripts.run_pso",
+]
+
+_PROBE = r"""
+import sys, time
+t0 = time.perf_counter()
+import importlib; importlib.import_module(sys.argv[1])
+dt = time.perf_counter() - t0
+heavy = [m for m in sys.argv[2].split(",") if m in sys.modules]
+print("%.6f %s" % (dt, ",".join(heavy)))
+"""
+
+
+def measure(module: str, repeat: int):
+    best, heavy = float("inf"), ""
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE, module, ",".join(HEAVY)],
+                             check=True, capture_output=True, text=True).stdout.split()
+        best = min(best, float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return best, heavy
+
+
+def main():
+    ap = argparse.ArgumentParser("Check import-time budget")
+    ap.add_argument("--budget", type=float, default=0.3, help="seconds per module import")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    args = ap.parse_args()
+
+    failed = False
+    for mod in args.modules:
+        dt, heavy = measure(mod, args.repeat)
+        ok = dt <= args.budget and not heavy
+        failed |= not ok
+        extra = f"  heavy: {heavy}" if heavy else ""
+        print(f"{'OK  ' if ok else 'FAIL'} {mod:<24} {dt * 1000:8.1f} ms{extra}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import random
+from pathlib import Path
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
+from heuristics.common import Hospital, Vehicle
+from heuristics.alns import ALNS
+from utils.plot import plot_history, print_solution
+
+
+def map_records_to_objects(hosp_recs, veh_recs):
+    hospitals = [Hospital(**r) for r in hosp_recs]
+    vehicles  = [Vehicle(**r) for r in veh_recs]
+    return hospitals, vehicles
+
+
+def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p, as_list=True)
+    if args.excel and Path(args.excel).exists():
+        return load_from_excel(args.excel)
+    if args.json and Path(args.json).exists():
+        return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
+
+    candidates = [
+        ("excel", Path("data/excel/medical_vrp_data.xlsx")),
+        ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
+    ]
+    for kind, p in candidates:
+        if p.exists():
+            if kind == "excel": return load_from_excel(str(p))
+            if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
+
+    raise FileNotFoundError(
+        "Cannot load data excel|json|txt "
+        "or load --excel/--json/--txt."
+    )
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Run ALNS for Medical VRP (unitless)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--max-iters", type=int, default=2000)
+    ap.add_argument("--min-remove", type=float, default=0.1, help="min share of visits removed")
+    ap.add_argument("--max-remove", type=float, default=0.3, help="max share of visits removed")
+    ap.add_argument("--regret-k", type=int, default=3)
+    ap.add_argument("--initial-temp", type=float, default=None, help="default: 5%% worse accepted w.p. 0.5")
+    ap.add_argument("--cooling-rate", type=float, default=0.9995)
+    ap.add_argument("--segment-length", type=int, default=100)
+    ap.add_argument("--reaction", type=float, default=0.2)
+    ap.add_argument("--verbose-every", type=int, default=100)
+    ap.add_argument("--init", choices=["random", "cheapest", "regret"], default="regret",
+                    help="initial solution: random (assign_initial) or deterministic insertion")
+    ap.add_argument("--use-load-distance-cost", action="store_true", default=False)
+    ap.add_argument("--time-scale", type=float, default=6.0)
+    ap.add_argument("--excel", type=str, default="")
+    ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
+    ap.add_argument("--no-plot", action="store_true", help="headless: skip the convergence plot")
+    ap.add_argument("--time-limit", type=float, default=0.0, help="wall-clock limit in seconds")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+
+    D, Hrec, Vrec, P = load_data(args)
+    hospitals, vehicles = map_records_to_objects(Hrec, Vrec)
+
+    alns = ALNS(
+        distances=D,
+        penalties=P,
+        max_iters=args.max_iters,
+        min_remove=args.min_remove,
+        max_remove=args.max_remove,
+        regret_k=args.regret_k,
+        initial_temp=args.initial_temp,
+        cooling_rate=args.cooling_rate,
+        segment_length=args.segment_length,
+        reaction=args.reaction,
+        use_load_distance_cost=args.use_load_distance_cost,
+        time_scale=args.time_scale,
+        init=args.init,
+        seed=args.seed,
+        time_limit=args.time_limit,
+    )
+
+    best, cost = alns.run(vehicles, hospitals, verbose_every=args.verbose_every)
+
+    print("\n=== BEST SOLUTION (ALNS) ===")
+    print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
+    print(f"Best Total Cost: {cost:.2f}")
+    if not args.no_plot:
+        plot_history(alns.history, title="Best Cost (ALNS)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Batch solve many Medical VRP instances with one solver configuration.
+- Instances: directories (*.json, *.xlsx, *.txt), instance files, or --manifest (one path per line,
+  or JSONL objects {"path": ..., "solver": ..., "params": {...}, "seed": ...} overriding the defaults).
+- Work is spread over a process pool; each worker imports the solvers once and keeps the last
+  loaded instances in memory, so repeated instances skip parsing/caching altogether.
+- --time-limit is passed to the solver (SA/PSO/ALNS stop after their current iteration).
+- --result-cache keeps (instance, solver, params, seed) -> cost/routes in an SQLite file shared by
+  the workers; repeated tasks are answered from it (cached=true in the output row).
+- Results are streamed to --out (.csv or .jsonl) in completion order, one row per instance.
+
+    python -m scripts.run_batch data/daily --solver sa --config '{"max_iters": 20000}' \
+        --workers 8 --time-limit 60 --out results.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+SOLVERS = ("sa", "pso", "alns")
+SUFFIXES = (".json", ".xlsx", ".txt")
+FIELDS = ["index", "instance", "solver", "seed", "status", "cost", "runtime_s", "routes", "cached", "error"]
+
+# run_sa defaults; PSO and ALNS use their constructor defaults
+SA_DEFAULTS = dict(initial_temp=1000.0, cooling_rate=0.999, min_temp=0.5, max_iters=1000,
+                   use_load_distance_cost=True)
+
+_DATA: "OrderedDict[tuple, tuple]" = OrderedDict()
+_DATA_SLOTS = 8
+_RESULTS = {}
+
+
+def _warm_up():
+    # runs once per worker process
+    import heuristics.sa, heuristics.pso.pso, heuristics.alns  # noqa: F401
+    import utils.io, utils.cache, utils.results  # noqa: F401
+
+
+def _load(path: str, cache: bool):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, cache)
+    hit = _DATA.get(key)
+    if hit is not None:
+        _DATA.move_to_end(key)
+        return hit
+    from utils.io import load_from_excel, load_from_json, load_from_txt
+    from utils.cache import load_cached
+    suffix = Path(path).suffix.lower()
+    if suffix == ".txt":
+        data = load_from_txt(path)
+    elif cache:
+        data = load_cached(path, as_list=True)
+    else:
+        data = load_from_excel(path) if suffix in (".xlsx", ".xls") else load_from_json(path)
+    _DATA[key] = data
+    while len(_DATA) > _DATA_SLOTS:
+        _DATA.popitem(last=False)
+    return data
+
+
+def _result_cache(path: str):
+    from utils.results import ResultCache
+    if path not in _RESULTS:
+        _RESULTS[path] = ResultCache(path)
+    return _RESULTS[path]
+
+
+def solve_task(task: dict) -> dict:
+    """Solve one instance in a worker; never raises, failures come back as status=error."""
+    from heuristics.common import Hospital, Vehicle
+    out = {"index": task["index"], "instance": task["path"], "solver": task["solver"],
+           "seed": task["seed"], "status": "ok", "cost": None, "runtime_s": None,
+           "routes": None, "cached": False, "error": ""}
+    t0 = time.perf_counter()
+    try:
+        D, Hrec, Vrec, P = _load(task["path"], task["cache"])
+        hospitals = [Hospital(**r) for r in Hrec]
+        vehicles = [Vehicle(**r) for r in Vrec]
+        params, seed = dict(task["params"]), task["seed"]
+        limit = params.pop("time_limit", task["time_limit"])
+        cache = _result_cache(task["result_cache"]) if task.get("result_cache") else None
+        if cache is not None:
+            from utils.results import CACHEABLE_STOPS, instance_digest, result_key
+            eff = dict(SA_DEFAULTS, **params) if task["solver"] == "sa" else params
+            key = result_key(instance_digest(D, Hrec, Vrec, P), task["solver"],
+                             dict(eff, time_limit=limit), seed)
+            hit = cache.get(key)
+            if hit is not None:
+                out.update(cost=hit["cost"], routes={str(vid): r for vid, r in hit["routes"]}, cached=True)
+                out["runtime_s"] = round(time.perf_counter() - t0, 4)
+                return out
+        random.seed(seed)
+        if task["solver"] == "sa":
+            from heuristics.sa import SimulatedAnnealing
+            solver = SimulatedAnnealing(distances=D, penalties=P, time_limit=limit,
+                                        **dict(SA_DEFAULTS, **params))
+            best, cost = solver.run(vehicles, hospitals, verbose_every=0)
+        elif task["solver"] == "pso":
+            from heuristics.pso.pso import PSO
+            solver = PSO(D, P, seed=seed, time_limit=limit, **params)
+            best, cost = solver.run(vehicles, hospitals, verbose_every=0)
+        elif task["solver"] == "alns":
+            from heuristics.alns import ALNS
+            solver = ALNS(D, P, seed=seed, time_limit=limit, **params)
+            best, cost = solver.run(vehicles, hospitals, verbose_every=0)
+        else:
+            raise ValueError(f"Unknown solver: {task['solver']}")
+        out["cost"] = float(cost)
+        out["routes"] = {str(v.vehicle_id): [h.hospital_id for h in v.route] for v in best.vehicles}
+        if cache is not None and solver.stop_reason in CACHEABLE_STOPS:
+            cache.put(key, task["solver"], cost, [[v.vehicle_id, [h.hospital_id for h in v.route]]
+                                                  for v in best.vehicles])
+    except Exception as e:
+        out["status"], out["error"] = "error", f"{type(e).__name__}: {e}"
+    out["runtime_s"] = round(time.perf_counter() - t0, 4)
+    return out
+
+
+def collect_tasks(args) -> list:
+    from utils.results import default_result_path
+    entries = []
+    for p in args.paths:
+        p = Path(p)
+        if p.is_dir():
+            entries += [{"path": str(f)} for f in sorted(p.iterdir())
+                        if f.is_file() and f.suffix.lower() in SUFFIXES]
+        else:
+            entries.append({"path": str(p)})
+    if args.manifest:
+        base = Path(args.manifest).resolve().parent
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                rec = json.loads(line) if line.startswith("{") else {"path": line}
+                if not Path(rec["path"]).is_absolute():
+                    rec["path"] = str(base / rec["path"])
+                entries.append(rec)
+
+    config = _read_config(args.config)
+    tasks = []
+    for i, rec in enumerate(entries):
+        tasks.append({
+            "index": i,
+            "path": rec["path"],
+            "solver": rec.get("solver", args.solver),
+            "params": dict(config, **rec.get("params", {})),
+            "seed": rec.get("seed", args.seed),
+            "time_limit": float(rec.get("time_limit", args.time_limit)),
+            "cache": not args.no_cache,
+            "result_cache": (str(default_result_path(rec["path"])) if args.result_cache == "auto"
+                             else args.result_cache),
+        })
+    return tasks
+
+
+def _read_config(config: str) -> dict:
+    if not config:
+        return {}
+    if Path(config).exists():
+        with open(config, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(config)
+
+
+class ResultWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.csv = Path(path).suffix.lower() == ".csv"
+        self.f = open(path, "w", encoding="utf-8", newline="")
+        if self.csv:
+            self.w = csv.DictWriter(self.f, fieldnames=FIELDS)
+            self.w.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self.csv:
+            self.w.writerow(dict(row, routes=json.dumps(row["routes"]) if row["routes"] else ""))
+        else:
+            self.f.write(json.dumps(row) + "\n")
+        self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Batch solve Medical VRP instances")
+    ap.add_argument("paths", nargs="*", help="instance files or directories")
+    ap.add_argument("--manifest", type=str, default="", help="path list or JSONL of tasks")
+    ap.add_argument("--solver", choices=SOLVERS, default="sa")
+    ap.add_argument("--config", type=str, default="", help="solver kwargs as JSON string or file")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--time-limit", type=float, default=0.0, help="per-instance limit in seconds (0: none)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", type=str, default="results.jsonl", help=".csv or .jsonl")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source files, skip the compiled cache")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default="",
+                    help="reuse/store results in an SQLite cache shared by all workers "
+                         "(default file: <instance dir>/.cache/results.sqlite)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    tasks = collect_tasks(args)
+    if not tasks:
+        sys.exit("No instances given (paths or --manifest)")
+
+    writer = ResultWriter(args.out)
+    t0, failed = time.perf_counter(), 0
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=_warm_up) as pool:
+            futures = [pool.submit(solve_task, t) for t in tasks]
+            for n, fut in enumerate(as_completed(futures), 1):
+                row = fut.result()
+                writer.write(row)
+                failed += row["status"] != "ok"
+                cost = f"{row['cost']:.2f}" if row["cost"] is not None else row["error"]
+                print(f"[{n}/{len(tasks)}] {row['instance']}: {cost} ({row['runtime_s']:.2f}s)")
+    finally:
+        writer.close()
+    print(f"Done: {len(tasks)} instances, {failed} failed, {time.perf_counter() - t0:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+from pathlib import Path
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
+from heuristics.common import Hospital, Vehicle
+from heuristics.decompose import solve_decomposed, METHODS, SOLVERS
+from utils.plot import print_solution
+
+
+def map_records_to_objects(hosp_recs, veh_recs):
+    hospitals = [Hospital(**r) for r in hosp_recs]
+    vehicles  = [Vehicle(**r) for r in veh_recs]
+    return hospitals, vehicles
+
+
+def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p, as_list=True)
+    if args.excel and Path(args.excel).exists():
+        return load_from_excel(args.excel)
+    if args.json and Path(args.json).exists():
+        return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
+    for kind, p in (
+        ("excel", Path("data/excel/medical_vrp_data.xlsx")),
+        ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
+    ):
+        if p.exists():
+            if kind == "excel": return load_from_excel(str(p))
+            if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
+    raise FileNotFoundError("Not found data (excel/json/txt)")
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Cluster-first decomposition for large Medical VRP instances")
+    ap.add_argument("--clusters", type=int, default=0, help="number of clusters (0: from --cluster-size)")
+    ap.add_argument("--cluster-size", type=int, default=150, help="target hospitals per cluster")
+    ap.add_argument("--method", choices=METHODS, default="kmedoids")
+    ap.add_argument("--tw-weight", type=float, default=0.5,
+                    help="kmedoids: weight of the time-window midpoint gap (hours x mean speed)")
+    ap.add_argument("--solver", choices=SOLVERS, default="alns", help="solver used on every cluster")
+    ap.add_argument("--params", type=str, default="", help="cluster solver kwargs as JSON")
+    ap.add_argument("--workers", type=int, default=0, help="processes for the clusters (0: all CPUs)")
+    ap.add_argument("--improve-passes", type=int, default=3, help="cross-cluster relocate passes (0: off)")
+    ap.add_argument("--neighbors", type=int, default=10, help="nearest hospitals tried per relocate")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--use-load-distance-cost", action="store_true", default=False)
+    ap.add_argument("--time-scale", type=float, default=6.0)
+    ap.add_argument("--excel", type=str, default="")
+    ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
+    ap.add_argument("--quiet", action="store_true", help="print only the summary, not every route")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    D, Hrec, Vrec, P = load_data(args)
+    hospitals, vehicles = map_records_to_objects(Hrec, Vrec)
+
+    best, cost, report = solve_decomposed(
+        D, hospitals, vehicles, P,
+        n_clusters=args.clusters or None,
+        cluster_size=args.cluster_size,
+        method=args.method,
+        solver=args.solver,
+        solver_params=json.loads(args.params) if args.params else None,
+        workers=args.workers or None,
+        tw_weight=args.tw_weight,
+        improve_passes=args.improve_passes,
+        neighbors=args.neighbors,
+        use_load_distance_cost=args.use_load_distance_cost,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+
+    if not args.quiet:
+        print("\n=== BEST SOLUTION (decomposed) ===")
+        print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
+    print(f"Clusters: {len(report['clusters'])}, repaired hospitals: {report['repaired']}, "
+          f"cross-cluster moves: {report['moves']}")
+    print(f"Time: clustering {report['cluster_s']:.1f}s, clusters {report['solve_s']:.1f}s, "
+          f"total {report['total_s']:.1f}s")
+    print(f"Best Total Cost: {cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import argparse
 from pathlib import Path
-from utils.io import load_from_excel, load_from_json
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
 from heuristics.common import Hospital, Vehicle
+from heuristics.mip_start import heuristic_start, start_incumbent_feed
 from utils.plot import print_solution
 from gurobi_solver.gurobi_solver import solve_gurobi, extract_solution_from_gurobi
 
@@ -13,17 +15,25 @@ def map_records_to_objects(hosp_recs, veh_recs):
 
 
 def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p)
     if args.excel and Path(args.excel).exists():
         return load_from_excel(args.excel)
     if args.json and Path(args.json).exists():
         return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
     for kind, p in (
         ("excel", Path("data/excel/medical_vrp_data.xlsx")),
         ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
     ):
         if p.exists():
             if kind == "excel": return load_from_excel(str(p))
             if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
     raise FileNotFoundError("Not found data (excel/json/txt)")
 
 
@@ -34,7 +44,15 @@ def parse_args():
     ap.add_argument("--start-time", type=float, default=8.0)
     ap.add_argument("--excel", type=str, default="")
     ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
     ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--warm-start", choices=["none", "sa", "pso"], default="none",
+                    help="run a heuristic first and pass its routes as MIP start")
+    ap.add_argument("--warm-start-iters", type=int, default=2000)
+    ap.add_argument("--inject-restarts", type=int, default=0,
+                    help="heuristic restarts run during the solve; improvements are injected")
+    ap.add_argument("--seed", type=int, default=42)
     return ap.parse_args()
 
 
@@ -44,11 +62,25 @@ def main():
     D, Hrec, Vrec, P = load_data(args)
     hospitals, vehicles = map_records_to_objects(Hrec, Vrec)
 
+    start, feed = None, None
+    if args.warm_start != "none":
+        start, ws_cost = heuristic_start(args.warm_start, D, Hrec, Vrec, P,
+                                         max_iters=args.warm_start_iters, seed=args.seed,
+                                         time_scale=args.time_scale)
+        print(f"[warm-start] {args.warm_start.upper()} incumbent cost: {ws_cost:.2f}")
+        if args.inject_restarts > 0:
+            feed, _ = start_incumbent_feed(args.warm_start, D, Hrec, Vrec, P,
+                                           restarts=args.inject_restarts,
+                                           max_iters=args.warm_start_iters, seed=args.seed,
+                                           time_scale=args.time_scale, best_cost=ws_cost)
+
     model = solve_gurobi(
         D, hospitals, vehicles, P,
         time_limit=args.time_limit,
         time_scale=args.time_scale,
         start_time=args.start_time,
+        mip_start=start,
+        incumbent_feed=feed,
     )
 
     sol, cost = extract_solution_from_gurobi(
@@ -0,0 +1,89 @@
+import argparse
+import json
+from pathlib import Path
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
+from heuristics.portfolio import run_portfolio, HEURISTICS, MILP_BACKENDS
+from utils.plot import print_solution
+
+
+def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p, as_list=True)
+    if args.excel and Path(args.excel).exists():
+        return load_from_excel(args.excel)
+    if args.json and Path(args.json).exists():
+        return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
+    for kind, p in (
+        ("excel", Path("data/excel/medical_vrp_data.xlsx")),
+        ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
+    ):
+        if p.exists():
+            if kind == "excel": return load_from_excel(str(p))
+            if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
+    raise FileNotFoundError("Not found data (excel/json/txt)")
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Race SA/PSO/ALNS and a MILP on one instance under one deadline")
+    ap.add_argument("--deadline", type=float, default=60.0, help="wall-clock seconds for the whole race")
+    ap.add_argument("--members", type=str, default="sa,sa,pso,alns",
+                    help=f"comma-separated heuristics from {list(HEURISTICS)}; repeats run in parallel "
+                         "with different seeds (SA members restart until the deadline)")
+    ap.add_argument("--milp", choices=["auto", "none"] + list(MILP_BACKENDS), default="auto",
+                    help="auto: first MILP backend that imports and solves; none: heuristics only")
+    ap.add_argument("--params", type=str, default="",
+                    help='per-member kwargs as JSON, e.g. \'{"sa": {"cooling_rate": 0.9995}}\'')
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--time-scale", type=float, default=6.0)
+    ap.add_argument("--start-time", type=float, default=8.0)
+    ap.add_argument("--excel", type=str, default="")
+    ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
+    ap.add_argument("--report", type=str, default="", help="write the race report as JSON")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    D, Hrec, Vrec, P = load_data(args)
+
+    best, cost, report = run_portfolio(
+        D, Hrec, Vrec, P,
+        deadline=args.deadline,
+        members=[m.strip() for m in args.members.split(",") if m.strip()],
+        params=json.loads(args.params) if args.params else None,
+        milp=args.milp,
+        seed=args.seed,
+        time_scale=args.time_scale,
+        start_time=args.start_time,
+    )
+
+    print("\n=== PORTFOLIO ===")
+    for name, st in report["members"].items():
+        b = f"{st['best']:.2f}" if st["best"] is not None else "-"
+        t = f"{st['time_to_best_s']:.2f}s" if st["time_to_best_s"] is not None else "-"
+        print(f"{name:>8}: best={b:>12} at {t:>8}  improvements={st['improvements']:<4} {st['status']}")
+    print(f"Stopped: {report['stop']} after {report['elapsed_s']:.1f}s"
+          + (" (MILP proved its incumbent optimal)" if report["milp_optimal"] else ""))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if best is None:
+        raise SystemExit("No member produced a solution before the deadline")
+
+    print(f"\n=== BEST SOLUTION (portfolio, won by {report['winner']}) ===")
+    print_solution(best, P, use_load_distance_cost=False, time_scale=args.time_scale)
+    print(f"Best Total Cost: {cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import argparse
 import random
 from pathlib import Path
-from utils.io import load_from_excel, load_from_json
-from heuristics.common import Hospital, Vehicle
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
+from heuristics.common import Hospital, Vehicle, Solution
 from heuristics.pso.pso import PSO
+from utils.checkpoint import encode_routes, decode_routes
+from utils.results import CACHEABLE_STOPS, ResultCache, default_result_path, instance_digest, result_key
+from heuristics.bounds import start_lower_bound, gap
 from utils.plot import plot_history, print_solution
 
 def map_records_to_objects(hosp_recs, veh_recs):
@@ -13,18 +17,26 @@ def map_records_to_objects(hosp_recs, veh_recs):
 
 
 def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p, as_list=True)
     if args.excel and Path(args.excel).exists():
         return load_from_excel(args.excel)
     if args.json and Path(args.json).exists():
         return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
     
     for kind, p in (
         ("excel", Path("data/excel/medical_vrp_data.xlsx")),
         ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
     ):
         if p.exists():
             if kind == "excel": return load_from_excel(str(p))
             if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
     raise FileNotFoundError("Không tìm thấy dữ liệu (excel/json)")
 
 
@@ -36,11 +48,38 @@ def parse_args():
     ap.add_argument("--w", type=float, default=0.7, help="inertia weight")
     ap.add_argument("--c1", type=float, default=1.5, help="cognitive coeff")
     ap.add_argument("--c2", type=float, default=1.5, help="social coeff")
+    ap.add_argument("--decoder", choices=["greedy", "split"], default="greedy",
+                    help="greedy first-fit, or optimal Prins split of the key order (greedy fallback)")
+    ap.add_argument("--local-search-every", type=int, default=0,
+                    help="hybrid PSO: local search on gbest and top-k pbest every N iterations (0: off)")
+    ap.add_argument("--local-search-top-k", type=int, default=3, help="pbest solutions refined with gbest")
+    ap.add_argument("--local-search-ops", type=str, default="two_opt,relocate",
+                    help="comma-separated from two_opt, insert, relocate, swap")
+    ap.add_argument("--decode-cache", type=int, default=4096,
+                    help="LRU entries of decoded visit orders (0 disables)")
+    ap.add_argument("--batch-scoring", action="store_true",
+                    help="move the whole swarm, then cost all decoded particles in one NumPy kernel pass")
     ap.add_argument("--verbose-every", type=int, default=100)
     ap.add_argument("--use-load-distance-cost", action="store_true", default=False)
     ap.add_argument("--time-scale", type=float, default=6.0)
     ap.add_argument("--excel", type=str, default="")
     ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
+    ap.add_argument("--no-plot", action="store_true", help="headless: skip the convergence plot")
+    ap.add_argument("--time-limit", type=float, default=0.0, help="wall-clock limit in seconds")
+    ap.add_argument("--checkpoint", type=str, default="", help="checkpoint file (JSON)")
+    ap.add_argument("--checkpoint-every", type=int, default=50, help="iterations between checkpoints")
+    ap.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    ap.add_argument("--lower-bound", choices=["none", "auto", "lp", "degree"], default="none",
+                    help="compute a lower bound in a background thread and report the gap")
+    ap.add_argument("--target-gap", type=float, default=0.0,
+                    help="stop once (best - bound) / best <= this fraction (implies --lower-bound auto)")
+    ap.add_argument("--bound-time-limit", type=float, default=10.0,
+                    help="seconds the LP bound may run (0: no limit); the gap is only printed if it finished")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default="",
+                    help="reuse/store results in an SQLite cache (default file: <data dir>/.cache/results.sqlite)")
     return ap.parse_args()
 
 def main():
@@ -48,9 +87,7 @@ def main():
     random.seed(args.seed)
     D, Hrec, Vrec, P = load_data(args)
     hospitals, vehicles = map_records_to_objects(Hrec, Vrec)
-    pso = PSO(
-        distances=D,
-        penalties=P,
+    params = dict(
         swarm_size=args.swarm_size,
         max_iters=args.max_iters,
         inertia=args.w,
@@ -58,15 +95,63 @@ def main():
         social=args.c2,
         use_load_distance_cost=args.use_load_distance_cost,
         time_scale=args.time_scale,
-        seed=args.seed,
+        time_limit=args.time_limit,
+        decoder=args.decoder,
     )
+    if args.local_search_every:
+        params.update(local_search_every=args.local_search_every, local_search_top_k=args.local_search_top_k,
+                      local_search_ops=tuple(o.strip() for o in args.local_search_ops.split(",") if o.strip()))
 
-    best, cost = pso.run(vehicles, hospitals, verbose_every=args.verbose_every)
+    if args.target_gap > 0:
+        params["target_gap"] = args.target_gap
+    if args.batch_scoring:
+        params["batch_scoring"] = True
+
+    cache, key = None, ""
+    if args.result_cache:
+        cache = ResultCache(default_result_path(args.excel or args.json or args.txt)
+                            if args.result_cache == "auto" else args.result_cache)
+        key = result_key(instance_digest(D, Hrec, Vrec, P), "pso", params, args.seed)
+        hit = cache.get(key)
+        if hit is not None:
+            best = Solution(decode_routes(hit["routes"], vehicles, hospitals), hospitals, D)
+            print("\n=== BEST SOLUTION (PSO, cached result) ===")
+            print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
+            print(f"Best Total Cost: {hit['cost']:.2f}")
+            return
+
+    method = "auto" if args.lower_bound == "none" and args.target_gap > 0 else args.lower_bound
+    bound = None
+    if method != "none":
+        bound = start_lower_bound(D, hospitals, vehicles, P, method=method,
+                                  use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale,
+                                  time_limit=args.bound_time_limit)
+    pso = PSO(distances=D, penalties=P, seed=args.seed, decode_cache_size=args.decode_cache,
+              lower_bound=bound, **params)
+    best, cost = pso.run(vehicles, hospitals, verbose_every=args.verbose_every,
+                         checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every if args.checkpoint else 0,
+                         resume=args.resume)
+    if cache is not None and pso.stop_reason in CACHEABLE_STOPS:
+        cache.put(key, "pso", cost, encode_routes(best.vehicles))
 
     print("\n=== BEST SOLUTION (PSO) ===")
     print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
     print(f"Best Total Cost: {cost:.2f}")
-    plot_history(pso.history, title="Best Cost (PSO)")
+    print(f"Stopped: {pso.stop_reason}")
+    if bound is not None:
+        if not bound.done():
+            print("Lower bound: still running, no gap reported")
+        elif bound.exception() is not None:
+            print(f"Lower bound failed: {bound.exception()}")
+        else:
+            lb = bound.result()
+            g = gap(cost, lb["bound"])
+            print(f"Lower bound ({lb['method']}, {lb['runtime_s']:.2f}s): {lb['bound']:.2f}, gap: {100 * g:.2f}%")
+    if args.decode_cache > 0:
+        print(f"Decode cache: {pso.cache_hits}/{pso.cache_hits + pso.cache_misses} hits "
+              f"({100 * pso.cache_hit_rate:.1f}%), {pso.cache_evictions} evictions")
+    if not args.no_plot:
+        plot_history(pso.history, title="Best Cost (PSO)")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
 import argparse
 import random
 from pathlib import Path
-from utils.io import load_from_excel, load_from_json
-from heuristics.common import Hospital, Vehicle
-from heuristics.sa import SimulatedAnnealing
+from utils.io import load_from_excel, load_from_json, load_from_txt
+from utils.cache import load_cached
+from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.sa import SimulatedAnnealing, SAProfiler, BASIC_OPERATORS, ALL_OPERATORS, SCHEDULES
+from utils.checkpoint import encode_routes, decode_routes
+from utils.results import CACHEABLE_STOPS, ResultCache, default_result_path, instance_digest, result_key
+from heuristics.bounds import start_lower_bound, gap
 from utils.plot import plot_history, print_solution
 
 
@@ -14,19 +18,27 @@ def map_records_to_objects(hosp_recs, veh_recs):
 
 
 def load_data(args):
+    if not args.no_cache:
+        for p in (args.excel, args.json):
+            if p and Path(p).exists():
+                return load_cached(p, as_list=True)
     if args.excel and Path(args.excel).exists():
         return load_from_excel(args.excel)
     if args.json and Path(args.json).exists():
         return load_from_json(args.json)
+    if args.txt and Path(args.txt).exists():
+        return load_from_txt(args.txt, dtype="float32" if args.float32 else "float64")
 
     candidates = [
         ("excel", Path("data/excel/medical_vrp_data.xlsx")),
         ("json",  Path("data/json/medical_vrp_data.json")),
+        ("txt",   Path("data/txt/medical_vrp_data.txt")),
     ]
     for kind, p in candidates:
         if p.exists():
             if kind == "excel": return load_from_excel(str(p))
             if kind == "json":  return load_from_json(str(p))
+            if kind == "txt":   return load_from_txt(str(p))
 
     raise FileNotFoundError(
         "Cannot load data excel|json|txt "
@@ -42,10 +54,45 @@ def parse_args():
     ap.add_argument("--min-temp", type=float, default=0.5)
     ap.add_argument("--max-iters", type=int, default=1000)
     ap.add_argument("--verbose-every", type=int, default=100)
+    ap.add_argument("--init", choices=["random", "cheapest", "regret"], default="random",
+                    help="initial solution: random (assign_initial) or deterministic insertion")
     ap.add_argument("--use-load-distance-cost", action="store_true", default=True)
     ap.add_argument("--time-scale", type=float, default=6.0)
     ap.add_argument("--excel", type=str, default="")
     ap.add_argument("--json", type=str, default="")
+    ap.add_argument("--txt", type=str, default="")
+    ap.add_argument("--float32", action="store_true", help="store txt distances as float32")
+    ap.add_argument("--no-cache", action="store_true", help="parse the source file, skip the compiled cache")
+    ap.add_argument("--no-plot", action="store_true", help="headless: skip the convergence plot")
+    ap.add_argument("--operators", type=str, default="basic",
+                    help="basic | all | comma list of " + ",".join(ALL_OPERATORS))
+    ap.add_argument("--op-select", choices=["uniform", "roulette", "ucb"], default="uniform")
+    ap.add_argument("--segment-length", type=int, default=100, help="roulette weight update period")
+    ap.add_argument("--schedule", choices=SCHEDULES, default="geometric")
+    ap.add_argument("--lm-beta", type=float, default=None,
+                    help="Lundy-Mees beta (default: reach --min-temp after --max-iters)")
+    ap.add_argument("--target-accept", type=float, default=0.3, help="adaptive schedule acceptance target")
+    ap.add_argument("--adapt-window", type=int, default=100)
+    ap.add_argument("--reheat-after", type=int, default=0,
+                    help="reheat after N iterations without a new best (0: never)")
+    ap.add_argument("--reheat-temp", type=float, default=None, help="default: initial temp / 2")
+    ap.add_argument("--max-reheats", type=int, default=10)
+    ap.add_argument("--patience", type=int, default=0, help="stop after N iterations without a new best")
+    ap.add_argument("--patience-seconds", type=float, default=0.0)
+    ap.add_argument("--time-limit", type=float, default=0.0, help="wall-clock limit in seconds")
+    ap.add_argument("--checkpoint", type=str, default="", help="checkpoint file (JSON)")
+    ap.add_argument("--checkpoint-every", type=int, default=1000, help="iterations between checkpoints")
+    ap.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    ap.add_argument("--lower-bound", choices=["none", "auto", "lp", "degree"], default="none",
+                    help="compute a lower bound in a background thread and report the gap")
+    ap.add_argument("--target-gap", type=float, default=0.0,
+                    help="stop once (best - bound) / best <= this fraction (implies --lower-bound auto)")
+    ap.add_argument("--bound-time-limit", type=float, default=10.0,
+                    help="seconds the LP bound may run (0: no limit); the gap is only printed if it finished")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default="",
+                    help="reuse/store results in an SQLite cache (default file: <data dir>/.cache/results.sqlite)")
+    ap.add_argument("--profile-json", type=str, default="", help="write per-operator stats as JSON")
+    ap.add_argument("--trace", type=str, default="", help="write a Chrome trace (chrome://tracing)")
     return ap.parse_args()
 
 
@@ -56,23 +103,79 @@ def main():
     D, Hrec, Vrec, P = load_data(args)
     hospitals, vehicles = map_records_to_objects(Hrec, Vrec)
 
-    sa = SimulatedAnnealing(
-        distances=D,
+    profiler = SAProfiler(trace=bool(args.trace)) if (args.profile_json or args.trace) else None
+    params = dict(
         initial_temp=args.initial_temp,
         cooling_rate=args.cooling_rate,
         min_temp=args.min_temp,
         max_iters=args.max_iters,
-        penalties=P,
         use_load_distance_cost=args.use_load_distance_cost,
         time_scale=args.time_scale,
+        init=args.init,
+        operators={"basic": BASIC_OPERATORS, "all": ALL_OPERATORS}.get(args.operators)
+                  or tuple(o.strip() for o in args.operators.split(",")),
+        operator_selection=args.op_select,
+        segment_length=args.segment_length,
+        schedule=args.schedule,
+        lm_beta=args.lm_beta,
+        target_accept=args.target_accept,
+        adapt_window=args.adapt_window,
+        reheat_after=args.reheat_after,
+        reheat_temp=args.reheat_temp,
+        max_reheats=args.max_reheats,
+        patience=args.patience,
+        patience_seconds=args.patience_seconds,
+        time_limit=args.time_limit,
     )
 
-    best, cost = sa.run(vehicles, hospitals, verbose_every=args.verbose_every)
+    if args.target_gap > 0:
+        params["target_gap"] = args.target_gap
+
+    cache, key = None, ""
+    if args.result_cache:
+        cache = ResultCache(default_result_path(args.excel or args.json or args.txt)
+                            if args.result_cache == "auto" else args.result_cache)
+        key = result_key(instance_digest(D, Hrec, Vrec, P), "sa", params, args.seed)
+        hit = cache.get(key)
+        if hit is not None:
+            best = Solution(decode_routes(hit["routes"], vehicles, hospitals), hospitals, D)
+            print("\n=== BEST SOLUTION (Simulated Annealing, cached result) ===")
+            print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
+            print(f"Best Total Cost: {hit['cost']:.2f}")
+            return
+
+    method = "auto" if args.lower_bound == "none" and args.target_gap > 0 else args.lower_bound
+    bound = None
+    if method != "none":
+        bound = start_lower_bound(D, hospitals, vehicles, P, method=method,
+                                  use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale,
+                                  time_limit=args.bound_time_limit)
+    sa = SimulatedAnnealing(distances=D, penalties=P, profiler=profiler, lower_bound=bound, **params)
+    best, cost = sa.run(vehicles, hospitals, verbose_every=args.verbose_every,
+                        checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every if args.checkpoint else 0,
+                        resume=args.resume)
+    if cache is not None and sa.stop_reason in CACHEABLE_STOPS:
+        cache.put(key, "sa", cost, encode_routes(best.vehicles),
+                  {"stop": sa.stop_reason, "iterations": sa.iterations})
 
     print("\n=== BEST SOLUTION (Simulated Annealing) ===")
     print_solution(best, P, use_load_distance_cost=args.use_load_distance_cost, time_scale=args.time_scale)
     print(f"Best Total Cost: {cost:.2f}")
-    plot_history(sa.history, title="Best Cost (SA)")
+    print(f"Stopped: {sa.stop_reason} after {sa.iterations} iterations, {sa.n_reheats} reheats")
+    if bound is not None:
+        if not bound.done():
+            print("Lower bound: still running, no gap reported")
+        elif bound.exception() is not None:
+            print(f"Lower bound failed: {bound.exception()}")
+        else:
+            lb = bound.result()
+            g = gap(cost, lb["bound"])
+            print(f"Lower bound ({lb['method']}, {lb['runtime_s']:.2f}s): {lb['bound']:.2f}, gap: {100 * g:.2f}%")
+    if profiler is not None:
+        if args.profile_json: profiler.to_json(args.profile_json)
+        if args.trace: profiler.to_chrome_trace(args.trace)
+    if not args.no_plot:
+        plot_history(sa.history, title="Best Cost (SA)")
 
 
 if __name__ == "__main__":
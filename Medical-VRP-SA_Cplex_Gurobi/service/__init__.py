@@ -0,0 +1,2 @@
+# Import SolveService / SolveClient from the submodules: both are also run with `python -m`.
+__all__ = ["server", "client", "workers"]
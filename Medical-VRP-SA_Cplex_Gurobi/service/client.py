@@ -0,0 +1,137 @@
+"""
+Minimal client for service.server (standard library only, TCP or Unix socket).
+
+    python -m service.client submit data/json/medical_vrp_data.json --solver sa --deadline 30 --wait
+    python -m service.client submit ../SMT-Routing-Optimization/data/C12D15.json --problem smt --solver ga
+    python -m service.client status <id>
+    python -m service.client cancel <id>
+"""
+import argparse
+import http.client
+import json
+import socket
+import sys
+import time
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class ServiceError(RuntimeError):
+    def __init__(self, code, message):
+        super().__init__(f"HTTP {code}: {message}")
+        self.code = code
+
+
+class SolveClient:
+    def __init__(self, host="127.0.0.1", port=8765, unix_socket="", timeout=30.0):
+        self.host, self.port, self.unix_socket, self.timeout = host, port, unix_socket, timeout
+
+    def _request(self, method, path, obj=None):
+        if self.unix_socket:
+            conn = _UnixHTTPConnection(self.unix_socket, self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(obj).encode("utf-8") if obj is not None else None
+            conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            data = json.loads(resp.read().decode("utf-8") or "null")
+        finally:
+            conn.close()
+        if resp.status >= 400:
+            raise ServiceError(resp.status, data.get("error") if isinstance(data, dict) else data)
+        return data
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def submit(self, instance, *, problem="medical", solver=None, params=None, seed=None, deadline=None):
+        payload = {"problem": problem, "instance": instance, "params": params or {}, "seed": seed,
+                   "deadline": deadline}
+        if solver:
+            payload["solver"] = solver
+        return self._request("POST", "/jobs", payload)["id"]
+
+    def status(self, job_id):
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self):
+        return self._request("GET", "/jobs")
+
+    def cancel(self, job_id):
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+    def wait(self, job_id, poll=0.2, timeout=None, on_update=None):
+        """Poll until the job is finished; on_update(status) sees every intermediate status."""
+        t0 = time.time()
+        while True:
+            st = self.status(job_id)
+            if st["status"] in ("done", "cancelled", "failed", "expired"):
+                return st
+            if on_update is not None:
+                on_update(st)
+            if timeout is not None and time.time() - t0 >= timeout:
+                return st
+            time.sleep(poll)
+
+
+def main():
+    ap = argparse.ArgumentParser("Client for the local solve service")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", type=str, default="")
+    sub = ap.add_subparsers(dest="cmd")
+    s = sub.add_parser("submit")
+    s.add_argument("instance", help="instance JSON file (load_from_json shape)")
+    s.add_argument("--problem", choices=["medical", "smt"], default="medical")
+    s.add_argument("--solver", type=str, default="")
+    s.add_argument("--params", type=str, default="", help="solver kwargs as JSON")
+    s.add_argument("--seed", type=int, default=None)
+    s.add_argument("--deadline", type=float, default=None, help="seconds")
+    s.add_argument("--wait", action="store_true", help="poll and print incumbents until finished")
+    for name in ("status", "cancel", "wait"):
+        sub.add_parser(name).add_argument("job_id")
+    sub.add_parser("jobs")
+    sub.add_parser("health")
+    args = ap.parse_args()
+
+    client = SolveClient(args.host, args.port, args.unix)
+    show = lambda obj: print(json.dumps(obj, indent=2))
+    try:
+        if args.cmd == "submit":
+            with open(args.instance, "r", encoding="utf-8") as f:
+                instance = json.load(f)
+            job_id = client.submit(instance, problem=args.problem, solver=args.solver or None,
+                                   params=json.loads(args.params) if args.params else None,
+                                   seed=args.seed, deadline=args.deadline)
+            print(job_id)
+            if args.wait:
+                seen = {}
+
+                def report(st):
+                    inc = st["incumbent"]
+                    if inc and inc["cost"] != seen.get("cost"):
+                        seen["cost"] = inc["cost"]
+                        print(f"  incumbent {inc['cost']:.2f} (iter {inc['iteration']}, {inc['elapsed_s']:.1f}s)")
+                show(client.wait(job_id, on_update=report))
+        elif args.cmd in ("status", "cancel", "wait"):
+            show(getattr(client, args.cmd)(args.job_id))
+        elif args.cmd in ("jobs", "health"):
+            show(getattr(client, args.cmd)())
+        else:
+            ap.print_help()
+    except ServiceError as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Local solve service: asyncio HTTP (TCP or Unix socket) front end over warm solver process pools.
+
+    POST   /jobs       {"problem": "medical"|"smt", "solver": ..., "instance": {...},
+                        "params": {...}, "seed": 42, "deadline": 30}      -> 202 {"id", "status"}
+    GET    /jobs       summaries of known jobs
+    GET    /jobs/<id>  status, latest incumbent while running, result when finished
+    DELETE /jobs/<id>  cancel (queued: dropped; running: solver stops at its next iteration)
+    GET    /health
+
+Instances use the load_from_json shape of each project (Medical: distances/hospitals/vehicles/
+penalties; SMT: Points/Feeders/Nodes rows). `deadline` is in seconds from submission and also
+counts queueing time; a job still queued at its deadline is not started.
+
+    python -m service.server --port 8765 --workers 4 --smt-workers 1
+    python -m service.server --unix /tmp/vrp.sock
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import signal
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from . import workers
+
+MEDICAL_ROOT = str(Path(__file__).resolve().parents[1])
+_SIBLING_SMT = Path(MEDICAL_ROOT).parent / "SMT-Routing-Optimization"
+
+PROBLEMS = {
+    "medical": {"solvers": ("sa", "pso", "alns"), "keys": ("distances", "hospitals", "vehicles", "penalties"),
+                "run": workers.run_medical,
+                "warm": ("heuristics.sa", "heuristics.pso.pso", "heuristics.alns")},
+    "smt": {"solvers": ("ga", "aco"), "keys": ("Points", "Feeders", "Nodes"),
+            "run": workers.run_smt,
+            "warm": ("heuristics.ga.ga_smt", "heuristics.aco.aco", "utils.io")},
+}
+FINAL = ("done", "cancelled", "failed", "expired")
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class Job:
+    def __init__(self, problem, solver, instance, params, seed, deadline):
+        self.id = uuid.uuid4().hex[:12]
+        self.problem, self.solver = problem, solver
+        self.instance, self.params, self.seed = instance, params, seed
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.deadline_at = self.submitted_at + deadline if deadline else None
+        self.started_at = self.finished_at = None
+        self.result = None
+        self.error = ""
+
+    def spec(self):
+        return {"id": self.id, "solver": self.solver, "instance": self.instance,
+                "params": self.params, "seed": self.seed, "deadline": self.deadline_at}
+
+    def summary(self):
+        return {"id": self.id, "problem": self.problem, "solver": self.solver, "status": self.status,
+                "submitted_at": self.submitted_at, "started_at": self.started_at,
+                "finished_at": self.finished_at, "deadline_at": self.deadline_at,
+                "cost": self.result["cost"] if self.result else None}
+
+
+class SolveService:
+    def __init__(self, workers=2, smt_workers=1, smt_root=None, max_finished=1000, max_body=64 << 20):
+        self.n_workers = {"medical": max(0, workers), "smt": max(0, smt_workers)}
+        self.roots = {"medical": MEDICAL_ROOT, "smt": str(smt_root) if smt_root else ""}
+        self.max_finished = max_finished
+        self.max_body = max_body
+        self.jobs = OrderedDict()
+        self.queues, self.pools, self.tasks = {}, {}, []
+        self.ctx = mp.get_context("spawn")
+        self.manager = None
+
+    # ---- lifecycle ---------------------------------------------------------------------
+    async def start(self):
+        self.manager = self.ctx.Manager()
+        self.progress, self.cancel_flags = self.manager.dict(), self.manager.dict()
+        for kind, n in self.n_workers.items():
+            if n and (kind == "medical" or self.roots[kind]):
+                self.queues[kind] = asyncio.Queue()
+                self.pools[kind] = self._new_pool(kind)
+                self.tasks += [asyncio.ensure_future(self._dispatch(kind)) for _ in range(n)]
+
+    def _new_pool(self, kind):
+        return ProcessPoolExecutor(max_workers=self.n_workers[kind], mp_context=self.ctx,
+                                   initializer=workers.init_worker,
+                                   initargs=(self.roots[kind], self.progress, self.cancel_flags,
+                                             PROBLEMS[kind]["warm"]))
+
+    async def close(self):
+        for t in self.tasks:
+            t.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            if job.status == "running":
+                self.cancel_flags[job.id] = True
+        for pool in self.pools.values():
+            pool.shutdown(wait=True)
+        self.manager.shutdown()
+
+    # ---- jobs --------------------------------------------------------------------------
+    def submit(self, payload):
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        problem = payload.get("problem", "medical")
+        if problem not in PROBLEMS:
+            raise ValueError(f"unknown problem '{problem}'")
+        if problem not in self.queues:
+            raise ValueError(f"no workers for '{problem}' (check --smt-root / worker counts)")
+        spec = PROBLEMS[problem]
+        solver = payload.get("solver", spec["solvers"][0])
+        if solver not in spec["solvers"]:
+            raise ValueError(f"solver for {problem} must be one of {list(spec['solvers'])}")
+        instance = payload.get("instance")
+        if not isinstance(instance, dict) or any(k not in instance for k in spec["keys"]):
+            raise ValueError(f"instance must be an object with keys {list(spec['keys'])}")
+        params = payload.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        job = Job(problem, solver, instance, params, payload.get("seed"),
+                  float(payload.get("deadline") or 0.0))
+        self.jobs[job.id] = job
+        self.queues[problem].put_nowait(job)
+        self._trim()
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs[job_id]
+        if job.status == "queued":
+            job.status, job.finished_at = "cancelled", time.time()
+            job.instance = None
+        elif job.status == "running":
+            self.cancel_flags[job.id] = True
+        return job
+
+    def status(self, job_id):
+        job = self.jobs[job_id]
+        out = job.summary()
+        out["params"], out["seed"] = job.params, job.seed
+        out["incumbent"] = self.progress.get(job.id) if job.status == "running" else None
+        out["result"], out["error"] = job.result, job.error
+        return out
+
+    def _trim(self):
+        finished = [j for j in self.jobs.values() if j.status in FINAL]
+        for j in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[j.id]
+
+    async def _dispatch(self, kind):
+        loop = asyncio.get_event_loop()
+        queue = self.queues[kind]
+        while True:
+            job = await queue.get()
+            if job.status != "queued":
+                continue
+            if job.deadline_at and time.time() >= job.deadline_at:
+                job.status, job.finished_at, job.instance = "expired", time.time(), None
+                continue
+            job.status, job.started_at = "running", time.time()
+            try:
+                res = await loop.run_in_executor(self.pools[kind], PROBLEMS[kind]["run"], job.spec())
+                job.result = res
+                job.status = "cancelled" if res["stop"] == "cancelled" else "done"
+            except BrokenProcessPool as e:
+                job.status, job.error = "failed", f"worker died: {e}"
+                self.pools[kind] = self._new_pool(kind)
+            except Exception as e:
+                job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+            job.finished_at, job.instance = time.time(), None
+            self.progress.pop(job.id, None)
+            self.cancel_flags.pop(job.id, None)
+
+    # ---- HTTP --------------------------------------------------------------------------
+    def route(self, method, path, body):
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        if parts == ["health"] and method == "GET":
+            counts = {}
+            for j in self.jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+            return 200, {"ok": True, "jobs": counts, "problems": sorted(self.queues)}
+        if parts == ["jobs"]:
+            if method == "GET":
+                return 200, [j.summary() for j in self.jobs.values()]
+            if method == "POST":
+                job = self.submit(json.loads(body.decode("utf-8") or "null"))
+                return 202, {"id": job.id, "status": job.status}
+            return 405, {"error": "use GET or POST"}
+        if len(parts) == 2 and parts[0] == "jobs":
+            if parts[1] not in self.jobs:
+                return 404, {"error": f"unknown job {parts[1]}"}
+            if method == "GET":
+                return 200, self.status(parts[1])
+            if method == "DELETE":
+                return 200, self.cancel(parts[1]).summary()
+            return 405, {"error": "use GET or DELETE"}
+        return 404, {"error": f"no route for {method} {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, path = request_line.split(" ")[:2]
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = line.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length > self.max_body:
+                    code, obj = 413, {"error": f"body larger than {self.max_body} bytes"}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    code, obj = self.route(method.upper(), path, body)
+            except ValueError as e:
+                code, obj = 400, {"error": str(e)}
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as e:
+                code, obj = 500, {"error": f"{type(e).__name__}: {e}"}
+            payload = json.dumps(obj).encode("utf-8")
+            writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\nConnection: close\r\n\r\n"
+                         % (code, REASONS.get(code, "").encode(), len(payload)) + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    smt_root = args.smt_root or (str(_SIBLING_SMT) if _SIBLING_SMT.exists() else "")
+    svc = SolveService(workers=args.workers, smt_workers=args.smt_workers, smt_root=smt_root)
+    await svc.start()
+    if args.unix:
+        if os.path.exists(args.unix):
+            os.remove(args.unix)
+        server = await asyncio.start_unix_server(svc.handle, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(svc.handle, host=args.host, port=args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Solve service on {where} (medical workers: {args.workers}, "
+          f"smt workers: {args.smt_workers if 'smt' in svc.queues else 0})", flush=True)
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_event_loop().add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await svc.close()
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Local solve service for Medical VRP / SMT routing")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", type=str, default="", help="listen on a Unix socket instead of TCP")
+    ap.add_argument("--workers", type=int, default=2, help="Medical VRP worker processes")
+    ap.add_argument("--smt-workers", type=int, default=1, help="SMT worker processes (0: disable)")
+    ap.add_argument("--smt-root", type=str, default="", help="SMT-Routing-Optimization checkout "
+                    "(default: sibling directory)")
+    return ap.parse_args()
+
+
+def main():
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
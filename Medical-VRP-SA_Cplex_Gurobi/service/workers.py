@@ -0,0 +1,160 @@
+"""
+Job functions run inside the solve service's process pools.
+
+Both projects ship top-level `utils` / `heuristics` packages, so Medical and SMT jobs run in
+separate spawn-context pools: the pool initializer puts the project root first on sys.path and
+the job functions import solver modules lazily. Nothing from either project is imported at module
+level here, which keeps this module importable from both kinds of worker.
+
+Workers keep parsed instances in a small LRU keyed by a hash of the instance JSON, and talk to the
+server through two manager dicts: `progress` (job id -> incumbent) and `cancel` (job id -> True).
+"""
+import contextlib
+import hashlib
+import io
+import json
+import random
+import sys
+import time
+from collections import OrderedDict
+
+# run_sa defaults; PSO/ALNS/GA/ACO use their own defaults
+SA_DEFAULTS = dict(initial_temp=1000.0, cooling_rate=0.999, min_temp=0.5, max_iters=1000,
+                   use_load_distance_cost=True)
+PUBLISH_EVERY = 0.2   # seconds between incumbent updates
+POLL_EVERY = 0.1      # seconds between cancel checks
+
+_STATE = {"progress": None, "cancel": None}
+_DATA = OrderedDict()
+_DATA_SLOTS = 16
+
+
+def init_worker(root, progress, cancel, warm):
+    """Pool initializer: project root first on sys.path, shared dicts, warm imports."""
+    if root:
+        if root in sys.path:
+            sys.path.remove(root)
+        sys.path.insert(0, root)
+    _STATE["progress"], _STATE["cancel"] = progress, cancel
+    for mod in warm:
+        __import__(mod)
+
+
+def instance_key(instance):
+    return hashlib.sha256(json.dumps(instance, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def _instance(kind, instance, parse):
+    key = (kind, instance_key(instance))
+    if key in _DATA:
+        _DATA.move_to_end(key)
+        return _DATA[key]
+    data = parse(instance)
+    _DATA[key] = data
+    while len(_DATA) > _DATA_SLOTS:
+        _DATA.popitem(last=False)
+    return data
+
+
+class JobMonitor:
+    """Solver callback: publishes improved incumbents and stops on cancel or deadline."""
+
+    def __init__(self, job, encode):
+        self.job_id = job["id"]
+        self.deadline = job.get("deadline") or 0.0
+        self.encode = encode
+        self.t0 = time.perf_counter()
+        self.best = float("inf")
+        self.pending = None
+        self.last_pub = self.last_poll = 0.0
+        self.iterations = 0
+        self.stop = ""
+
+    def flush(self):
+        if self.pending is not None:
+            _STATE["progress"][self.job_id] = self.pending
+            self.pending = None
+
+    def __call__(self, it, cost, sol):
+        self.iterations = it
+        now = time.perf_counter()
+        if cost < self.best:
+            self.best = cost
+            self.pending = {"cost": float(cost), "routes": self.encode(sol), "iteration": it,
+                            "elapsed_s": round(now - self.t0, 4)}
+        if now - self.last_pub >= PUBLISH_EVERY:
+            self.last_pub = now
+            self.flush()
+        if self.deadline and time.time() >= self.deadline:
+            self.stop = "deadline"
+        elif now - self.last_poll >= POLL_EVERY:
+            self.last_poll = now
+            if _STATE["cancel"].get(self.job_id):
+                self.stop = "cancelled"
+        return bool(self.stop)
+
+    def result(self, cost, sol):
+        self.flush()
+        return {"cost": float(cost), "routes": self.encode(sol), "iterations": self.iterations,
+                "runtime_s": round(time.perf_counter() - self.t0, 4), "stop": self.stop or "completed"}
+
+
+def _medical_routes(sol):
+    return {str(v.vehicle_id): [h.hospital_id for h in v.route] for v in sol.vehicles}
+
+
+def _medical_parse(obj):
+    return obj["distances"], obj["hospitals"], obj["vehicles"], obj["penalties"]
+
+
+def run_medical(job):
+    from heuristics.common import Hospital, Vehicle
+    D, Hrec, Vrec, P = _instance("medical", job["instance"], _medical_parse)
+    hospitals = [Hospital(**r) for r in Hrec]
+    vehicles = [Vehicle(**r) for r in Vrec]
+    params, seed = dict(job.get("params") or {}), job.get("seed")
+    if seed is not None:
+        random.seed(seed)
+    mon = JobMonitor(job, _medical_routes)
+    if _STATE["cancel"].get(job["id"]):
+        return {"cost": None, "routes": None, "iterations": 0, "runtime_s": 0.0, "stop": "cancelled"}
+
+    solver = job["solver"]
+    if solver == "sa":
+        from heuristics.sa import SimulatedAnnealing
+        best, cost = SimulatedAnnealing(distances=D, penalties=P, **dict(SA_DEFAULTS, **params)).run(
+            vehicles, hospitals, verbose_every=0, callback=mon)
+    elif solver == "pso":
+        from heuristics.pso.pso import PSO
+        best, cost = PSO(D, P, seed=seed, **params).run(vehicles, hospitals, verbose_every=0, callback=mon)
+    elif solver == "alns":
+        from heuristics.alns import ALNS
+        best, cost = ALNS(D, P, seed=seed, **params).run(vehicles, hospitals, verbose_every=0, callback=mon)
+    else:
+        raise ValueError(f"Unknown medical solver: {solver}")
+    return mon.result(cost, best)
+
+
+def _smt_parse(obj):
+    from utils.io import load_from_dict
+    return load_from_dict(obj)
+
+
+def run_smt(job):
+    """Trampoline into the SMT project (its root is first on sys.path in this worker)."""
+    data = _instance("smt", job["instance"], _smt_parse)
+    params = dict(job.get("params") or {})
+    mon = JobMonitor(job, list)
+    if _STATE["cancel"].get(job["id"]):
+        return {"cost": None, "routes": None, "iterations": 0, "runtime_s": 0.0, "stop": "cancelled"}
+
+    solver = job["solver"]
+    if solver == "ga":
+        from heuristics.ga.ga_smt import run_ga as run
+    elif solver == "aco":
+        from heuristics.aco.aco import run_aco as run
+    else:
+        raise ValueError(f"Unknown SMT solver: {solver}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        route, dist = run(None, seed=job.get("seed"), no_plot=True, data=data, callback=mon, **params)
+    return mon.result(dist, route)
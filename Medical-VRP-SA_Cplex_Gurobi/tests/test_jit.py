@@ -0,0 +1,114 @@
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from heuristics import jit
+from heuristics.common import Hospital, Vehicle, Solution
+
+PENALTIES = {"early": 2.0, "late": 5.0}
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    yield
+    jit._state.update(backend=None, kernel=None, arcs=None)
+    jit.clear_cache()
+
+
+def make_instance(n=40, seed=0):
+    rng = random.Random(seed)
+    xy = [(rng.uniform(0, 50), rng.uniform(0, 50)) for _ in range(n + 1)]
+    D = [[((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5 for b in xy] for a in xy]
+    hospitals = [Hospital(i, rng.randint(1, 20), rng.uniform(0.5, 4.0), rng.uniform(8, 10), rng.uniform(10, 13),
+                          beta=rng.uniform(0.5, 2.0), mu=rng.randint(1, 3)) for i in range(1, n + 1)]
+    fleet = [dict(vehicle_id=k, weight_capacity=10 ** 6, volume_capacity=10 ** 6, distance_capacity=10 ** 6,
+                  speed=rng.choice([30, 40.0, 55]), fixed_cost=rng.choice([100, 150.5]),
+                  time_cost_coeff=rng.uniform(5, 20), distance_cost_coeff=rng.uniform(0.5, 3)) for k in range(1, 7)]
+    return D, hospitals, fleet
+
+
+def random_solutions(D, hospitals, fleet, count=50, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        vs = [Vehicle(**f) for f in fleet]
+        rng.shuffle(vs)
+        for h in hospitals:
+            rng.choice(vs).add_hospital(h)
+        for v in vs:
+            rng.shuffle(v.route)
+        vs[0].route = []                                      # empty routes cost nothing
+        out.append(Solution(vs, hospitals, D))
+    return out
+
+
+def python_cost(sol, use_ld):
+    return sum(v.vehicle_cost(sol.distances, PENALTIES, use_ld, 6.0) for v in sol.vehicles)
+
+
+@pytest.mark.parametrize("use_ld", [False, True])
+@pytest.mark.parametrize("as_array", [False, True])
+def test_kernel_source_matches_python(use_ld, as_array):
+    D, hospitals, fleet = make_instance()
+    if as_array:
+        D = np.asarray(D, dtype=np.float64)
+    for sol in random_solutions(D, hospitals, fleet):
+        args = jit.kernel_args(sol, PENALTIES, use_ld, 6.0)
+        assert args is not None
+        assert jit._solution_cost(*args) == python_cost(sol, use_ld)
+
+
+def test_fallback_without_numba(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)          # import numba -> ImportError
+    assert jit.set_backend("auto") == "python"
+    with pytest.raises(ImportError):
+        jit.set_backend("numba")
+    assert jit.backend() == "python"
+    D, hospitals, fleet = make_instance()
+    for sol in random_solutions(D, hospitals, fleet, count=10):
+        assert sol.total_cost(PENALTIES, True) == python_cost(sol, True)
+
+
+def test_env_disables_jit(monkeypatch):
+    monkeypatch.setenv("VRP_JIT", "0")
+    assert jit.set_backend("auto") == "python"
+
+
+def test_unsupported_inputs_use_python_path():
+    D, hospitals, fleet = make_instance()
+    sol = random_solutions(np.asarray(D, dtype=np.float32), hospitals, fleet, count=1)[0]
+    assert jit.kernel_args(sol, PENALTIES) is None
+    small = make_instance(n=jit.MIN_HOSPITALS - 1)
+    assert jit.kernel_args(random_solutions(*small, count=1)[0], PENALTIES) is None
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_edits_to_distances_and_fleet_are_seen(as_array):
+    D, hospitals, fleet = make_instance()
+    if as_array:
+        D = np.asarray(D, dtype=np.float64)
+    sols = random_solutions(D, hospitals, fleet, count=5)
+    for sol in sols:
+        jit.kernel_args(sol, PENALTIES)                        # warm the cache
+    for i in range(len(D)):                                    # traffic update, in place
+        for j in range(len(D)):
+            D[i][j] *= 1.5 if (i + j) % 3 else 0.5
+    for sol in sols:
+        for v in sol.vehicles:                                 # same ids, different fleet
+            v.speed, v.fixed_cost = v.speed * 2, v.fixed_cost + 1
+        assert jit._solution_cost(*jit.kernel_args(sol, PENALTIES, True, 6.0)) == python_cost(sol, True)
+
+
+@pytest.mark.parametrize("use_ld", [False, True])
+@pytest.mark.parametrize("as_array", [False, True])
+def test_numba_matches_python(use_ld, as_array):
+    pytest.importorskip("numba")
+    assert jit.set_backend("numba") == "numba"
+    D, hospitals, fleet = make_instance(n=80, seed=3)
+    if as_array:
+        D = np.asarray(D, dtype=np.float64)
+    for sol in random_solutions(D, hospitals, fleet, seed=4):
+        assert jit.solution_cost(sol, PENALTIES, use_ld, 6.0) == python_cost(sol, use_ld)
+        assert sol.total_cost(PENALTIES, use_ld) == python_cost(sol, use_ld)
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from heuristics.common import Hospital, Vehicle, Solution
+from heuristics.kernels import CostKernel
+from heuristics.pso.pso import PSO, _feasibility_penalty
+
+PENALTIES = {"early": 2.0, "late": 5.0}
+
+
+def make_instance(n=30, seed=0):
+    rng = random.Random(seed)
+    xy = [(rng.uniform(0, 50), rng.uniform(0, 50)) for _ in range(n + 1)]
+    D = [[((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5 for b in xy] for a in xy]
+    hospitals = [Hospital(i, rng.randint(1, 20), rng.uniform(0.5, 4.0), rng.uniform(8, 10), rng.uniform(10, 13),
+                          beta=rng.uniform(0.5, 2.0), mu=rng.randint(1, 3)) for i in range(1, n + 1)]
+    vehicles = [Vehicle(vehicle_id=k, weight_capacity=200, volume_capacity=200, distance_capacity=400,
+                        speed=rng.choice([30, 40.0, 55]), fixed_cost=rng.choice([100, 150.5]),
+                        time_cost_coeff=rng.uniform(5, 20), distance_cost_coeff=rng.uniform(0.5, 3))
+                for k in range(1, 7)]
+    return D, hospitals, vehicles
+
+
+@pytest.mark.parametrize("use_ld", [False, True])
+def test_solution_costs_match_total_cost(use_ld):
+    D, hospitals, vehicles = make_instance()
+    rng = random.Random(1)
+    sols = []
+    for _ in range(20):
+        vs = Solution(vehicles, hospitals, D).deepcopy().vehicles
+        for h in hospitals:
+            rng.choice(vs[1:]).add_hospital(h)                  # vs[0] stays empty
+        sols.append(Solution(vs, hospitals, D))
+    kern = CostKernel(D, hospitals, vehicles, PENALTIES, use_load_distance_cost=use_ld)
+    assert kern.solution_costs(sols).tolist() == [s.total_cost(PENALTIES, use_load_distance_cost=use_ld)
+                                                  for s in sols]
+
+
+@pytest.mark.parametrize("use_ld", [False, True])
+@pytest.mark.parametrize("cache", [0, 4096])
+def test_pso_batch_scoring_costs_match_solutions(use_ld, cache):
+    D, hospitals, vehicles = make_instance()
+    pso = PSO(D, PENALTIES, seed=3, swarm_size=12, max_iters=30, batch_scoring=True,
+              use_load_distance_cost=use_ld, decode_cache_size=cache)
+    sol, cost = pso.run(vehicles, hospitals, verbose_every=0)
+    assert pso._kernel is not None
+    assert cost == sol.total_cost(PENALTIES, use_load_distance_cost=use_ld) + _feasibility_penalty(sol.vehicles, D)
+    assert pso.history == sorted(pso.history, reverse=True)
@@ -1,7 +1,8 @@
 from .io import load_from_excel, load_from_json
+from .cache import load_cached
 from .plot import plot_history, print_solution, format_routes
 
 __all__ = [
-    "load_from_excel", "load_from_json",
+    "load_from_excel", "load_from_json", "load_cached",
     "plot_history", "print_solution", "format_routes",
 ]
@@ -0,0 +1,106 @@
+"""
+Compiled instance cache for the Excel/JSON loaders.
+- First load parses the source and writes <cache_dir>/<stem>-<path hash>-<loader>-<digest>.npy
+  (distances, float64) plus a .json sidecar with hospitals/vehicles/penalties records.
+- Later loads memory-map the .npy; the key is a SHA-256 of the source bytes, so any edit of the
+  source invalidates the entry. On write, stale entries of the same source path are removed (the
+  path hash keeps same-named files from other directories apart in a shared cache dir); an entry
+  removed while another process was reading it is treated as a miss.
+- Cache dir: argument, else $VRP_CACHE_DIR, else <source dir>/.cache
+"""
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+CACHE_VERSION = 1
+
+
+def file_digest(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256(b"vrp-cache-v%d:" % CACHE_VERSION)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def default_cache_dir(path: str) -> Path:
+    env = os.environ.get("VRP_CACHE_DIR")
+    return Path(env) if env else Path(path).resolve().parent / ".cache"
+
+
+def _default_loader(path: str):
+    from .io import load_from_excel, load_from_json
+    suffix = Path(path).suffix.lower()
+    if suffix in (".xlsx", ".xls"):
+        return load_from_excel
+    if suffix == ".json":
+        return load_from_json
+    raise ValueError(f"No loader for '{suffix}' files")
+
+
+def _json_default(o):
+    if hasattr(o, "item"):
+        return o.item()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _atomic_write(dst: Path, write):
+    fd, tmp = tempfile.mkstemp(dir=str(dst.parent), prefix=dst.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, str(dst))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _source_id(path: str) -> str:
+    return hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:8]
+
+
+def _read(npy: Path, meta: Path):
+    try:
+        D = np.load(str(npy), mmap_mode="r")
+        with open(meta, "r", encoding="utf-8") as f:
+            return D, json.load(f)
+    except FileNotFoundError:
+        return None, None
+
+
+def load_cached(path: str, loader=None, *, cache_dir=None, as_list: bool = False):
+    """Same return shape as the loaders: (D, hospitals, vehicles, penalties).
+
+    D is the read-only memory-mapped float64 array; as_list=True converts it to a list of lists
+    (faster scalar indexing for the pure-Python heuristics, at the cost of reading the whole matrix).
+    """
+    loader = loader or _default_loader(path)
+    cdir = Path(cache_dir) if cache_dir else default_cache_dir(path)
+    stem = f"{Path(path).stem}-{_source_id(path)}-{getattr(loader, '__name__', 'loader')}"
+    key = f"{stem}-{file_digest(path)[:24]}"
+    npy, meta = cdir / f"{key}.npy", cdir / f"{key}.json"
+
+    D, obj = _read(npy, meta)
+    if D is None:
+        D, hospitals, vehicles, penalties = loader(path)
+        D = np.ascontiguousarray(D, dtype=np.float64)
+        obj = {"hospitals": hospitals, "vehicles": vehicles, "penalties": penalties}
+        cdir.mkdir(parents=True, exist_ok=True)
+        for old in cdir.glob(f"{stem}-*"):
+            if old.suffix in (".npy", ".json") and old.stem != key:
+                try:
+                    old.unlink()
+                except OSError:                     # already gone, or still mapped (Windows)
+                    pass
+        _atomic_write(npy, lambda f: np.save(f, D))
+        _atomic_write(meta, lambda f: f.write(json.dumps(obj, default=_json_default).encode("utf-8")))
+        obj = json.loads(json.dumps(obj, default=_json_default))
+
+    if as_list:
+        D = np.asarray(D).tolist()
+    return D, obj["hospitals"], obj["vehicles"], obj["penalties"]
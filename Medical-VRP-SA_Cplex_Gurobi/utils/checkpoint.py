@@ -0,0 +1,64 @@
+"""
+Checkpoint files for the long-running heuristics (SA, PSO).
+- JSON, written to a temp file in the target directory and moved into place with os.replace,
+  so a job killed mid-write leaves the previous checkpoint intact.
+- Solutions are stored as route arrays in vehicle order: [[vehicle_id, [hospital_id, ...]], ...].
+- random.getstate() is stored with the search state; floats round-trip exactly through json,
+  so a resumed run continues the same trajectory as an uninterrupted one.
+"""
+from pathlib import Path
+import copy
+import json
+import os
+import random
+import tempfile
+from typing import Dict, List
+
+CHECKPOINT_VERSION = 1
+
+
+def rng_state() -> list:
+    version, internal, gauss = random.getstate()
+    return [version, list(internal), gauss]
+
+
+def set_rng_state(obj: list) -> None:
+    random.setstate((obj[0], tuple(obj[1]), obj[2]))
+
+
+def encode_routes(vehicles) -> list:
+    return [[v.vehicle_id, [h.hospital_id for h in v.route]] for v in vehicles]
+
+
+def decode_routes(rows: list, vehicles, hospitals) -> List:
+    """Fresh vehicle copies (saved order) whose routes reference the given hospital objects."""
+    by_vid = {v.vehicle_id: v for v in vehicles}
+    by_hid: Dict[int, object] = {h.hospital_id: h for h in hospitals}
+    out = []
+    for vid, route in rows:
+        nv = copy.copy(by_vid[vid])
+        nv.route = [by_hid[hid] for hid in route]
+        out.append(nv)
+    return out
+
+
+def save_checkpoint(path: str, kind: str, state: dict) -> None:
+    dst = Path(path)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(dst.parent), prefix=dst.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CHECKPOINT_VERSION, "kind": kind, "state": state}, f)
+        os.replace(tmp, str(dst))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_checkpoint(path: str, kind: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    if obj.get("version") != CHECKPOINT_VERSION or obj.get("kind") != kind:
+        raise ValueError(f"{path} is not a {kind} checkpoint (version {CHECKPOINT_VERSION})")
+    return obj["state"]
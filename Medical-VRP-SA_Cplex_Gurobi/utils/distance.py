@@ -0,0 +1,178 @@
+"""
+Distance-matrix builder for instances given by coordinates instead of a precomputed `distances`.
+- haversine_matrix / euclidean_matrix: vectorised N x N from node coordinates (node 0 = depot).
+- road_matrix: many-to-many shortest paths on a road graph (scipy.sparse.csgraph.dijkstra from the
+  site nodes only). Graph file: CSV/txt edge list 'u,v,length' or JSON {"edges": [[u, v, w], ...],
+  "nodes": {id: [x, y]}, "directed": false}; sites map to graph nodes explicitly or by nearest node.
+- build_distances: float32 matrix, cached as <cache_dir>/dist-<digest>.npy keyed by a SHA-256 of
+  the coordinates, metric, options and the graph file bytes.
+- Cache dir: argument, else $VRP_CACHE_DIR, else <source dir>/.cache (cwd when there is no source)
+"""
+from pathlib import Path
+import hashlib
+import json
+import os
+
+import numpy as np
+
+DISTANCE_VERSION = 1
+EARTH_RADIUS_KM = 6371.0088
+METRICS = ("haversine", "euclidean", "road")
+
+
+def haversine_matrix(coords, radius: float = EARTH_RADIUS_KM) -> np.ndarray:
+    """coords: (N, 2) [lat, lon] in degrees -> (N, N) great-circle distances (float32, km)."""
+    c = np.radians(np.asarray(coords, dtype=np.float64))
+    lat, lon = c[:, 0], c[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return (2 * radius * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).astype(np.float32)
+
+
+def euclidean_matrix(coords) -> np.ndarray:
+    """coords: (N, 2) planar [x, y] -> (N, N) Euclidean distances (float32)."""
+    c = np.asarray(coords, dtype=np.float64)
+    sq = (c * c).sum(axis=1)
+    d2 = np.maximum(sq[:, None] + sq[None, :] - 2.0 * c @ c.T, 0.0)
+    np.fill_diagonal(d2, 0.0)
+    return np.sqrt(d2).astype(np.float32)
+
+
+def load_road_graph(path: str):
+    """-> (csr adjacency, {node id: index}, node coordinates (M, 2) or None)."""
+    from scipy.sparse import csr_matrix
+
+    p = Path(path)
+    coords, directed = None, False
+    if p.suffix.lower() == ".json":
+        obj = json.load(open(p, "r", encoding="utf-8"))
+        edges = obj["edges"]
+        directed = bool(obj.get("directed", False))
+        nodes = obj.get("nodes")
+    else:
+        edges, nodes = [], None
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                body = line.split("#", 1)[0].strip()
+                if not body:
+                    continue
+                u, v, w = (t.strip() for t in body.split(",")[:3])
+                try:
+                    edges.append((u, v, float(w)))
+                except ValueError:
+                    continue                                  # header row
+    ids = {}
+    if nodes:
+        for k in nodes:
+            ids.setdefault(str(k), len(ids))
+    for u, v, _ in edges:
+        ids.setdefault(str(u), len(ids))
+        ids.setdefault(str(v), len(ids))
+    if nodes:
+        coords = np.full((len(ids), 2), np.nan)
+        for k, xy in nodes.items():
+            coords[ids[str(k)]] = xy
+    e = np.asarray([(ids[str(u)], ids[str(v)], float(w)) for u, v, w in edges], dtype=np.float64).reshape(-1, 3)
+    n = len(ids)
+    rows, cols, w = e[:, 0].astype(np.int64), e[:, 1].astype(np.int64), e[:, 2]
+    if not directed:
+        rows, cols, w = np.concatenate([rows, cols]), np.concatenate([cols, rows]), np.concatenate([w, w])
+    order = np.lexsort((w, cols, rows))                       # parallel edges: keep the shortest
+    rows, cols, w = rows[order], cols[order], w[order]
+    first = np.ones(len(w), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    return csr_matrix((w[first], (rows[first], cols[first])), shape=(n, n)), ids, coords
+
+
+def road_matrix(graph_path: str, *, nodes=None, coords=None) -> np.ndarray:
+    """Shortest-path distances between sites on a road graph (float32).
+    nodes: graph node id per site; else coords are snapped to the nearest graph node
+    (the graph must then carry node coordinates)."""
+    from scipy.sparse.csgraph import dijkstra
+
+    G, ids, gxy = load_road_graph(graph_path)
+    if nodes is not None:
+        try:
+            idx = np.asarray([ids[str(k)] for k in nodes], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"site node {e.args[0]} is not in the road graph {graph_path}")
+    elif coords is not None and gxy is not None:
+        c = np.asarray(coords, dtype=np.float64)
+        ok = ~np.isnan(gxy).any(axis=1)
+        cand = np.flatnonzero(ok)
+        d2 = ((c[:, None, :] - gxy[None, ok, :]) ** 2).sum(axis=2)
+        idx = cand[d2.argmin(axis=1)]
+    else:
+        raise ValueError("road metric needs site 'nodes' or a graph with node coordinates")
+    uniq, inv = np.unique(idx, return_inverse=True)
+    R = dijkstra(G, directed=True, indices=uniq)[:, uniq]
+    D = R[np.ix_(inv, inv)]
+    if not np.isfinite(D).all():
+        i, j = np.argwhere(~np.isfinite(D))[0]
+        raise ValueError(f"road graph {graph_path}: site {j} is unreachable from site {i}")
+    return D.astype(np.float32)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def distance_digest(coords, metric: str, *, graph=None, nodes=None, scale: float = 1.0) -> str:
+    h = hashlib.sha256(b"vrp-distance-v%d:" % DISTANCE_VERSION)
+    c = np.ascontiguousarray(coords, dtype=np.float64) if coords is not None else np.empty((0, 2))
+    h.update(repr(c.shape).encode())
+    h.update(c.tobytes())
+    opts = {"metric": metric, "scale": float(scale),
+            "nodes": [str(k) for k in nodes] if nodes is not None else None,
+            "graph": _file_digest(graph) if graph else None}
+    h.update(json.dumps(opts, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_distances(coords=None, *, metric: str = "haversine", graph: str = "", nodes=None,
+                    scale: float = 1.0, cache_dir=None, source: str = "", use_cache: bool = True) -> np.ndarray:
+    """(N, N) float32 distance matrix, node 0 = depot. scale multiplies the result (e.g. km -> the
+    instance's distance unit). Reads/writes the on-disk cache unless use_cache=False."""
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    if metric == "road" and not graph:
+        raise ValueError("road metric needs a graph file")
+    if metric != "road" and coords is None:
+        raise ValueError(f"{metric} metric needs coordinates")
+    npy = None
+    if use_cache:
+        env = os.environ.get("VRP_CACHE_DIR")
+        cdir = Path(cache_dir) if cache_dir else (
+            Path(env) if env else (Path(source).resolve().parent if source else Path.cwd()) / ".cache")
+        npy = cdir / f"dist-{distance_digest(coords, metric, graph=graph, nodes=nodes, scale=scale)[:24]}.npy"
+        if npy.exists():
+            return np.load(str(npy))
+    if metric == "haversine":
+        D = haversine_matrix(coords)
+    elif metric == "euclidean":
+        D = euclidean_matrix(coords)
+    else:
+        D = road_matrix(graph, nodes=nodes, coords=coords)
+    if scale != 1.0:
+        D = (D * np.float32(scale)).astype(np.float32)
+    if npy is not None:
+        from .cache import _atomic_write
+        npy.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(npy, lambda f: np.save(f, D))
+    return D
+
+
+def distances_from_spec(coords, spec: dict, *, source: str = "") -> np.ndarray:
+    """Instance-file form: coords plus {"metric", "graph", "nodes", "scale"}; a relative graph
+    path is resolved against the source file's directory."""
+    spec = dict(spec or {})
+    graph = spec.get("graph") or ""
+    if graph and source and not Path(graph).is_absolute():
+        graph = str(Path(source).resolve().parent / graph)
+    return build_distances(coords, metric=spec.get("metric", "haversine"), graph=graph,
+                           nodes=spec.get("nodes"), scale=float(spec.get("scale", 1.0)), source=source)
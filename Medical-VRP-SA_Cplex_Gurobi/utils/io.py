@@ -1,11 +1,23 @@
 from pathlib import Path
 import json
-import pandas as pd
 
 
 def load_from_excel(path: str):
+    import pandas as pd
     xls = pd.ExcelFile(path)
-    D = pd.read_excel(xls, "distances").drop(columns=["node"], errors="ignore").values.tolist()
+    if "distances" in xls.sheet_names:
+        D = pd.read_excel(xls, "distances").drop(columns=["node"], errors="ignore").values.tolist()
+    else:
+        from .distance import distances_from_spec
+        Cdf = pd.read_excel(xls, "coordinates").sort_values("node")
+        spec = ({str(r["key"]): r["value"] for _, r in pd.read_excel(xls, "distance").iterrows()}
+                if "distance" in xls.sheet_names else {})
+        if "graph_node" in Cdf.columns:
+            spec["nodes"] = Cdf["graph_node"].tolist()
+        cols = ["lat", "lon"] if "lat" in Cdf.columns else ["x", "y"]
+        if cols[0] == "x":
+            spec.setdefault("metric", "euclidean")
+        D = distances_from_spec(Cdf[cols].values, spec, source=path)
     Hdf = pd.read_excel(xls, "hospitals")
     Vdf = pd.read_excel(xls, "vehicles")
     Pdf = pd.read_excel(xls, "penalties")
@@ -16,5 +28,86 @@ def load_from_excel(path: str):
 
 
 def load_from_json(path: str):
+    """`distances` (N x N), or `coordinates` ([lat, lon] / [x, y] per node, 0 = depot) plus an optional
+    `distance` spec {"metric": "haversine"|"euclidean"|"road", "graph", "nodes", "scale"}; the
+    built matrix is a float32 array cached by input hash (utils.distance)."""
     obj = json.load(open(path, "r", encoding="utf-8"))
-    return obj["distances"], obj["hospitals"], obj["vehicles"], obj["penalties"]
+    if "distances" in obj:
+        D = obj["distances"]
+    else:
+        from .distance import distances_from_spec
+        D = distances_from_spec(obj.get("coordinates"), obj.get("distance", {}), source=path)
+    return D, obj["hospitals"], obj["vehicles"], obj["penalties"]
+
+
+_TXT_COLUMNS = {
+    "hospitals": ("hospital_id", "demand_weight", "demand_volume", "earliest_time", "latest_time",
+                  "beta", "mu"),
+    "vehicles": ("vehicle_id", "weight_capacity", "volume_capacity", "distance_capacity", "speed",
+                 "fixed_cost", "time_cost_coeff", "distance_cost_coeff"),
+}
+
+
+def _txt_value(tok: str):
+    tok = tok.strip()
+    for cast in (int, float):
+        try:
+            return cast(tok)
+        except ValueError:
+            pass
+    return tok
+
+
+def load_from_txt(path: str, *, dtype="float64", mmap_path: str = ""):
+    """Stream the INI-like txt format line by line.
+
+    Sections: [penalties] key=value, [distances] rows 'N<i>: d0,d1,...', [hospitals] and
+    [vehicles] CSV rows (column names from the header comment, else the Excel column order).
+    The matrix is preallocated from the first row's width and every row is parsed straight
+    into it; pass dtype="float32" to halve memory, mmap_path to back it by an .npy memmap.
+    """
+    import numpy as np
+
+    D, seen, section = None, None, None
+    penalties, columns = {}, dict(_TXT_COLUMNS)
+    records = {"hospitals": [], "vehicles": []}
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            body, _, comment = line.partition("#")
+            body = body.strip()
+            if not body:
+                continue
+            if body[0] == "[":
+                section = body[1:body.index("]")].strip().lower()
+                if section in columns and "," in comment:
+                    columns[section] = tuple(c.strip() for c in comment.split(","))
+                continue
+            if section == "distances":
+                label, _, payload = body.partition(":")
+                i = int(label.strip().lstrip("Nn"))
+                if D is None:
+                    n = payload.count(",") + 1
+                    D = (np.lib.format.open_memmap(mmap_path, mode="w+", dtype=dtype, shape=(n, n))
+                         if mmap_path else np.empty((n, n), dtype=dtype))
+                    seen = np.zeros(n, dtype=bool)
+                row = np.fromstring(payload, dtype=dtype, sep=",")
+                if row.shape[0] != D.shape[1] or not 0 <= i < D.shape[0]:
+                    raise ValueError(f"{path}:{lineno}: bad distance row N{i}")
+                if seen[i]:
+                    raise ValueError(f"{path}:{lineno}: duplicate distance row N{i}")
+                D[i] = row
+                seen[i] = True
+            elif section == "penalties":
+                k, _, v = body.partition("=")
+                penalties[k.strip()] = float(v)
+            elif section in records:
+                records[section].append(dict(zip(columns[section], map(_txt_value, body.split(",")))))
+
+    if D is None:
+        raise ValueError(f"{path}: [distances] must hold a full square matrix")
+    if not seen.all():
+        missing = ", ".join(f"N{i}" for i in np.flatnonzero(~seen)[:5])
+        raise ValueError(f"{path}: [distances] must hold a full square matrix, missing rows {missing}")
+    if mmap_path:
+        D.flush()
+    return D, records["hospitals"], records["vehicles"], penalties
@@ -1,6 +1,5 @@
-import matplotlib.pyplot as plt
-
 def plot_history(history, title="Best Cost"):
+    import matplotlib.pyplot as plt
     plt.figure()
     plt.plot(history)
     plt.title(title)
@@ -0,0 +1,153 @@
+"""
+On-disk cache of solver results keyed by instance, solver, parameters and seed.
+- SQLite file in WAL mode with a busy timeout, so several processes (batch workers, service
+  workers, parallel scripts) can read and write it at once; writes are short IMMEDIATE transactions.
+- Key: SHA-256 of the instance (distances as float64 bytes plus a canonical JSON of the hospital,
+  vehicle and penalty records, numbers normalised to float) combined with solver name, params, seed.
+- Bounded by entry count and payload bytes; the least recently used rows are evicted first.
+- File: argument, else $VRP_RESULT_CACHE, else <source dir>/.cache/results.sqlite
+- Only runs that stopped for a reason in CACHEABLE_STOPS are stored: a run cut short by a time limit,
+  a callback or a background bound depends on machine load, not only on the key.
+"""
+from pathlib import Path
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+import numpy as np
+
+RESULTS_VERSION = 1
+CACHEABLE_STOPS = ("max_iters", "min_temp", "patience")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key      TEXT PRIMARY KEY,
+    solver   TEXT NOT NULL,
+    cost     REAL NOT NULL,
+    payload  TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    used     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used ON results(used);
+"""
+
+
+def _canon(o):
+    """JSON-ready copy with every number as float, so 1 and 1.0 (or np.int64) hash alike."""
+    if isinstance(o, dict):
+        return {str(k): _canon(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_canon(v) for v in o]
+    if hasattr(o, "item") and not isinstance(o, (str, bytes)):
+        o = o.item()
+    if isinstance(o, bool) or o is None or isinstance(o, str):
+        return o
+    if isinstance(o, (int, float)):
+        return float(o)
+    return str(o)
+
+
+def _dumps(o) -> str:
+    return json.dumps(_canon(o), sort_keys=True, separators=(",", ":"))
+
+
+def instance_digest(D, hospitals, vehicles, penalties) -> str:
+    """Hash of the loader output (D, hospital records, vehicle records, penalties)."""
+    A = np.ascontiguousarray(D, dtype=np.float64)
+    h = hashlib.sha256(b"vrp-instance-v%d:" % RESULTS_VERSION)
+    h.update(repr(A.shape).encode())
+    h.update(A.tobytes())
+    h.update(_dumps([hospitals, vehicles, penalties]).encode("utf-8"))
+    return h.hexdigest()
+
+
+def result_key(instance: str, solver: str, params: dict, seed) -> str:
+    blob = _dumps({"instance": instance, "solver": solver, "params": params, "seed": seed})
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def default_result_path(source: str = "") -> Path:
+    env = os.environ.get("VRP_RESULT_CACHE")
+    if env:
+        return Path(env)
+    base = Path(source).resolve().parent if source else Path.cwd()
+    return base / ".cache" / "results.sqlite"
+
+
+class ResultCache:
+    """get(key) -> {"cost", "routes", "meta"} or None; put(key, solver, cost, routes, meta)."""
+
+    def __init__(self, path, *, max_entries: int = 10000, max_bytes: int = 256 << 20,
+                 timeout: float = 30.0):
+        self.path = str(path)
+        self.max_entries, self.max_bytes = int(max_entries), int(max_bytes)
+        self.hits = self.misses = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self.conn.execute("SELECT cost, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        payload = json.loads(row[1])
+        return {"cost": row[0], "routes": payload["routes"], "meta": payload.get("meta", {})}
+
+    def put(self, key: str, solver: str, cost: float, routes, meta: Optional[dict] = None) -> bool:
+        """Store one result and evict LRU rows past the bounds; False if it alone exceeds max_bytes."""
+        payload = json.dumps({"routes": routes, "meta": meta or {}}, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        now = time.time()
+        with self._write():
+            self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (key, solver, float(cost), payload, size, now, now))
+            count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            victims = []
+            if count > self.max_entries or total > self.max_bytes:
+                for k, s in self.conn.execute("SELECT key, size FROM results WHERE key != ? ORDER BY used",
+                                              (key,)):
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    victims.append((k,))
+                    count, total = count - 1, total - s
+            self.conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        return True
+
+    def stats(self) -> dict:
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._write():
+            self.conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextlib.contextmanager
+    def _write(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
@@ -8,7 +8,7 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from utils.io import load_data
-from utils.plot import plot_route, plot_bb_progress
+from utils.cache import load_cached
 
 def euclid(a, b): return float(hypot(a[0] - b[0], a[1] - b[1]))
 
@@ -22,11 +22,13 @@ def build_distance(N, points, feeders, nf_map, origin):
             Df[(i, f)] = euclid(points[i], (fx, fy))
     return D0, Df
 
-def build_model(N, nf_map, D0, Df):
+def build_model(N, nf_map, D0, Df, subtour="mtz"):
     mdl = Model(name="SMT_MIP_docplex")
     X = {(i, j): mdl.binary_var(name="x_%d_%d" % (i, j))
          for i in range(0, N + 1) for j in range(0, N + 1)}
-    U = {i: mdl.integer_var(lb=1, ub=N, name="u_%d" % i) for i in range(1, N + 1)}
+    U = {}
+    if subtour == "mtz":
+        U = {i: mdl.integer_var(lb=1, ub=N, name="u_%d" % i) for i in range(1, N + 1)}
 
     for i in range(0, N + 1):
         mdl.add_constraint(X[(i, i)] == 0, ctname="self_%d" % i)
@@ -35,8 +37,8 @@ def build_model(N, nf_map, D0, Df):
     for j in range(0, N + 1):
         mdl.add_constraint(mdl.sum(X[(i, j)] for i in range(0, N + 1)) == 1, ctname="in_%d" % j)
 
-    for i in range(1, N + 1):
-        for j in range(1, N + 1):
+    for i in U:
+        for j in U:
             if i == j: continue
             mdl.add_constraint(U[i] - U[j] + N * X[(i, j)] <= N - 1, ctname="mtz_%d_%d" % (i, j))
 
@@ -68,6 +70,55 @@ def extract_route(arcs, N):
         route.append(j); seen.add(j); cur = j
     return route
 
+def find_subtours(arcs):
+    nxt = {i: j for i, j in arcs}
+    cycles, seen = [], set()
+    for start in nxt:
+        if start in seen: continue
+        cyc, cur = [], start
+        while cur not in seen and cur in nxt:
+            seen.add(cur); cyc.append(cur); cur = nxt[cur]
+        if cyc: cycles.append(cyc)
+    return cycles if len(cycles) > 1 else []
+
+def _dfj_arcs(S):
+    return [(i, j) for i in S for j in S if i != j]
+
+def solve_dfj_loop(mdl, X, max_rounds=1000, log_output=False):
+    stats = {"rounds": 0, "cuts": 0}
+    while True:
+        res = solve_and_extract(mdl, X, log_output=log_output)
+        subtours = find_subtours(res["arcs"])
+        if not subtours or stats["rounds"] >= max_rounds:
+            # subtour_free=False: stopped at max_rounds, res["arcs"] is not a valid tour
+            res.update(stats, subtour_free=not subtours, subtours=subtours); return res
+        stats["rounds"] += 1
+        for S in subtours:
+            mdl.add_constraint(mdl.sum(X[a] for a in _dfj_arcs(S)) <= len(S) - 1,
+                               ctname="dfj_%d_%d" % (stats["rounds"], stats["cuts"]))
+            stats["cuts"] += 1
+
+def attach_lazy_dfj(mdl, X):
+    import cplex
+    stats = {"rounds": 0, "cuts": 0}
+    cpx = mdl.cplex if hasattr(mdl, "cplex") else mdl.get_engine().get_cplex()
+    keys = list(X.keys()); idx = {a: X[a].index for a in keys}
+    cpx.parameters.preprocessing.reduce.set(1)
+
+    class LazyDFJ(cplex.callbacks.LazyConstraintCallback):
+        def __call__(self):
+            vals = self.get_values([idx[a] for a in keys])
+            subtours = find_subtours([a for a, v in zip(keys, vals) if v > 0.5])
+            if not subtours: return
+            stats["rounds"] += 1
+            for S in subtours:
+                ind = [idx[a] for a in _dfj_arcs(S)]
+                self.add(constraint=cplex.SparsePair(ind=ind, val=[1.0] * len(ind)),
+                         sense="L", rhs=float(len(S) - 1))
+                stats["cuts"] += 1
+    cpx.register_callback(LazyDFJ)
+    return stats
+
 def attach_progress_collector(mdl):
     import cplex
     data = {"time": [], "nodes": [], "best_bound": [], "best_int": [],
@@ -109,22 +160,40 @@ def main():
     ap.add_argument("--progress-plot", action="store_true",
                     help="Plot B&B progress (best bound vs. best integer)")
     ap.add_argument("--progress-x", choices=["time","nodes"], default="time")
+    ap.add_argument("--subtour", choices=["mtz","lazy","loop"], default="mtz",
+                    help="MTZ constraints, lazy DFJ cuts (CPLEX callback) or DFJ re-solve loop")
+    ap.add_argument("--max-rounds", type=int, default=1000)
+    ap.add_argument("--no-cache", action="store_true")
     args = ap.parse_args()
 
-    origin, c1, c2, N, points, feeders, nf_map, node_name = load_data(args.excel)
+    origin, c1, c2, N, points, feeders, nf_map, node_name = (load_data if args.no_cache else load_cached)(args.excel)
     D0, Df = build_distance(N, points, feeders, nf_map, origin)
-    mdl, X, U = build_model(N, nf_map, D0, Df)
+    mdl, X, U = build_model(N, nf_map, D0, Df, subtour=args.subtour)
 
     if args.time_limit is not None: mdl.parameters.timelimit = args.time_limit
     if args.threads    is not None: mdl.parameters.threads   = args.threads
+    lazy_stats = attach_lazy_dfj(mdl, X) if args.subtour == "lazy" else None
 
     progress_data = attach_progress_collector(mdl) if args.progress_plot else None
-    res = solve_and_extract(mdl, X, log_output=(not args.quiet))
+    if args.subtour == "loop":
+        res = solve_dfj_loop(mdl, X, max_rounds=args.max_rounds, log_output=(not args.quiet))
+        if not res["subtour_free"]:
+            sys.exit("DFJ loop stopped at --max-rounds %d with %d subtours left (cuts: %d); "
+                     "no valid route found, raise --max-rounds" % (res["rounds"], len(res["subtours"]), res["cuts"]))
+    elif args.subtour == "lazy":
+        res = solve_and_extract(mdl, X, log_output=(not args.quiet))
+        res.update(lazy_stats)
+    else:
+        res = solve_and_extract(mdl, X, log_output=(not args.quiet))
 
     route_nodes = extract_route(res["arcs"], N)
     print(",".join(str(k) for k in route_nodes))
     print("Distance:", round(res["objective"], 6))
+    if args.subtour != "mtz":
+        print("DFJ rounds: %d, cuts: %d" % (res["rounds"], res["cuts"]))
 
+    if not args.no_plot or progress_data is not None:
+        from utils.plot import plot_route, plot_bb_progress
     if not args.no_plot:
         plot_route(origin, c1, c2, points, feeders, nf_map, route_nodes,
                    show_ids=True, show_step_idx=True, label_map=node_name)
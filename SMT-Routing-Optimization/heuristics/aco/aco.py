@@ -1,4 +1,4 @@
-import os, sys, random, math
+import os, sys, random, math, time
 import argparse
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -6,7 +6,10 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from utils.io import load_data
-from utils.plot import plot_route, plot_history
+from utils.cache import load_cached
+from utils.checkpoint import save_checkpoint, load_checkpoint, rng_state, set_rng_state
+from utils.results import open_result_cache, instance_digest, result_key
+from heuristics.bounds import setup_bound, gap_reached, gap
 from heuristics.utils import route_distance, euclid
 
 def eta_value(i, j, origin, points, feeders, nf_map, eps=1e-9):
@@ -48,19 +51,49 @@ def deposit_on_route(tau, route, Q, best_dist):
         tau[prev][j] += dpha; prev = j
 
 def run_aco(xlsx_path, ants=30, iters=300, alpha=1.0, beta=3.0, rho=0.1, Q=1.0,
-            seed=None, no_plot=False, patience=80, plot_history_flag=False):
+            seed=None, no_plot=False, patience=80, plot_history_flag=False, cache=True,
+            checkpoint=None, checkpoint_every=0, resume=False, time_limit=None, data=None,
+            callback=None, result_cache=None,
+            lower_bound=None, target_gap=None):
     if seed is not None: random.seed(seed)
-    origin, c1, c2, N, points, feeders, nf_map, node_name = load_data(xlsx_path)
-
-    tau0 = 1.0
-    tau = [[tau0 for _ in range(N+1)] for __ in range(N+1)]
-    for i in range(N+1): tau[i][i] = 0.0
-    for j in range(N+1): tau[j][0] = 0.0
-
-    best_route, best_dist, stall = None, math.inf, 0
-    hist = {"best": [], "iter_best": [], "mean": []}
-
-    for _ in range(iters):
+    if data is None:
+        data = (load_cached if cache else load_data)(xlsx_path)
+    origin, c1, c2, N, points, feeders, nf_map, node_name = data
+    key_params = {"ants": ants, "iters": iters, "alpha": alpha, "beta": beta, "rho": rho, "Q": Q,
+                  "patience": patience, "time_limit": time_limit,
+                  **({"target_gap": target_gap} if target_gap else {})}      # before resume edits iters
+
+    if resume and checkpoint and os.path.exists(checkpoint):
+        st = load_checkpoint(checkpoint, "aco")
+        start, tau, best_route, best_dist = st["iter"], st["tau"], st["best_route"], st["best_dist"]
+        stall, hist = st["stall"], st["hist"]
+        set_rng_state(st["rng"])
+        if st["converged"]:
+            iters = start
+    else:
+        start = 0
+        tau0 = 1.0
+        tau = [[tau0 for _ in range(N+1)] for __ in range(N+1)]
+        for i in range(N+1): tau[i][i] = 0.0
+        for j in range(N+1): tau[j][0] = 0.0
+
+        best_route, best_dist, stall = None, math.inf, 0
+        hist = {"best": [], "iter_best": [], "mean": []}
+    save_every = checkpoint_every if checkpoint else 0
+    rc = hit = None
+    if result_cache and seed is not None:
+        rc = open_result_cache(result_cache, xlsx_path or "")
+        key = result_key(instance_digest(origin, points, feeders, nf_map), "aco", key_params, seed)
+        hit = rc.get(key)
+        if hit is not None:
+            best_route, best_dist, iters, save_every = hit["route"], hit["distance"], start, 0
+    snapshot = lambda it: {"iter": it, "tau": tau, "best_route": best_route, "best_dist": best_dist,
+                           "stall": stall, "hist": hist, "converged": stall >= patience, "rng": rng_state()}
+    bound = setup_bound(lower_bound, target_gap, origin, points, feeders, nf_map) if hit is None else None
+    t_start = time.perf_counter()
+    stop = ""
+
+    for it in range(start, iters):
         population = []
         for _a in range(ants):
             r = construct_ant_route(N, origin, points, feeders, nf_map, tau, alpha, beta)
@@ -83,12 +116,26 @@ def run_aco(xlsx_path, ants=30, iters=300, alpha=1.0, beta=3.0, rho=0.1, Q=1.0,
             deposit_on_route(tau, best_route, Q, best_dist)
 
         if stall >= patience: break
+        if target_gap and gap_reached(best_dist, bound, target_gap): stop = "gap"; break
+        if save_every and (it + 1) % save_every == 0:
+            save_checkpoint(checkpoint, "aco", snapshot(it + 1))
+        if time_limit and time.perf_counter() - t_start >= time_limit: stop = "time_limit"; break
+        if callback is not None and callback(it + 1, best_dist, best_route): stop = "callback"; break
+
+    if save_every:
+        save_checkpoint(checkpoint, "aco", snapshot(len(hist["best"])))
+    if rc is not None and hit is None and best_route is not None and not stop:
+        rc.put(key, "aco", best_dist, best_route, {"iterations": len(hist["best"])})
 
     route_nodes = best_route if best_route is not None else list(range(1, N+1))
     print(",".join(str(x) for x in route_nodes))
     print("Distance:", round(best_dist, 6))
+    if bound is not None:
+        lb = bound.result() if hasattr(bound, "result") else {"bound": bound, "method": "given", "runtime_s": 0.0}
+        print("Lower bound (%s): %.6f, gap: %.2f%%" % (lb["method"], lb["bound"], 100 * gap(best_dist, lb["bound"])))
 
     if not no_plot:
+        from utils.plot import plot_route, plot_history
         plot_route(origin, c1, c2, points, feeders, nf_map, route_nodes,
                    show_ids=True, show_step_idx=True, label_map=node_name)
         if plot_history_flag:
@@ -108,12 +155,26 @@ def main():
     ap.add_argument("--seed", type=int, default=None)
     ap.add_argument("--no-plot", action="store_true")
     ap.add_argument("--patience", type=int, default=80)
+    ap.add_argument("--time-limit", type=float, default=None, help="wall-clock limit in seconds")
     ap.add_argument("--plot-history", action="store_true")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--checkpoint", default=None, help="checkpoint file (JSON)")
+    ap.add_argument("--checkpoint-every", type=int, default=10, help="iterations between checkpoints")
+    ap.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    ap.add_argument("--lower-bound", choices=["auto", "assignment", "1tree"], default=None,
+                    help="compute a lower bound in a background thread and report the gap")
+    ap.add_argument("--target-gap", type=float, default=None,
+                    help="stop once (best - bound) / best <= this fraction (implies --lower-bound auto)")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default=None,
+                    help="reuse/store results in an SQLite cache (needs --seed)")
     args = ap.parse_args()
 
     run_aco(args.excel, ants=args.ants, iters=args.iters, alpha=args.alpha, beta=args.beta,
             rho=args.rho, Q=args.Q, seed=args.seed, no_plot=args.no_plot, patience=args.patience,
-            plot_history_flag=args.plot_history)
+            plot_history_flag=args.plot_history, cache=not args.no_cache,
+            checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume,
+            time_limit=args.time_limit, result_cache=args.result_cache,
+            lower_bound=args.lower_bound, target_gap=args.target_gap)
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,7 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from utils.io import load_data
-from utils.plot import plot_route, plot_history
+from utils.cache import load_cached
 from heuristics.utils import route_distance, euclid
 from heuristics.tabu import tabu_search_swap
 
@@ -50,9 +50,9 @@ def deposit_on_route(tau, route, Q, best_dist):
 
 def run_aco(xlsx_path, ants=30, iters=300, alpha=1.0, beta=3.0, rho=0.1, Q=1.0,
             ts=False, ts_iters=120, ts_tenure=7, seed=None, no_plot=False, patience=80,
-            plot_history_flag=False):
+            plot_history_flag=False, cache=True):
     if seed is not None: random.seed(seed)
-    origin, c1, c2, N, points, feeders, nf_map, node_name = load_data(xlsx_path)
+    origin, c1, c2, N, points, feeders, nf_map, node_name = (load_cached if cache else load_data)(xlsx_path)
 
     tau0 = 1.0
     tau = [[tau0 for _ in range(N+1)] for __ in range(N+1)]
@@ -98,6 +98,7 @@ def run_aco(xlsx_path, ants=30, iters=300, alpha=1.0, beta=3.0, rho=0.1, Q=1.0,
     print("Distance:", round(best_dist, 6))
 
     if not no_plot:
+        from utils.plot import plot_route, plot_history
         plot_route(origin, c1, c2, points, feeders, nf_map, route_nodes,
                    show_ids=True, show_step_idx=True, label_map=node_name)
         if plot_history_flag:
@@ -121,12 +122,13 @@ def main():
     ap.add_argument("--no-plot", action="store_true")
     ap.add_argument("--patience", type=int, default=80)
     ap.add_argument("--plot-history", action="store_true")
+    ap.add_argument("--no-cache", action="store_true")
     args = ap.parse_args()
 
     run_aco(args.excel, ants=args.ants, iters=args.iters, alpha=args.alpha, beta=args.beta,
             rho=args.rho, Q=args.Q, ts=args.ts, ts_iters=args.ts_iters, ts_tenure=args.ts_tenure,
             seed=args.seed, no_plot=args.no_plot, patience=args.patience,
-            plot_history_flag=args.plot_history)
+            plot_history_flag=args.plot_history, cache=not args.no_cache)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,150 @@
+"""
+Batch runner: solve many SMT instances (.xlsx or .json) with GA or ACO on a process pool.
+Each worker imports the solvers once and keeps the last loaded instances in memory; results
+(distance, route, runtime) are streamed to a .csv or .jsonl file as tasks finish.
+--result-cache answers repeated (instance, solver, params, seed) tasks from an SQLite file.
+
+    python -m heuristics.batch data/ --solver ga --config '{"pop_size": 100}' \
+        --workers 4 --time-limit 30 --out results.csv
+"""
+import os, sys, io, csv, json, time
+import argparse
+import contextlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SOLVERS = ("ga", "aco")
+FIELDS = ["index", "instance", "solver", "seed", "status", "distance", "runtime_s", "route", "error"]
+
+_DATA = OrderedDict()
+_DATA_SLOTS = 8
+_RESULTS = {}
+
+def _warm_up():
+    import heuristics.ga.ga_smt, heuristics.aco.aco, utils.cache, utils.results  # noqa: F401
+
+def _result_cache(path):
+    from utils.results import ResultCache
+    if path not in _RESULTS:
+        _RESULTS[path] = ResultCache(path)
+    return _RESULTS[path]
+
+def _load(path, cache):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key in _DATA:
+        _DATA.move_to_end(key)
+        return _DATA[key]
+    from utils.io import load_data, load_from_json
+    from utils.cache import load_cached
+    if path.lower().endswith(".json"):
+        data = load_from_json(path)
+    else:
+        data = (load_cached if cache else load_data)(path)
+    _DATA[key] = data
+    while len(_DATA) > _DATA_SLOTS:
+        _DATA.popitem(last=False)
+    return data
+
+def solve_task(task):
+    """Runs in a worker; errors are returned as status=error rows."""
+    out = {"index": task["index"], "instance": task["path"], "solver": task["solver"],
+           "seed": task["seed"], "status": "ok", "distance": None, "runtime_s": None,
+           "route": None, "error": ""}
+    t0 = time.perf_counter()
+    try:
+        data = _load(task["path"], task["cache"])
+        params = dict(task["params"])
+        params.setdefault("time_limit", task["time_limit"] or None)
+        if task.get("result_cache"):
+            params["result_cache"] = _result_cache(task["result_cache"])
+        if task["solver"] == "ga":
+            from heuristics.ga.ga_smt import run_ga as run
+        elif task["solver"] == "aco":
+            from heuristics.aco.aco import run_aco as run
+        else:
+            raise ValueError("Unknown solver: %s" % task["solver"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            route, dist = run(task["path"], seed=task["seed"], no_plot=True, data=data, **params)
+        out["distance"], out["route"] = float(dist), list(route)
+    except Exception as e:
+        out["status"], out["error"] = "error", "%s: %s" % (type(e).__name__, e)
+    out["runtime_s"] = round(time.perf_counter() - t0, 4)
+    return out
+
+def collect_tasks(paths, manifest, solver, config, seed, time_limit, cache, result_cache=""):
+    from utils.results import default_result_path
+    entries = []
+    for p in paths:
+        if os.path.isdir(p):
+            entries += [{"path": os.path.join(p, f)} for f in sorted(os.listdir(p))
+                        if f.lower().endswith((".xlsx", ".json")) and not f.startswith("~$")]
+        else:
+            entries.append({"path": p})
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"): continue
+                rec = json.loads(line) if line.startswith("{") else {"path": line}
+                rec["path"] = os.path.join(base, rec["path"])
+                entries.append(rec)
+    return [{"index": i, "path": rec["path"], "solver": rec.get("solver", solver),
+             "params": dict(config, **rec.get("params", {})), "seed": rec.get("seed", seed),
+             "time_limit": rec.get("time_limit", time_limit), "cache": cache,
+             "result_cache": str(default_result_path(rec["path"])) if result_cache == "auto" else result_cache}
+            for i, rec in enumerate(entries)]
+
+def read_config(config):
+    if not config: return {}
+    if os.path.exists(config):
+        with open(config, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(config)
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch GA/ACO over many SMT workbooks")
+    ap.add_argument("paths", nargs="*", help="instances (.xlsx/.json) or directories of them")
+    ap.add_argument("--manifest", default="", help="path list or JSONL of tasks")
+    ap.add_argument("--solver", choices=SOLVERS, default="ga")
+    ap.add_argument("--config", default="", help="run_ga/run_aco kwargs as JSON string or file")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--time-limit", type=float, default=0.0, help="per-instance limit in seconds (0: none)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default="results.jsonl", help=".csv or .jsonl")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default="",
+                    help="reuse/store results in an SQLite cache shared by the workers")
+    args = ap.parse_args()
+
+    tasks = collect_tasks(args.paths, args.manifest, args.solver, read_config(args.config),
+                          args.seed, args.time_limit, not args.no_cache, args.result_cache)
+    if not tasks:
+        sys.exit("No instances given (paths or --manifest)")
+
+    as_csv = args.out.lower().endswith(".csv")
+    t0, failed = time.perf_counter(), 0
+    with open(args.out, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS) if as_csv else None
+        if writer: writer.writeheader()
+        with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=_warm_up) as pool:
+            futures = [pool.submit(solve_task, t) for t in tasks]
+            for n, fut in enumerate(as_completed(futures), 1):
+                row = fut.result()
+                if writer:
+                    writer.writerow(dict(row, route=",".join(map(str, row["route"] or []))))
+                else:
+                    f.write(json.dumps(row) + "\n")
+                f.flush()
+                failed += row["status"] != "ok"
+                res = round(row["distance"], 6) if row["distance"] is not None else row["error"]
+                print("[%d/%d] %s: %s (%.2fs)" % (n, len(tasks), row["instance"], res, row["runtime_s"]))
+    print("Done: %d instances, %d failed, %.1fs -> %s" % (len(tasks), failed, time.perf_counter() - t0, args.out))
+
+if __name__ == "__main__":
+    main()
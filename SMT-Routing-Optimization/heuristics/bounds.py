@@ -0,0 +1,87 @@
+"""
+Lower bounds on the SMT route distance, for gap reporting and gap-based early stopping in GA/ACO.
+The tour origin -> feeder(j1) -> j1 -> feeder(j2) -> j2 -> ... -> origin is an asymmetric TSP on
+nodes 0 (origin) .. N with arc cost c(i, j) = |p_i - f_j| + |f_j - p_j| (c(j, 0) = |p_j - origin|).
+- assignment: every node left and entered once (scipy linear_sum_assignment on the N+1 matrix).
+- 1tree: minimum 1-tree on the symmetric costs min(c_ij, c_ji) (MST on 1..N plus the two cheapest
+  arcs at the origin); any tour costs at least that.
+- auto: the larger of the two.
+start_lower_bound runs it in a background thread; run_ga/run_aco poll the Future.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import math
+import time
+
+import numpy as np
+
+from heuristics.utils import euclid
+
+METHODS = ("auto", "assignment", "1tree")
+
+def cost_matrix(origin, points, feeders, nf_map):
+    ids = sorted(points)
+    idx = {j: k + 1 for k, j in enumerate(ids)}
+    n = len(ids) + 1
+    C = np.full((n, n), np.inf)
+    xy = [origin] + [points[j] for j in ids]
+    for j in ids:
+        f = feeders[nf_map[j]]; into = euclid(f, points[j])
+        for i in range(n):
+            if i != idx[j]: C[i, idx[j]] = euclid(xy[i], f) + into
+        C[idx[j], 0] = euclid(points[j], origin)
+    return C
+
+def assignment_bound(C):
+    from scipy.optimize import linear_sum_assignment
+    M = np.where(np.isfinite(C), C, C[np.isfinite(C)].max() * len(C) + 1.0)
+    r, c = linear_sum_assignment(M)
+    return float(C[r, c].sum())
+
+def one_tree_bound(C):
+    from scipy.sparse.csgraph import minimum_spanning_tree
+    if len(C) < 3: return float(C[0, 1] + C[1, 0])
+    S = np.minimum(C, C.T)
+    sub = np.where(S[1:, 1:] > 0, S[1:, 1:], 1e-12)      # csgraph treats 0 as "no edge"
+    np.fill_diagonal(sub, 0.0)
+    return float(minimum_spanning_tree(sub).sum() + np.sort(S[0, 1:])[:2].sum())
+
+def lower_bound(origin, points, feeders, nf_map, method="auto"):
+    """{"bound", "method", "runtime_s"}"""
+    if method not in METHODS: raise ValueError("method must be one of %s" % (METHODS,))
+    t0 = time.perf_counter()
+    C = cost_matrix(origin, points, feeders, nf_map)
+    if len(C) < 2: return {"bound": 0.0, "method": method, "runtime_s": 0.0}
+    vals = {}
+    if method in ("auto", "assignment"): vals["assignment"] = assignment_bound(C)
+    if method in ("auto", "1tree"): vals["1tree"] = one_tree_bound(C)
+    best = max(vals, key=vals.get)
+    return {"bound": vals[best], "method": best, "runtime_s": round(time.perf_counter() - t0, 4)}
+
+def start_lower_bound(*args, **kwargs):
+    ex = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lower-bound")
+    fut = ex.submit(lower_bound, *args, **kwargs)
+    ex.shutdown(wait=False)
+    return fut
+
+def resolve_bound(lb):
+    """Bound value from a float, a lower_bound() dict or a finished Future; None if not ready."""
+    if lb is None: return None
+    if isinstance(lb, Future):
+        if not lb.done() or lb.exception() is not None: return None
+        lb = lb.result()
+    if isinstance(lb, dict): lb = lb.get("bound")
+    return float(lb) if lb is not None else None
+
+def gap(dist, lb):
+    if lb is None or not math.isfinite(dist): return None
+    return max(0.0, (dist - lb) / dist) if dist else 0.0
+
+def gap_reached(dist, bound, target_gap):
+    g = gap(dist, resolve_bound(bound))
+    return g is not None and g <= target_gap
+
+def setup_bound(lower_bound_method, target_gap, origin, points, feeders, nf_map):
+    """Future for run_ga/run_aco: started when a method is given or target_gap needs one."""
+    method = lower_bound_method or ("auto" if target_gap else None)
+    if isinstance(method, (int, float)) and not isinstance(method, bool): return float(method)
+    return start_lower_bound(origin, points, feeders, nf_map, method) if method else None
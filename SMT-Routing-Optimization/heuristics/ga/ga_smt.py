@@ -1,4 +1,4 @@
-import os, sys, random
+import os, sys, random, time
 import argparse
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -6,7 +6,10 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from utils.io import load_data
-from utils.plot import plot_route, plot_history
+from utils.cache import load_cached
+from utils.checkpoint import save_checkpoint, load_checkpoint, rng_state, set_rng_state
+from utils.results import open_result_cache, instance_digest, result_key
+from heuristics.bounds import setup_bound, gap_reached, gap
 from heuristics.utils import route_distance
 
 def init_population(pop_size, N):
@@ -54,18 +57,48 @@ def evolve(pop, fitness, cx_rate=0.9, mut_rate=0.2, elitism=2, tour_k=3):
 
 def run_ga(xlsx_path, pop_size=200, generations=300, cx_rate=0.9, mut_rate=0.2,
            elitism=2, tour_k=3, seed=None, no_plot=False, patience=50,
-           plot_history_flag=False):
+           plot_history_flag=False, cache=True, checkpoint=None, checkpoint_every=0, resume=False,
+           time_limit=None, data=None, callback=None, result_cache=None,
+           lower_bound=None, target_gap=None):
     if seed is not None:
         random.seed(seed)
 
-    origin, c1, c2, N, points, feeders, nf_map, node_name = load_data(xlsx_path)
+    if data is None:
+        data = (load_cached if cache else load_data)(xlsx_path)
+    origin, c1, c2, N, points, feeders, nf_map, node_name = data
     fitness = lambda route: route_distance(route, origin, points, feeders, nf_map)
-
-    pop = init_population(pop_size, N)
-    best = min(pop, key=fitness); best_dist = fitness(best); stall = 0
-    hist = {"best": [], "iter_best": []}
-
-    for _ in range(generations):
+    key_params = {"pop_size": pop_size, "generations": generations, "cx_rate": cx_rate,
+                  "mut_rate": mut_rate, "elitism": elitism, "tour_k": tour_k,
+                  "patience": patience, "time_limit": time_limit,
+                  **({"target_gap": target_gap} if target_gap else {})}      # before resume edits generations
+
+    if resume and checkpoint and os.path.exists(checkpoint):
+        st = load_checkpoint(checkpoint, "ga")
+        start, pop, best, best_dist = st["gen"], st["pop"], st["best"], st["best_dist"]
+        stall, hist = st["stall"], st["hist"]
+        set_rng_state(st["rng"])
+        if st["converged"]:
+            generations = start
+    else:
+        start = 0
+        pop = init_population(pop_size, N)
+        best = min(pop, key=fitness); best_dist = fitness(best); stall = 0
+        hist = {"best": [], "iter_best": []}
+    save_every = checkpoint_every if checkpoint else 0
+    rc = hit = None
+    if result_cache and seed is not None:
+        rc = open_result_cache(result_cache, xlsx_path or "")
+        key = result_key(instance_digest(origin, points, feeders, nf_map), "ga", key_params, seed)
+        hit = rc.get(key)
+        if hit is not None:
+            best, best_dist, generations, save_every = hit["route"], hit["distance"], start, 0
+    snapshot = lambda g: {"gen": g, "pop": pop, "best": best, "best_dist": best_dist,
+                          "stall": stall, "hist": hist, "converged": stall >= patience, "rng": rng_state()}
+    bound = setup_bound(lower_bound, target_gap, origin, points, feeders, nf_map) if hit is None else None
+    t_start = time.perf_counter()
+    stop = ""
+
+    for g in range(start, generations):
         pop = evolve(pop, fitness, cx_rate, mut_rate, elitism, tour_k)
         cand = pop[0]; cand_dist = fitness(cand)
         hist["iter_best"].append(cand_dist)
@@ -78,12 +111,29 @@ def run_ga(xlsx_path, pop_size=200, generations=300, cx_rate=0.9, mut_rate=0.2,
         hist["best"].append(best_dist)
         if stall >= patience:
             break
+        if target_gap and gap_reached(best_dist, bound, target_gap):
+            stop = "gap"; break
+        if save_every and (g + 1) % save_every == 0:
+            save_checkpoint(checkpoint, "ga", snapshot(g + 1))
+        if time_limit and time.perf_counter() - t_start >= time_limit:
+            stop = "time_limit"; break
+        if callback is not None and callback(g + 1, best_dist, best):
+            stop = "callback"; break
+
+    if save_every:
+        save_checkpoint(checkpoint, "ga", snapshot(len(hist["best"])))
+    if rc is not None and hit is None and not stop:                # truncated runs depend on load, not the key
+        rc.put(key, "ga", best_dist, best, {"generations": len(hist["best"])})
 
     route_nodes = best
     print(",".join(str(x) for x in route_nodes))
     print("Distance:", round(best_dist, 6))
+    if bound is not None:
+        lb = bound.result() if hasattr(bound, "result") else {"bound": bound, "method": "given", "runtime_s": 0.0}
+        print("Lower bound (%s): %.6f, gap: %.2f%%" % (lb["method"], lb["bound"], 100 * gap(best_dist, lb["bound"])))
 
     if not no_plot:
+        from utils.plot import plot_route, plot_history
         plot_route(origin, c1, c2, points, feeders, nf_map, route_nodes,
                    show_ids=True, show_step_idx=True, label_map=node_name)
         if plot_history_flag:
@@ -102,14 +152,28 @@ def main():
     ap.add_argument("--k", type=int, default=3)
     ap.add_argument("--seed", type=int, default=None)
     ap.add_argument("--patience", type=int, default=50)
+    ap.add_argument("--time-limit", type=float, default=None, help="wall-clock limit in seconds")
     ap.add_argument("--no-plot", action="store_true")
     ap.add_argument("--plot-history", action="store_true")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--checkpoint", default=None, help="checkpoint file (JSON)")
+    ap.add_argument("--checkpoint-every", type=int, default=10, help="generations between checkpoints")
+    ap.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    ap.add_argument("--lower-bound", choices=["auto", "assignment", "1tree"], default=None,
+                    help="compute a lower bound in a background thread and report the gap")
+    ap.add_argument("--target-gap", type=float, default=None,
+                    help="stop once (best - bound) / best <= this fraction (implies --lower-bound auto)")
+    ap.add_argument("--result-cache", nargs="?", const="auto", default=None,
+                    help="reuse/store results in an SQLite cache (needs --seed)")
     args = ap.parse_args()
 
     run_ga(args.excel, pop_size=args.pop, generations=args.gen,
            cx_rate=args.cx, mut_rate=args.mut, elitism=args.elit, tour_k=args.k,
            seed=args.seed, no_plot=args.no_plot, patience=args.patience,
-           plot_history_flag=args.plot_history)
+           plot_history_flag=args.plot_history, cache=not args.no_cache,
+           checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume,
+           time_limit=args.time_limit, result_cache=args.result_cache,
+           lower_bound=args.lower_bound, target_gap=args.target_gap)
 
 if __name__ == "__main__":
     main()
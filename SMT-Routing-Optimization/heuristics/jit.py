@@ -0,0 +1,65 @@
+"""
+Optional Numba backend for heuristics.utils.route_distance.
+- "numba" when numba is importable, else "python" (route_distance keeps its interpreted loop).
+  numba is imported on first use; SMT_JIT=0 forces the Python path.
+- The kernel sums a leg table indexed by node id: first[j] (origin -> feeder(j) -> j),
+  C[i, j] (i -> feeder(j) -> j) and back[j] (j -> origin). The terms are computed once with
+  heuristics.utils.euclid for the last (origin, points, feeders, nf_map) seen, so they are the very
+  floats the Python loop adds, in the same order: distances are identical (tests/test_jit.py).
+- Routes shorter than MIN_LEN stay in Python.
+"""
+import os
+
+import numpy as np
+
+BACKENDS = ("auto", "python", "numba")
+MIN_LEN = 4
+
+_state = {"backend": None, "kernel": None, "instance": None}
+
+def _route_distance(route, first, C, back):
+    total = 0.0
+    total += first[route[0]]
+    for k in range(1, len(route)):
+        total += C[route[k - 1], route[k]]
+    total += back[route[len(route) - 1]]
+    return total
+
+def set_backend(name="auto"):
+    if name not in BACKENDS: raise ValueError("backend must be one of %s" % (BACKENDS,))
+    _state["backend"], _state["kernel"] = "python", None
+    if name == "numba" or (name == "auto" and os.environ.get("SMT_JIT", "1") != "0"):
+        try:
+            import numba
+            _state["kernel"] = numba.njit(cache=True)(_route_distance)
+            _state["backend"] = "numba"
+        except ImportError:
+            if name == "numba": raise
+    return _state["backend"]
+
+def backend():
+    if _state["backend"] is None: set_backend("auto")
+    return _state["backend"]
+
+def use_jit(route):
+    return len(route) >= MIN_LEN and backend() == "numba"
+
+def legs(origin, points, feeders, nf_map):
+    """(first, C, back) leg tables, row/column = node id."""
+    from heuristics.utils import euclid
+    n = max(points) + 1
+    first, C, back = np.zeros(n), np.zeros((n, n)), np.zeros(n)
+    into = {j: (feeders[nf_map[j]], euclid(points[j], feeders[nf_map[j]])) for j in points}
+    for j, (f, d) in into.items():
+        first[j] = euclid(origin, f) + d
+        back[j] = euclid(points[j], origin)
+        for i in points:
+            C[i, j] = euclid(points[i], f) + d
+    return first, C, back
+
+def route_distance(route, origin, points, feeders, nf_map):
+    inst = _state["instance"]
+    if (inst is None or inst[1] is not points or inst[2] is not feeders or inst[3] is not nf_map
+            or inst[0] != origin):
+        inst = _state["instance"] = (origin, points, feeders, nf_map) + legs(origin, points, feeders, nf_map)
+    return _state["kernel"](np.array(route, dtype=np.int64), inst[4], inst[5], inst[6])
@@ -6,6 +6,9 @@ def euclid(a, b):
 def route_distance(route, origin, points, feeders, nf_map):
     if not route:
         return 0.0
+    from heuristics import jit
+    if jit.use_jit(route):
+        return jit.route_distance(route, origin, points, feeders, nf_map)
     total = 0.0
     j1 = route[0]; f1 = nf_map[j1]
     total += euclid(origin, feeders[f1]) + euclid(points[j1], feeders[f1])
@@ -0,0 +1,65 @@
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from heuristics import jit
+from heuristics.utils import route_distance
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    yield
+    jit._state.update(backend=None, kernel=None, instance=None)
+
+
+def make_instance(n=60, seed=0):
+    rng = random.Random(seed)
+    points = {i: (rng.uniform(-500, 500), rng.uniform(-500, 500)) for i in range(1, n + 1)}
+    feeders = {f: (rng.uniform(0, 100), rng.uniform(0, 100)) for f in range(3, 12)}
+    nf_map = {i: rng.randint(3, 11) for i in points}
+    return (1.5, -2.25), points, feeders, nf_map
+
+
+def random_routes(points, count=300, seed=1):
+    rng = random.Random(seed)
+    return [rng.sample(list(points), rng.randint(1, len(points))) for _ in range(count)]
+
+
+def python_distances(routes, inst):
+    jit.set_backend("python")
+    return [route_distance(r, *inst) for r in routes]
+
+
+def test_kernel_source_matches_python():
+    inst = make_instance()
+    routes = random_routes(inst[1])
+    ref = python_distances(routes, inst)
+    first, C, back = jit.legs(*inst)
+    assert [jit._route_distance(np.array(r), first, C, back) for r in routes] == ref
+
+
+def test_fallback_without_numba(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)          # import numba -> ImportError
+    assert jit.set_backend("auto") == "python"
+    with pytest.raises(ImportError):
+        jit.set_backend("numba")
+    inst = make_instance()
+    routes = random_routes(inst[1], count=20)
+    assert [route_distance(r, *inst) for r in routes] == python_distances(routes, inst)
+
+
+def test_env_disables_jit(monkeypatch):
+    monkeypatch.setenv("SMT_JIT", "0")
+    assert jit.set_backend("auto") == "python"
+
+
+def test_numba_matches_python():
+    pytest.importorskip("numba")
+    for seed in (0, 1):
+        inst = make_instance(seed=seed)
+        routes = random_routes(inst[1], seed=seed + 10)
+        ref = python_distances(routes, inst)
+        assert jit.set_backend("numba") == "numba"
+        assert [route_distance(r, *inst) for r in routes] == ref
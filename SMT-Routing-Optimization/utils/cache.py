@@ -0,0 +1,85 @@
+"""
+Compiled instance cache for utils.io.load_data.
+First load parses the workbook and writes <cache_dir>/<stem>-<path hash>-<digest>.npz with coordinate
+arrays; later loads read the .npz (no pandas/openpyxl). The key is a SHA-256 of the workbook bytes, so an
+edited workbook gets a new entry and the stale one of the same workbook path is removed (the path hash
+keeps same-named workbooks from other directories apart in a shared cache dir). An entry removed while
+being read counts as a miss.
+Cache dir: argument, else $SMT_CACHE_DIR, else <workbook dir>/.cache
+"""
+from pathlib import Path
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+CACHE_VERSION = 1
+
+def file_digest(path, chunk=1 << 20):
+    h = hashlib.sha256(b"smt-cache-v%d:" % CACHE_VERSION)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def default_cache_dir(path):
+    env = os.environ.get("SMT_CACHE_DIR")
+    return Path(env) if env else Path(path).resolve().parent / ".cache"
+
+def _compile(origin, c1, c2, N, points, feeders, nf_map, node_name):
+    fids = sorted(feeders)
+    return {
+        "origin": np.array(origin, dtype=float),
+        "corner1": np.array(c1, dtype=float),
+        "corner2": np.array(c2, dtype=float),
+        "node_xy": np.array([points[i] for i in range(1, N + 1)], dtype=float).reshape(N, 2),
+        "node_feeder": np.array([nf_map[i] for i in range(1, N + 1)], dtype=np.int64),
+        "node_name": np.array([node_name[i] for i in range(1, N + 1)], dtype=str),
+        "feeder_id": np.array(fids, dtype=np.int64),
+        "feeder_xy": np.array([feeders[f] for f in fids], dtype=float).reshape(len(fids), 2),
+    }
+
+def _expand(z):
+    node_xy, node_feeder, names = z["node_xy"], z["node_feeder"], z["node_name"]
+    N = int(node_xy.shape[0])
+    points = {i: (float(node_xy[i - 1, 0]), float(node_xy[i - 1, 1])) for i in range(1, N + 1)}
+    nf_map = {i: int(node_feeder[i - 1]) for i in range(1, N + 1)}
+    node_name = {i: str(names[i - 1]) for i in range(1, N + 1)}
+    feeders = {int(f): (float(x), float(y)) for f, (x, y) in zip(z["feeder_id"], z["feeder_xy"])}
+    origin, c1, c2 = (tuple(float(v) for v in z[k]) for k in ("origin", "corner1", "corner2"))
+    return origin, c1, c2, N, points, feeders, nf_map, node_name
+
+def load_cached(file_path, cache_dir=None):
+    """Drop-in for utils.io.load_data with a persistent compiled copy; .json instances are
+    parsed directly (no pandas involved, nothing to cache)."""
+    if str(file_path).lower().endswith(".json"):
+        from .io import load_from_json
+        return load_from_json(file_path)
+    cdir = Path(cache_dir) if cache_dir else default_cache_dir(file_path)
+    src = hashlib.sha256(str(Path(file_path).resolve()).encode("utf-8")).hexdigest()[:8]
+    stem = "%s-%s" % (Path(file_path).stem, src)
+    key = "%s-%s" % (stem, file_digest(file_path)[:24])
+    npz = cdir / (key + ".npz")
+    try:
+        with np.load(str(npz)) as z:
+            return _expand(z)
+    except FileNotFoundError:
+        pass
+
+    from .io import load_data
+    data = load_data(file_path)
+    cdir.mkdir(parents=True, exist_ok=True)
+    for old in cdir.glob(stem + "-*.npz"):
+        if old.stem != key:
+            try: old.unlink()
+            except OSError: pass
+    fd, tmp = tempfile.mkstemp(dir=str(cdir), prefix=key, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **_compile(*data))
+        os.replace(tmp, str(npz))
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+    return data
@@ -0,0 +1,40 @@
+"""
+Checkpoint files for run_ga / run_aco.
+JSON (routes are plain node-id lists, pheromone is a nested list) written to a temp file and
+moved into place with os.replace, so a killed job keeps the previous checkpoint.
+random.getstate() is saved with the search state, so a resumed run is bit-for-bit identical
+to an uninterrupted one.
+"""
+from pathlib import Path
+import json
+import os
+import random
+import tempfile
+
+CHECKPOINT_VERSION = 1
+
+def rng_state():
+    version, internal, gauss = random.getstate()
+    return [version, list(internal), gauss]
+
+def set_rng_state(obj):
+    random.setstate((obj[0], tuple(obj[1]), obj[2]))
+
+def save_checkpoint(path, kind, state):
+    dst = Path(path)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(dst.parent), prefix=dst.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CHECKPOINT_VERSION, "kind": kind, "state": state}, f)
+        os.replace(tmp, str(dst))
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+def load_checkpoint(path, kind):
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    if obj.get("version") != CHECKPOINT_VERSION or obj.get("kind") != kind:
+        raise ValueError("%s is not a %s checkpoint (version %d)" % (path, kind, CHECKPOINT_VERSION))
+    return obj["state"]
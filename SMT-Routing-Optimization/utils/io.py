@@ -1,5 +1,3 @@
-import pandas as pd
-
 def _pick_xy(df_pts, names):
     mask = False
     for nm in names:
@@ -10,6 +8,9 @@ def _pick_xy(df_pts, names):
     return float(row.iloc[0]['X']), float(row.iloc[0]['Y'])
 
 def load_data(file_path):
+    if str(file_path).lower().endswith(".json"):
+        return load_from_json(file_path)
+    import pandas as pd
     xls = pd.ExcelFile(file_path)
     df_pts = pd.read_excel(xls, 'Points')
     df_pts.columns = [str(c).strip() for c in df_pts.columns]
@@ -58,3 +59,51 @@ def load_data(file_path):
         raise ValueError("No nodes found in 'Nodes'.")
 
     return origin, corner1, corner2, N, points, feeders, nf_map, node_name
+
+def _rows_xy(rows, key, what):
+    out = []
+    for r in rows:
+        r = {str(k).strip(): v for k, v in r.items()}
+        if not {key, 'X', 'Y'}.issubset(r):
+            raise ValueError("'%s' rows must contain: %s, X, Y" % (what, key))
+        out.append(r)
+    return out
+
+def load_from_dict(obj):
+    """Same result as load_data for {"Points": [...], "Feeders": [...], "Nodes": [...]},
+    each a list of row objects with the workbook's column names."""
+    pts = {str(r['Point']).strip().lower(): (float(r['X']), float(r['Y']))
+           for r in _rows_xy(obj['Points'], 'Point', 'Points')}
+    def pick(names):
+        for nm in names:
+            if nm in pts: return pts[nm]
+        raise ValueError("Missing row in Points for %s" % names)
+    origin  = pick(['origin'])
+    corner1 = pick(['corner 1', 'corner1'])
+    corner2 = pick(['corner 2', 'corner2'])
+
+    feeders = {int(r['Feeder']): (float(r['X']), float(r['Y']))
+               for r in _rows_xy(obj['Feeders'], 'Feeder', 'Feeders')}
+
+    points, nf_map, node_name = {}, {}, {}
+    for i, r in enumerate(_rows_xy(obj['Nodes'], 'Node', 'Nodes'), start=1):
+        if 'Feeder' not in r:
+            raise ValueError("'Nodes' rows must contain: Node, X, Y, Feeder")
+        points[i]    = (float(r['X']), float(r['Y']))
+        nf_map[i]    = int(r['Feeder'])
+        node_name[i] = str(r['Node'])
+
+    missing = sorted(set(nf_map.values()) - set(feeders.keys()))
+    if missing:
+        raise ValueError("Nodes refer to feeders not present in 'Feeders': %s" % missing)
+
+    N = len(points)
+    if N == 0:
+        raise ValueError("No nodes found in 'Nodes'.")
+
+    return origin, corner1, corner2, N, points, feeders, nf_map, node_name
+
+def load_from_json(file_path):
+    import json
+    with open(file_path, "r", encoding="utf-8") as f:
+        return load_from_dict(json.load(f))
@@ -0,0 +1,113 @@
+"""
+On-disk cache of GA/ACO results keyed by instance, solver, parameters and seed.
+SQLite in WAL mode with a busy timeout, so batch workers and parallel runs can share one file;
+writes are short IMMEDIATE transactions. The instance hash covers everything route_distance reads:
+origin, points, feeders and nf_map (sorted by id, coordinates as floats). Entry count and payload
+bytes are bounded; least recently used rows are evicted first.
+File: argument, else $SMT_RESULT_CACHE, else <workbook dir>/.cache/results.sqlite
+"""
+from pathlib import Path
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+RESULTS_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY, solver TEXT NOT NULL, distance REAL NOT NULL, payload TEXT NOT NULL,
+    size INTEGER NOT NULL, created REAL NOT NULL, used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used ON results(used);
+"""
+
+def _xy(p):
+    return [float(p[0]), float(p[1])]
+
+def instance_digest(origin, points, feeders, nf_map):
+    obj = {"origin": _xy(origin),
+           "points": [[int(i), _xy(points[i])] for i in sorted(points)],
+           "feeders": [[int(f), _xy(feeders[f])] for f in sorted(feeders)],
+           "nf_map": [[int(i), int(nf_map[i])] for i in sorted(nf_map)]}
+    blob = json.dumps(obj, separators=(",", ":"))
+    return hashlib.sha256(b"smt-instance-v%d:" % RESULTS_VERSION + blob.encode()).hexdigest()
+
+def result_key(instance, solver, params, seed):
+    blob = json.dumps({"instance": instance, "solver": solver, "params": params, "seed": seed},
+                      sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def default_result_path(source=""):
+    env = os.environ.get("SMT_RESULT_CACHE")
+    if env: return Path(env)
+    base = Path(source).resolve().parent if source else Path.cwd()
+    return base / ".cache" / "results.sqlite"
+
+class ResultCache:
+    """get(key) -> {"distance", "route", "meta"} or None; put(key, solver, distance, route, meta)."""
+
+    def __init__(self, path, max_entries=10000, max_bytes=256 << 20, timeout=30.0):
+        self.path = str(path)
+        self.max_entries, self.max_bytes = int(max_entries), int(max_bytes)
+        self.hits = self.misses = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get(self, key):
+        row = self.conn.execute("SELECT distance, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        payload = json.loads(row[1])
+        return {"distance": row[0], "route": payload["route"], "meta": payload.get("meta", {})}
+
+    def put(self, key, solver, distance, route, meta=None):
+        payload = json.dumps({"route": [int(x) for x in route], "meta": meta or {}}, separators=(",", ":"))
+        size = len(payload.encode())
+        if size > self.max_bytes: return False
+        now = time.time()
+        with self._write():
+            self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (key, solver, float(distance), payload, size, now, now))
+            count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            victims = []
+            if count > self.max_entries or total > self.max_bytes:
+                for k, s in self.conn.execute("SELECT key, size FROM results WHERE key != ? ORDER BY used", (key,)):
+                    if count <= self.max_entries and total <= self.max_bytes: break
+                    victims.append((k,)); count -= 1; total -= s
+            self.conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        return True
+
+    def stats(self):
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._write():
+            self.conn.execute("DELETE FROM results")
+
+    def close(self):
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def _write(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+def open_result_cache(result_cache, source=""):
+    """result_cache: ResultCache, path, or "auto" (default file next to the instance)."""
+    if isinstance(result_cache, ResultCache): return result_cache
+    return ResultCache(default_result_path(source) if result_cache == "auto" else result_cache)